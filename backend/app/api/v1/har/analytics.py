@@ -0,0 +1,58 @@
+"""HAR timing analytics endpoints."""
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from app.core.exceptions import DevToolsException
+from app.models.file import HARAnalyticsResponse
+from app.services.har_analytics import har_analytics_service
+from app.services.har_store import har_store
+
+router = APIRouter()
+
+
+@router.post("/analytics", response_model=HARAnalyticsResponse)
+async def analyze_har_file(
+    file: UploadFile = File(...),
+    buckets: int = Query(default=50, ge=1, le=1000),
+    max_groups: int = Query(default=50, ge=1, le=1000)
+):
+    """Compute timing percentiles and histograms for a HAR file.
+
+    Args:
+        file: HAR file (.har or .json), optionally gzip, deflate or bz2 compressed
+        buckets: Number of histogram buckets
+        max_groups: Maximum hosts and MIME types reported, busiest first
+
+    Returns:
+        p50/p90/p99 per timing phase by host, MIME type and status class
+    """
+    try:
+        table = await har_store.load(file)
+        result = har_analytics_service.analyze(table, buckets, max_groups)
+        return HARAnalyticsResponse(**result)
+    except DevToolsException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/sessions/{session_id}/analytics", response_model=HARAnalyticsResponse)
+async def analyze_session(
+    session_id: str,
+    buckets: int = Query(default=50, ge=1, le=1000),
+    max_groups: int = Query(default=50, ge=1, le=1000)
+):
+    """Compute timing percentiles and histograms for a stored HAR session.
+
+    Args:
+        session_id: Session id returned on upload
+        buckets: Number of histogram buckets
+        max_groups: Maximum hosts and MIME types reported, busiest first
+
+    Returns:
+        p50/p90/p99 per timing phase by host, MIME type and status class
+    """
+    try:
+        table = har_store.get(session_id)
+        result = har_analytics_service.analyze(table, buckets, max_groups)
+        return HARAnalyticsResponse(**result)
+    except DevToolsException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
@@ -0,0 +1,30 @@
+"""Batch HAR ingestion endpoint."""
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from app.core.exceptions import DevToolsException
+from app.models.file import HARBatchResponse
+from app.services.har_batch import har_batch_service
+
+router = APIRouter()
+
+
+@router.post("/batch", response_model=HARBatchResponse)
+async def parse_har_batch(
+    files: list[UploadFile] = File(...),
+    max_hosts: int = Query(default=50, ge=1, le=1000)
+):
+    """Parse many HAR files in parallel and merge their statistics.
+
+    Args:
+        files: HAR files (optionally compressed) and/or zip archives of HAR files
+        max_hosts: Maximum hosts reported, busiest first
+
+    Returns:
+        Merged totals, status class and host breakdowns, and per-file summaries
+    """
+    try:
+        result = await har_batch_service.summarize(files, max_hosts=max_hosts)
+        return HARBatchResponse(**result)
+    except DevToolsException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,29 @@
+"""HAR parse cache endpoints."""
+from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
+from app.models.file import HARCacheStatsResponse
+from app.services.har_cache import har_cache
+
+router = APIRouter()
+
+
+@router.get("/stats", response_model=HARCacheStatsResponse)
+async def cache_stats():
+    """Get occupancy and hit/miss counters of the HAR parse cache.
+
+    Returns:
+        Cache statistics
+    """
+    result = await run_in_threadpool(har_cache.stats)
+    return HARCacheStatsResponse(**result)
+
+
+@router.delete("")
+async def clear_cache():
+    """Clear the HAR parse cache and reset its counters.
+
+    Returns:
+        Confirmation message
+    """
+    await run_in_threadpool(har_cache.clear)
+    return {"message": "Cache cleared"}
@@ -0,0 +1,49 @@
+"""HAR-to-HAR diff endpoint."""
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from app.core.exceptions import DevToolsException
+from app.models.file import HARDiffResponse
+from app.services.har_diff import har_diff_service
+
+router = APIRouter()
+
+
+@router.post("/diff", response_model=HARDiffResponse)
+async def diff_har_files(
+    base: UploadFile = File(...),
+    target: UploadFile = File(...),
+    ignore_params: str = Form(default=""),
+    regression_ms: float = Form(default=50, ge=0),
+    regression_ratio: float = Form(default=0.2, ge=0),
+    limit: int = Form(default=100, ge=1, le=10000)
+):
+    """Compare two HAR captures, e.g. before and after a deploy.
+
+    Requests are matched by method and normalized URL (query parameters
+    sorted, volatile parameters ignored).
+
+    Args:
+        base: HAR file captured before the change
+        target: HAR file captured after the change
+        ignore_params: Comma-separated extra query parameters to ignore
+        regression_ms: Minimum mean time increase to flag a regression
+        regression_ratio: Minimum relative mean time increase to flag a regression
+        limit: Maximum items per reported list
+
+    Returns:
+        Added and removed requests, timing regressions, size changes and
+        per-host deltas
+    """
+    try:
+        result = await har_diff_service.diff(
+            base,
+            target,
+            ignore_params=ignore_params.split(","),
+            regression_ms=regression_ms,
+            regression_ratio=regression_ratio,
+            limit=limit
+        )
+        return HARDiffResponse(**result)
+    except DevToolsException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
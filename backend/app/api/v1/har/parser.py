@@ -1,67 +1,47 @@
 """HAR file parser endpoint."""
-from fastapi import APIRouter, UploadFile, File, HTTPException
-import json
-from app.models.file import HARParseResponse, HARRequest
+from typing import Literal
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.config.settings import settings
+from app.core.exceptions import FileProcessingError
+from app.core.uploads import spool_upload
+from app.models.file import HARParseResponse
+from app.services.har_service import har_service
 
 router = APIRouter()
 
 
 @router.post("/parse", response_model=HARParseResponse)
-async def parse_har_file(file: UploadFile = File(...)):
+async def parse_har_file(
+    file: UploadFile = File(...),
+    summary_only: bool = Query(default=False),
+    format: Literal["json", "ndjson"] = Query(default="json")
+):
     """Parse HAR file and extract request information.
-    
+
+    The upload is read in chunks and entries are parsed one at a time, so
+    the raw document is never held in memory.
+
     Args:
-        file: HAR file (.har or .json)
-    
+        file: HAR file (.har or .json), optionally gzip, deflate or bz2 compressed
+        summary_only: Only compute totals, omitting per-request details
+        format: ``json`` for a single response, or ``ndjson`` to stream one
+            line per request followed by a ``{"summary": ...}`` line
+
     Returns:
         Parsed request information
     """
     try:
-        content = await file.read()
-        har_data = json.loads(content)
-        
-        entries = har_data.get("log", {}).get("entries", [])
-        
-        requests = []
-        total_size = 0
-        total_time = 0
-        
-        for entry in entries:
-            request = entry.get("request", {})
-            response = entry.get("response", {})
-            timings = entry.get("timings", {})
-            
-            size = response.get("bodySize", 0)
-            if size < 0:
-                size = response.get("content", {}).get("size", 0)
-            
-            time = entry.get("time", 0)
-            
-            # Extract headers
-            headers = {}
-            for header in request.get("headers", []):
-                headers[header.get("name", "")] = header.get("value", "")
-            
-            req = HARRequest(
-                url=request.get("url", ""),
-                method=request.get("method", ""),
-                status=response.get("status", 0),
-                size=size,
-                time=time,
-                headers=headers
+        if format == "ndjson":
+            spooled = await spool_upload(file, settings.har_chunk_size)
+            return StreamingResponse(
+                har_service.iter_ndjson(spooled),
+                media_type="application/x-ndjson"
             )
-            
-            requests.append(req)
-            total_size += size
-            total_time += time
-        
-        return HARParseResponse(
-            requests=requests,
-            total_requests=len(requests),
-            total_size=total_size,
-            total_time=round(total_time, 2)
-        )
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=400, detail="Invalid JSON in HAR file")
+
+        result = await har_service.parse_upload(file, include_requests=not summary_only)
+        return HARParseResponse(**result)
+    except FileProcessingError as e:
+        raise HTTPException(status_code=400, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
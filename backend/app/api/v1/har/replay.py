@@ -0,0 +1,53 @@
+"""HAR replay load generator endpoint."""
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from app.config.settings import settings
+from app.core.exceptions import DevToolsException
+from app.models.file import HARReplayResponse
+from app.services.har_replay import har_replay_service
+
+router = APIRouter()
+
+
+@router.post("/replay", response_model=HARReplayResponse)
+async def replay_har_file(
+    file: UploadFile = File(...),
+    base_url: str = Form(...),
+    concurrency: int = Form(default=10, ge=1, le=settings.har_replay_max_concurrency),
+    rate: float = Form(default=0, ge=0),
+    faithful: bool = Form(default=False),
+    speed: float = Form(default=1.0, gt=0),
+    timeout: float = Form(default=30.0, gt=0),
+    max_requests: int = Form(default=1000, ge=1, le=settings.har_replay_max_requests)
+):
+    """Replay the requests of a HAR file against a target as a load test.
+
+    Args:
+        file: HAR file (.har or .json), optionally gzip, deflate or bz2 compressed
+        base_url: Target scheme and host, e.g. http://localhost:8080; the
+            host must be listed in ``har_replay_allowed_hosts``
+        concurrency: Maximum requests in flight
+        rate: Requests per second (0 for unthrottled)
+        faithful: Pace requests by their captured start times
+        speed: Time compression factor for faithful pacing
+        timeout: Per-request timeout in seconds
+        max_requests: Maximum number of HAR entries replayed
+
+    Returns:
+        Overall and per-endpoint latency percentiles and status counts
+    """
+    try:
+        requests = await har_replay_service.load_requests(file, max_requests)
+        result = await har_replay_service.replay(
+            requests,
+            base_url,
+            concurrency=concurrency,
+            rate=rate,
+            faithful=faithful,
+            speed=speed,
+            timeout=timeout
+        )
+        return HARReplayResponse(**result)
+    except DevToolsException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
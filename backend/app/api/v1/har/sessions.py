@@ -0,0 +1,141 @@
+"""HAR session endpoints."""
+from typing import Literal, Optional
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from app.core.exceptions import DevToolsException
+from app.models.file import HARSessionResponse, HARSessionQueryResponse
+from app.services.har_store import har_store
+
+router = APIRouter()
+
+
+@router.post("", response_model=HARSessionResponse)
+async def create_session(
+    file: UploadFile = File(...),
+    index: bool = Query(default=False),
+    index_bodies: bool = Query(default=False)
+):
+    """Upload a HAR file once and keep it for repeated queries.
+
+    Args:
+        file: HAR file (.har or .json), optionally gzip, deflate or bz2 compressed
+        index: Build a full-text index over URLs and header values
+        index_bodies: Also index decoded text response bodies
+
+    Returns:
+        Session id, capture totals and full-text index statistics
+    """
+    try:
+        session_id, table = await har_store.create(file, index=index, index_bodies=index_bodies)
+        return HARSessionResponse(session_id=session_id, **table.summary())
+    except DevToolsException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{session_id}", response_model=HARSessionResponse)
+async def get_session(session_id: str):
+    """Get the totals of a stored HAR session.
+
+    Args:
+        session_id: Session id returned on upload
+
+    Returns:
+        Session id and capture totals
+    """
+    try:
+        table = har_store.get(session_id)
+        return HARSessionResponse(session_id=session_id, **table.summary())
+    except DevToolsException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+
+
+@router.get("/{session_id}/requests", response_model=HARSessionQueryResponse)
+async def query_requests(
+    session_id: str,
+    status: Optional[str] = Query(default=None, description="Status code or class, e.g. 404 or 4xx"),
+    host: Optional[str] = Query(default=None),
+    method: Optional[str] = Query(default=None),
+    url_contains: Optional[str] = Query(default=None),
+    sort: Optional[Literal["time", "size"]] = Query(default=None),
+    order: Literal["asc", "desc"] = Query(default="asc"),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000)
+):
+    """Filter, sort and paginate the requests of a HAR session.
+
+    Args:
+        session_id: Session id returned on upload
+        status: Exact status code or status class
+        host: Exact host name
+        method: HTTP method
+        url_contains: Substring the URL must contain
+        sort: Sort by ``time`` or ``size``
+        order: ``asc`` or ``desc``
+        offset: Number of matching requests to skip
+        limit: Page size
+
+    Returns:
+        Page of matching requests and the total match count
+    """
+    try:
+        table = har_store.get(session_id)
+        result = table.query(
+            status=status,
+            host=host,
+            method=method,
+            url_contains=url_contains,
+            sort=sort,
+            descending=order == "desc",
+            offset=offset,
+            limit=limit
+        )
+        return HARSessionQueryResponse(**result)
+    except DevToolsException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+
+
+@router.get("/{session_id}/search", response_model=HARSessionQueryResponse)
+async def search_requests(
+    session_id: str,
+    q: str = Query(..., min_length=1),
+    mode: Literal["term", "prefix", "phrase"] = Query(default="term"),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000)
+):
+    """Search the full-text index of a HAR session.
+
+    Args:
+        session_id: Session id of an indexed upload
+        q: Query text
+        mode: ``term`` (all words), ``prefix`` (all word prefixes) or
+            ``phrase`` (words adjacent and in order)
+        offset: Number of matching requests to skip
+        limit: Page size
+
+    Returns:
+        Page of matching requests and the total match count
+    """
+    try:
+        table = har_store.get(session_id)
+        result = table.search(q, mode=mode, offset=offset, limit=limit)
+        return HARSessionQueryResponse(**result)
+    except DevToolsException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+
+
+@router.delete("/{session_id}")
+async def delete_session(session_id: str):
+    """Delete a HAR session.
+
+    Args:
+        session_id: Session id returned on upload
+
+    Returns:
+        Confirmation message
+    """
+    try:
+        har_store.delete(session_id)
+        return {"message": "Session deleted"}
+    except DevToolsException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
@@ -0,0 +1,74 @@
+"""Downsampled HAR timeline endpoints."""
+from typing import Optional
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from app.core.exceptions import DevToolsException
+from app.models.file import HARTimelineResponse
+from app.services.har_store import har_store
+from app.services.har_timeline import har_timeline_service
+
+router = APIRouter()
+
+
+@router.post("/timeline", response_model=HARTimelineResponse)
+async def har_file_timeline(
+    file: UploadFile = File(...),
+    points: int = Query(default=2000, ge=1, le=100_000),
+    top: int = Query(default=3, ge=0, le=100),
+    start_ms: Optional[float] = Query(default=None, ge=0),
+    end_ms: Optional[float] = Query(default=None, ge=0)
+):
+    """Compute a downsampled waterfall timeline of a HAR file.
+
+    Args:
+        file: HAR file (.har or .json), optionally gzip, deflate or bz2 compressed
+        points: Maximum buckets plus slowest entries returned
+        top: Slowest entries reported per bucket
+        start_ms: Window start in ms from the first request
+        end_ms: Window end in ms from the first request
+
+    Returns:
+        Per-bucket request counts, requests and bytes in flight, and the
+        slowest requests of each bucket
+    """
+    try:
+        table = await har_store.load(file)
+        result = har_timeline_service.timeline(table, points, top, start_ms, end_ms)
+        return HARTimelineResponse(**result)
+    except DevToolsException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/sessions/{session_id}/timeline", response_model=HARTimelineResponse)
+async def session_timeline(
+    session_id: str,
+    points: int = Query(default=2000, ge=1, le=100_000),
+    top: int = Query(default=3, ge=0, le=100),
+    start_ms: Optional[float] = Query(default=None, ge=0),
+    end_ms: Optional[float] = Query(default=None, ge=0)
+):
+    """Compute a downsampled waterfall timeline of a stored HAR session.
+
+    Zooming in is done by narrowing ``start_ms``/``end_ms``; the same point
+    budget then covers a shorter span in more detail.
+
+    Args:
+        session_id: Session id returned on upload
+        points: Maximum buckets plus slowest entries returned
+        top: Slowest entries reported per bucket
+        start_ms: Window start in ms from the first request
+        end_ms: Window end in ms from the first request
+
+    Returns:
+        Per-bucket request counts, requests and bytes in flight, and the
+        slowest requests of each bucket
+    """
+    try:
+        table = har_store.get(session_id)
+        result = har_timeline_service.timeline(table, points, top, start_ms, end_ms)
+        return HARTimelineResponse(**result)
+    except DevToolsException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
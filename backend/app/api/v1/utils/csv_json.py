@@ -1,25 +1,82 @@
 """CSV to JSON converter endpoint."""
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from itertools import chain
+from typing import AsyncIterator, Literal
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app.config.settings import settings
+from app.core.exceptions import ValidationError
+from app.core.uploads import save_upload, spool_upload
+from app.services.csv_stream import csv_stream_service
 from app.services.utils_service import utils_service
 
 router = APIRouter()
 
 
+async def _prepend(first: bytes, pieces: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    yield first
+    async for piece in pieces:
+        yield piece
+
+
 @router.post("/to-json")
-async def csv_to_json(file: UploadFile = File(...)):
+async def csv_to_json(
+    file: UploadFile = File(...),
+    stream: bool = Query(default=False),
+    parallel: bool = Query(default=False),
+    infer_types: bool = Query(default=False),
+    layout: Literal["rows", "columns"] = Query(default="rows"),
+    dictionary: bool = Query(default=False),
+    format: Literal["json", "ndjson"] = Query(default="json")
+):
     """Convert CSV file to JSON.
     
     Args:
         file: CSV file
+        stream: Stream rows as they are read, in constant memory
+        parallel: Stream rows converted across worker processes, for large
+            files with RFC 4180 quoting
+        infer_types: Convert cells to each column's inferred type (integer,
+            number, boolean, ISO date or null); streamed output also lists
+            the types
+        layout: ``rows`` for one object per row, or ``columns`` for
+            ``{"columns": [...], "data": {column: [values]}, "count": n}``
+            (streamed as one such batch per NDJSON line)
+        dictionary: Write low-cardinality columns of the ``columns`` layout
+            as ``{"dictionary": [...], "indices": [...]}``
+        format: ``json`` for ``{"data": [...], "count": n}``, or ``ndjson``
+            to stream one row per line followed by a ``{"summary": ...}``
+            line (always streamed)
     
     Returns:
         JSON array of objects
     """
     try:
+        media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+        if layout == "columns" and format == "json" and (stream or parallel):
+            raise ValidationError("Streamed columnar output is written as NDJSON batches; use format=ndjson")
+        if parallel:
+            path = await save_upload(file, settings.csv_chunk_size)
+            pieces = csv_stream_service.iter_json_parallel(path, format, infer_types, layout, dictionary)
+            # Nothing is yielded before the first block with rows has been
+            # converted, so a failure up to there is still rejected with a 400
+            first = await pieces.__anext__()
+            return StreamingResponse(_prepend(first, pieces), media_type=media_type)
+        if stream or format == "ndjson":
+            spooled = await spool_upload(file, settings.csv_chunk_size)
+            rows = csv_stream_service.iter_json(spooled, format, infer_types, layout, dictionary)
+            # The first row is converted before the response starts, so
+            # an undecodable header is still rejected with a 400
+            first = await run_in_threadpool(next, rows, b"")
+            return StreamingResponse(chain([first], rows), media_type=media_type)
+
         content = await file.read()
         csv_string = content.decode('utf-8')
         
-        result = utils_service.csv_to_json(csv_string)
+        if layout == "columns":
+            return utils_service.csv_to_columns(csv_string, infer_types, dictionary)
+        
+        result = utils_service.csv_to_json(csv_string, infer_types)
         
         return {"data": result, "count": len(result)}
     except Exception as e:
@@ -1,11 +1,30 @@
 """JSON tools endpoints."""
-from fastapi import APIRouter, HTTPException
+from itertools import chain
+from typing import AsyncIterator, Iterator, Literal
+from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app.config.settings import settings
+from app.core.uploads import spool_upload
 from app.models.utils import (
     JSONValidateRequest,
     JSONValidateResponse,
+    JSONFileValidateResponse,
+    JSONQueryResponse,
+    JSONSchemaValidateRequest,
+    JSONSchemaValidateResponse,
+    JSONSchemaBatchResponse,
+    JSONCanonicalRequest,
+    JSONCanonicalResponse,
+    JSONCanonicalBatchResponse,
     JSONDiffRequest,
     JSONDiffResponse
 )
+from app.services.json_canonical import DIGEST_ALGORITHMS, json_canonical_service
+from app.services.json_lines import json_lines_service
+from app.services.json_query import json_query_service
+from app.services.json_schema import json_schema_service
+from app.services.json_stream import json_stream_service
 from app.services.utils_service import utils_service
 
 router = APIRouter()
@@ -28,18 +47,284 @@ async def validate_json(request: JSONValidateRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/validate/file", response_model=JSONFileValidateResponse)
+async def validate_json_file(file: UploadFile = File(...)):
+    """Validate an uploaded JSON file without loading it into memory.
+    
+    Args:
+        file: JSON document of any size
+    
+    Returns:
+        Validity, the line and column of the first syntax error, and the
+        document's maximum depth, key count and array element count
+    """
+    try:
+        result = await run_in_threadpool(json_stream_service.validate, file.file)
+        return JSONFileValidateResponse(**result)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _stream_reformatted(stream: Iterator[bytes]) -> StreamingResponse:
+    """Start a reformatting stream and return it as a raw JSON response.
+
+    The first piece is produced before the response starts, so documents
+    that fit in one piece are rejected with a 400 when malformed. A syntax
+    error found later aborts the response.
+    """
+    first = await run_in_threadpool(next, stream, b"")
+    return StreamingResponse(chain([first], stream), media_type="application/json")
+
+
+async def _prepend(first: str, pieces: AsyncIterator[str]) -> AsyncIterator[str]:
+    yield first
+    async for piece in pieces:
+        yield piece
+
+
+@router.post("/format/file")
+async def format_json_file(
+    file: UploadFile = File(...),
+    indent: int = Query(default=2, ge=0, le=8),
+    sort_keys: bool = Query(default=False),
+    ensure_ascii: bool = Query(default=False)
+):
+    """Pretty-print an uploaded JSON file as a streamed JSON body.
+    
+    Args:
+        file: JSON document of any size
+        indent: Spaces per nesting level
+        sort_keys: Sort object members by key (each object is buffered
+            until it closes)
+        ensure_ascii: Escape non-ASCII characters
+    
+    Returns:
+        The indented document as ``application/json``
+    """
+    try:
+        spooled = await spool_upload(file, settings.json_chunk_size)
+        return await _stream_reformatted(
+            json_stream_service.reformat(spooled, indent, sort_keys, ensure_ascii)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/minify/file")
+async def minify_json_file(
+    file: UploadFile = File(...),
+    sort_keys: bool = Query(default=False),
+    ensure_ascii: bool = Query(default=False)
+):
+    """Minify an uploaded JSON file as a streamed JSON body.
+    
+    Args:
+        file: JSON document of any size
+        sort_keys: Sort object members by key (each object is buffered
+            until it closes)
+        ensure_ascii: Escape non-ASCII characters
+    
+    Returns:
+        The document without insignificant whitespace as ``application/json``
+    """
+    try:
+        spooled = await spool_upload(file, settings.json_chunk_size)
+        return await _stream_reformatted(
+            json_stream_service.reformat(spooled, None, sort_keys, ensure_ascii)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/ndjson/validate")
+async def validate_ndjson_file(
+    file: UploadFile = File(...),
+    errors_only: bool = Query(default=True)
+):
+    """Validate every line of an NDJSON (JSON Lines) file in parallel.
+    
+    Args:
+        file: NDJSON file, one JSON document per line
+        errors_only: Only write results for invalid lines
+    
+    Returns:
+        Streamed NDJSON: one ``{"line", "valid", "error"}`` line per result,
+        in file order, followed by a ``{"summary": ...}`` line with counts
+        and lines per second
+    """
+    try:
+        spooled = await spool_upload(file, settings.json_chunk_size)
+        return StreamingResponse(
+            json_lines_service.iter_validation(spooled, errors_only),
+            media_type="application/x-ndjson"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/ndjson/convert")
+async def convert_ndjson_file(
+    file: UploadFile = File(...),
+    format: Literal["ndjson", "json"] = Query(default="ndjson"),
+    sort_keys: bool = Query(default=False)
+):
+    """Normalize the records of an NDJSON (JSON Lines) file in parallel.
+    
+    Every valid line is re-serialized as compact JSON, in file order;
+    invalid lines are skipped and listed in the summary.
+    
+    Args:
+        file: NDJSON file, one JSON document per line
+        format: ``ndjson`` for one record per line followed by a
+            ``{"summary": ...}`` line, or ``json`` for
+            ``{"data": [...], "summary": ...}``
+        sort_keys: Sort object members by key
+    
+    Returns:
+        The streamed records and a summary with counts and lines per second;
+        an error after the first block ends the stream with an ``error``
+        line (``ndjson``) or member (``json``) in place of the summary
+    """
+    try:
+        spooled = await spool_upload(file, settings.json_chunk_size)
+        pieces = json_lines_service.iter_conversion(spooled, format, sort_keys)
+        # The first block is converted before the response starts, so a
+        # failure in it is still rejected with a 400
+        first = await pieces.__anext__()
+        return StreamingResponse(
+            _prepend(first, pieces),
+            media_type="application/json" if format == "json" else "application/x-ndjson"
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/query", response_model=JSONQueryResponse)
+async def query_json_file(
+    file: UploadFile = File(...),
+    expression: str = Form(...),
+    limit: int = Form(default=1000, ge=1, le=settings.json_query_max_results)
+):
+    """Extract values from an uploaded JSON file with a path expression.
+    
+    Accepts JSONPath (``$.items[*].id``, ``$..name``,
+    ``$.items[?(@.price < 10)]``) and the JMESPath-style shorthand
+    (``items[*].id``, ``items[?price < `10`].name``). The document is
+    parsed as a stream and only matched values are built.
+    
+    Args:
+        file: JSON document of any size
+        expression: Query expression
+        limit: Maximum number of matches returned
+    
+    Returns:
+        Matches in document order
+    """
+    try:
+        result = await run_in_threadpool(json_query_service.query, file.file, expression, limit)
+        return JSONQueryResponse(**result)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/schema/validate", response_model=JSONSchemaValidateResponse)
+async def validate_json_schema(request: JSONSchemaValidateRequest):
+    """Validate a JSON document against a JSON Schema.
+    
+    Args:
+        request: Schema and document as JSON strings
+    
+    Returns:
+        Validity and every failing keyword with the path of its value
+    """
+    try:
+        result = json_schema_service.validate(request.schema_string, request.json_string)
+        return JSONSchemaValidateResponse(**result)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/schema/validate/batch", response_model=JSONSchemaBatchResponse)
+async def validate_json_schema_batch(
+    file: UploadFile = File(...),
+    schema_string: str = Form(...),
+    max_records: int = Form(default=1000, ge=0, le=settings.json_schema_max_records)
+):
+    """Validate every record of an NDJSON file against a JSON Schema.
+    
+    The schema is compiled once per worker process and cached by hash;
+    blocks of records are validated in parallel.
+    
+    Args:
+        file: NDJSON file, one JSON document per line
+        schema_string: JSON Schema as a JSON string
+        max_records: Maximum number of invalid records listed
+    
+    Returns:
+        Record counts, invalid records with their errors by line number,
+        and throughput
+    """
+    try:
+        result = await json_schema_service.validate_batch(file, schema_string, max_records)
+        return JSONSchemaBatchResponse(**result)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/canonical", response_model=JSONCanonicalResponse)
+async def canonicalize_json(request: JSONCanonicalRequest):
+    """Serialize JSON in RFC 8785 canonical form and digest it.
+    
+    Args:
+        request: JSON string and digest algorithm
+    
+    Returns:
+        Canonical JSON and the hex digest of its UTF-8 bytes
+    """
+    try:
+        result = json_canonical_service.canonicalize(request.json_string, request.algorithm)
+        return JSONCanonicalResponse(**result)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/canonical/batch", response_model=JSONCanonicalBatchResponse)
+async def group_json_files(
+    files: list[UploadFile] = File(...),
+    algorithm: Literal[DIGEST_ALGORITHMS] = Query(default="sha256")
+):
+    """Group JSON files with identical content by canonical digest.
+    
+    Key order, whitespace, string escapes and number spelling do not
+    affect the digest.
+    
+    Args:
+        files: JSON files
+        algorithm: Digest algorithm
+    
+    Returns:
+        Groups of identical files, largest first, and per-file digests
+    """
+    try:
+        result = await json_canonical_service.group(files, algorithm)
+        return JSONCanonicalBatchResponse(**result)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/diff", response_model=JSONDiffResponse)
 async def diff_json(request: JSONDiffRequest):
-    """Compare two JSON objects.
+    """Compare two JSON documents recursively.
     
     Args:
         request: Two JSON strings to compare
     
     Returns:
-        Diff showing added, removed, and modified keys
+        RFC 6902 patch, changes qualified by JSON Pointer, and the added,
+        removed and modified top-level members keyed by name
     """
     try:
-        result = utils_service.diff_json(request.json1, request.json2)
+        result = utils_service.diff_json(request.json1, request.json2, request.array_key)
         return JSONDiffResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -30,12 +30,54 @@ class Settings(BaseSettings):
     allowed_video_extensions: List[str] = [".mp4", ".avi", ".mov", ".webm"]
     allowed_pdf_extensions: List[str] = [".pdf"]
     
+    # HAR Processing
+    har_chunk_size: int = 1024 * 1024  # 1MB read size for streamed parsing
+    har_max_decompressed_size: int = 4 * 1024 * 1024 * 1024  # 4GB of JSON per compressed upload
+    har_max_sessions: int = 8
+    har_session_ttl: int = 3600  # seconds of inactivity before a session expires
+    har_volatile_params: List[str] = [
+        "_", "cb", "cachebuster", "nocache", "t", "ts", "timestamp", "nonce",
+        "rand", "random", "rnd", "utm_source", "utm_medium", "utm_campaign",
+        "utm_term", "utm_content", "gclid", "fbclid",
+    ]
+    har_cache_memory_requests: int = 500_000  # parsed requests kept in memory
+    har_cache_disk_items: int = 32  # parse results spilled under temp_dir
+    har_intern_max_value: int = 1024  # longest header value interned
+    har_intern_max_values: int = 200_000  # distinct header values interned
+    har_intern_max_names: int = 10_000  # distinct header names given ids
+    har_index_max_body: int = 256 * 1024  # body characters indexed per entry
+    har_replay_max_requests: int = 10_000
+    har_replay_max_concurrency: int = 200
+    # Hosts replay may target; loopback only unless widened
+    har_replay_allowed_hosts: List[str] = ["localhost", "127.0.0.1", "::1"]
+    har_batch_max_files: int = 200
+    
+    # JSON Processing
+    json_chunk_size: int = 1024 * 1024  # 1MB read size for streamed JSON tools
+    json_backend: str = "auto"  # auto, orjson or stdlib
+    json_query_cache_size: int = 256  # compiled query expressions kept
+    json_query_max_results: int = 10_000
+    json_schema_cache_size: int = 128  # compiled schemas kept per process
+    json_schema_max_records: int = 10_000  # invalid records listed per batch
+    json_lines_max_errors: int = 1000  # invalid lines listed in NDJSON summaries
+    json_canonical_max_files: int = 1000
+    
+    # CSV Processing
+    csv_chunk_size: int = 1024 * 1024  # 1MB output pieces for streamed CSV conversion
+    csv_parallel_block_size: int = 8 * 1024 * 1024  # 8MB byte range per worker task
+    csv_infer_sample_rows: int = 1000  # rows sampled to infer column types
+    csv_type_batch_rows: int = 10_000  # rows converted per column batch
+    csv_dictionary_max_ratio: float = 0.5  # distinct values per row for dictionary encoding
+    
     # External APIs
     ip_lookup_api_url: str = "http://ip-api.com/json"
     
     # Temporary File Storage
     temp_dir: str = "/tmp/devtools"
     
+    # Parallel Processing
+    process_pool_workers: int = 0  # 0 for one worker process per CPU core
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,120 @@
+"""Incremental decompression of uploads detected by magic bytes."""
+import bz2
+import zlib
+from typing import Iterator, Optional
+from app.core.exceptions import FileProcessingError
+
+
+# Bytes needed to recognise every supported format
+_MAGIC_LENGTH = 3
+
+
+def detect_compression(head: bytes) -> Optional[str]:
+    """Return ``gzip``, ``deflate`` or ``bz2`` for compressed data, else None.
+
+    ``deflate`` is the zlib-wrapped stream used by HTTP ``Content-Encoding:
+    deflate``; its two-byte header is recognised by its checksum.
+    """
+    if head[:2] == b"\x1f\x8b":
+        return "gzip"
+    if head[:3] == b"BZh":
+        return "bz2"
+    if len(head) >= 2 and head[0] & 0x0F == 8 and head[0] >> 4 <= 7 and (head[0] << 8 | head[1]) % 31 == 0:
+        return "deflate"
+    return None
+
+
+class StreamDecompressor:
+    """Detects a compressed upload and decompresses it chunk by chunk.
+
+    The format is chosen from the first bytes; uncompressed data passes
+    through untouched. Output is produced in pieces of at most
+    ``piece_size`` bytes so a highly compressed chunk never expands into
+    one large buffer, and the total output is capped at ``max_size``.
+    Concatenated gzip and bz2 members are decompressed in sequence.
+    """
+
+    def __init__(self, piece_size: int = 1024 * 1024, max_size: Optional[int] = None):
+        self.piece_size = piece_size
+        self.max_size = max_size
+        self.format: Optional[str] = None
+        self.output_size = 0
+        self._head = b""
+        self._detected = False
+        self._decompressor = None
+        self._finished = False
+
+    def _new_decompressor(self):
+        if self.format == "gzip":
+            return zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self.format == "deflate":
+            return zlib.decompressobj()
+        return bz2.BZ2Decompressor()
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        """Yield the decompressed pieces of a chunk of input."""
+        if not self._detected:
+            self._head += data
+            if len(self._head) < _MAGIC_LENGTH:
+                return
+            data, self._head = self._head, b""
+            self._detect(data)
+
+        if self.format is None:
+            if data:
+                yield self._count(data)
+            return
+        yield from self._inflate(data)
+
+    def flush(self) -> Iterator[bytes]:
+        """Yield any remaining output once the input has ended."""
+        if not self._detected:
+            data, self._head = self._head, b""
+            self._detect(data)
+            yield from self.decompress(data)
+        if self.format is not None and not self._finished:
+            raise FileProcessingError(f"Truncated {self.format} stream")
+
+    def _detect(self, head: bytes) -> None:
+        self._detected = True
+        self.format = detect_compression(head)
+        if self.format is not None:
+            self._decompressor = self._new_decompressor()
+
+    def _inflate(self, data: bytes) -> Iterator[bytes]:
+        while data:
+            if self._finished:
+                if self.format == "deflate" or not data.strip(b"\x00"):
+                    # Trailing bytes after a zlib stream, or padding
+                    return
+                self._decompressor = self._new_decompressor()
+                self._finished = False
+            data = yield from self._inflate_member(data)
+
+    def _inflate_member(self, data: bytes) -> Iterator[bytes]:
+        """Decompress input into the current member; return unused input."""
+        decompressor = self._decompressor
+        try:
+            while True:
+                piece = decompressor.decompress(data, self.piece_size)
+                if piece:
+                    yield self._count(piece)
+                if decompressor.eof:
+                    self._finished = True
+                    return decompressor.unused_data
+                if self.format == "bz2":
+                    data = b""
+                    if decompressor.needs_input:
+                        return b""
+                else:
+                    data = decompressor.unconsumed_tail
+                    if not data and len(piece) < self.piece_size:
+                        return b""
+        except (OSError, EOFError, zlib.error) as e:
+            raise FileProcessingError(f"Invalid {self.format} stream: {e}")
+
+    def _count(self, piece: bytes) -> bytes:
+        self.output_size += len(piece)
+        if self.max_size is not None and self.output_size > self.max_size:
+            raise FileProcessingError("Decompressed file exceeds the size limit")
+        return piece
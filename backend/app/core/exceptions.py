@@ -24,6 +24,23 @@ class ValidationError(DevToolsException):
         super().__init__(message, status_code=422)
 
 
+class JSONSyntaxError(ValidationError):
+    """Exception raised when a JSON document is malformed."""
+    
+    def __init__(self, reason: str, line: int, column: int):
+        self.reason = reason
+        self.line = line
+        self.column = column
+        super().__init__(f"{reason}: line {line} column {column}")
+
+
+class NotFoundError(DevToolsException):
+    """Exception raised when a requested resource does not exist."""
+    
+    def __init__(self, message: str):
+        super().__init__(message, status_code=404)
+
+
 class AIServiceError(DevToolsException):
     """Exception raised when AI service fails."""
     
@@ -0,0 +1,173 @@
+"""JSON encoding and decoding through the fastest available backend.
+
+``orjson`` is used when it is installed and the stdlib ``json`` module
+otherwise; ``settings.json_backend`` pins either one. Both backends write
+the same text: compact separators (unless indented) and UTF-8 rather than
+``\\u`` escapes.
+"""
+import json
+import math
+from typing import Any, Optional, Union
+from fastapi.responses import JSONResponse
+from app.config.settings import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Raised by every backend's ``loads`` and ``raw_decode``
+JSONDecodeError = json.JSONDecodeError
+
+
+class StdlibCodec:
+    """Codec backed by the stdlib ``json`` module."""
+
+    name = "stdlib"
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """Decode a complete JSON document."""
+        return json.loads(data)
+
+    def raw_decode(self, text: str, pos: int = 0) -> tuple[Any, int]:
+        """Decode the JSON value starting at ``pos``; return it and its end."""
+        return self._decoder.raw_decode(text, pos)
+
+    def dumps(self, obj: Any, indent: Optional[int] = None, sort_keys: bool = False) -> str:
+        """Encode a value as JSON text.
+
+        Strings holding lone surrogates, which UTF-8 cannot carry, are
+        written with ``\\u`` escapes, so the text can always be encoded.
+        """
+        text = self._stdlib_dumps(obj, indent, sort_keys)
+        if not text.isascii():
+            try:
+                text.encode("utf-8")
+            except UnicodeEncodeError:
+                return self._stdlib_dumps(obj, indent, sort_keys, ensure_ascii=True)
+        return text
+
+    def dumpb(self, obj: Any, indent: Optional[int] = None, sort_keys: bool = False) -> bytes:
+        """Encode a value as UTF-8 JSON bytes."""
+        try:
+            return self._stdlib_dumps(obj, indent, sort_keys).encode("utf-8")
+        except UnicodeEncodeError:
+            return self._stdlib_dumps(obj, indent, sort_keys, ensure_ascii=True).encode("ascii")
+
+    def _stdlib_dumps(self, obj: Any, indent: Optional[int], sort_keys: bool, ensure_ascii: bool = False) -> str:
+        # Subclasses must not override this: it is the fallback they call
+        if indent is None and not sort_keys and not ensure_ascii:
+            return self._encoder.encode(obj)
+        return json.dumps(
+            obj,
+            ensure_ascii=ensure_ascii,
+            indent=indent,
+            sort_keys=sort_keys,
+            separators=(",", ":") if indent is None else None
+        )
+
+
+# Integer literals of 19 or more digits may lie outside orjson's 64-bit
+# range, which it would decode as floats. Mapping every digit to "0" lets
+# one substring search find such a run.
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"0" * 9)
+_LONG_DIGIT_RUN = b"0" * 19
+
+
+def _has_long_digit_run(data: Union[str, bytes]) -> bool:
+    if isinstance(data, str):
+        data = data.encode("utf-8", "surrogatepass")
+    return data.translate(_DIGITS_TO_ZERO).find(_LONG_DIGIT_RUN) >= 0
+
+
+def _has_non_finite(value: Any) -> bool:
+    kind = type(value)
+    if kind is dict:
+        value = value.values()
+    elif kind is not list and kind is not tuple:
+        return kind is float and not math.isfinite(value)
+    for item in value:
+        kind = type(item)
+        if kind is float:
+            if not math.isfinite(item):
+                return True
+        elif (kind is dict or kind is list or kind is tuple) and _has_non_finite(item):
+            return True
+    return False
+
+
+class OrjsonCodec(StdlibCodec):
+    """Codec backed by ``orjson``, deferring to the stdlib where it differs.
+
+    Documents orjson rejects (``NaN``, ``1e400``, lone surrogate escapes)
+    or would decode differently (integers beyond 64 bits) are decoded by
+    the stdlib, which also supplies the error message for invalid input.
+    Values orjson cannot encode (integers beyond 64 bits, lone surrogates,
+    indents other than 2) or would encode differently (``NaN`` and
+    infinities, which it writes as ``null``) are encoded by the stdlib.
+    orjson has no partial decoder, so ``raw_decode`` is the stdlib's.
+    """
+
+    name = "orjson"
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        if _has_long_digit_run(data):
+            return json.loads(data)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+    def dumps(self, obj: Any, indent: Optional[int] = None, sort_keys: bool = False) -> str:
+        return self.dumpb(obj, indent, sort_keys).decode("utf-8")
+
+    def dumpb(self, obj: Any, indent: Optional[int] = None, sort_keys: bool = False) -> bytes:
+        if indent is None or indent == 2:
+            option = orjson.OPT_NON_STR_KEYS
+            if indent is not None:
+                option |= orjson.OPT_INDENT_2
+            if sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            try:
+                data = orjson.dumps(obj, option=option)
+            except orjson.JSONEncodeError:
+                pass
+            else:
+                # Non-finite floats are written as null, so only a document
+                # with a null can hold one
+                if b"null" not in data or not _has_non_finite(obj):
+                    return data
+        return StdlibCodec.dumpb(self, obj, indent, sort_keys)
+
+
+def available_backends() -> list[str]:
+    """Names of the codec backends that can be used here."""
+    return ["orjson", "stdlib"] if orjson is not None else ["stdlib"]
+
+
+def get_codec(name: str = "auto") -> StdlibCodec:
+    """Return the codec for a backend name, or the fastest with ``auto``."""
+    if name == "auto":
+        name = available_backends()[0]
+    if name == "orjson":
+        if orjson is None:
+            raise ValueError("JSON backend 'orjson' is not installed")
+        return OrjsonCodec()
+    if name == "stdlib":
+        return StdlibCodec()
+    raise ValueError(f"Unknown JSON backend: {name}")
+
+
+codec = get_codec(settings.json_backend)
+
+
+class CodecJSONResponse(JSONResponse):
+    """JSON response rendered with the active codec."""
+
+    def render(self, content: Any) -> bytes:
+        return codec.dumpb(content)
@@ -0,0 +1,45 @@
+"""Helpers for reading uploaded files."""
+import os
+import shutil
+import tempfile
+from typing import IO, Iterator
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from app.config.settings import settings
+
+
+async def spool_upload(file: UploadFile, chunk_size: int = 1024 * 1024) -> IO[bytes]:
+    """Copy an upload into a temporary file owned by the caller.
+
+    FastAPI closes form uploads as soon as the endpoint returns, before a
+    streaming response body is generated. Streaming endpoints copy the
+    upload first and close the copy once the response is done.
+    """
+    os.makedirs(settings.temp_dir, exist_ok=True)
+    spooled = tempfile.TemporaryFile(dir=settings.temp_dir)
+    await file.seek(0)
+    await run_in_threadpool(shutil.copyfileobj, file.file, spooled, chunk_size)
+    spooled.seek(0)
+    return spooled
+
+
+def iter_chunks(fileobj: IO[bytes], chunk_size: int) -> Iterator[bytes]:
+    """Yield a binary file's content in chunks."""
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def save_upload(file: UploadFile, chunk_size: int = 1024 * 1024) -> str:
+    """Copy an upload into a named temporary file and return its path.
+
+    Used when the content is read by another process. The caller removes
+    the file when done.
+    """
+    os.makedirs(settings.temp_dir, exist_ok=True)
+    await file.seek(0)
+    with tempfile.NamedTemporaryFile(dir=settings.temp_dir, delete=False) as saved:
+        await run_in_threadpool(shutil.copyfileobj, file.file, saved, chunk_size)
+    return saved.name
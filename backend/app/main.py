@@ -3,14 +3,16 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from app.config.settings import settings
+from app.core.json_codec import CodecJSONResponse
 from app.core.middleware import ErrorHandlerMiddleware, RequestLoggingMiddleware
+from app.core.process_pool import shutdown_process_pool
 
 # Import routers
 from app.api.v1.ai import document, commit, pr_summary
 from app.api.v1.utils import password, uuid_gen, color, json_tools, csv_json
 from app.api.v1.network import ping, traceroute, ip_lookup, curl_builder
 from app.api.v1.file import pdf, image, video, ocr
-from app.api.v1.har import parser
+from app.api.v1.har import parser, sessions, analytics, diff, cache, replay, batch, timeline
 
 # Create FastAPI app
 app = FastAPI(
@@ -19,7 +21,8 @@ app = FastAPI(
     description="A comprehensive cloud-ready developer tools platform",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    default_response_class=CodecJSONResponse
 )
 
 # Add CORS middleware
@@ -149,6 +152,47 @@ app.include_router(
     prefix=f"{settings.api_v1_prefix}/har",
     tags=["HAR - File Viewer"]
 )
+app.include_router(
+    sessions.router,
+    prefix=f"{settings.api_v1_prefix}/har/sessions",
+    tags=["HAR - Sessions"]
+)
+app.include_router(
+    analytics.router,
+    prefix=f"{settings.api_v1_prefix}/har",
+    tags=["HAR - Analytics"]
+)
+app.include_router(
+    diff.router,
+    prefix=f"{settings.api_v1_prefix}/har",
+    tags=["HAR - Diff"]
+)
+app.include_router(
+    cache.router,
+    prefix=f"{settings.api_v1_prefix}/har/cache",
+    tags=["HAR - Cache"]
+)
+app.include_router(
+    replay.router,
+    prefix=f"{settings.api_v1_prefix}/har",
+    tags=["HAR - Replay"]
+)
+app.include_router(
+    batch.router,
+    prefix=f"{settings.api_v1_prefix}/har",
+    tags=["HAR - Batch"]
+)
+app.include_router(
+    timeline.router,
+    prefix=f"{settings.api_v1_prefix}/har",
+    tags=["HAR - Timeline"]
+)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop the worker processes of the shared process pool."""
+    shutdown_process_pool()
 
 
 if __name__ == "__main__":
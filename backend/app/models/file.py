@@ -1,10 +1,12 @@
 """Pydantic models for file processing tools."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
 
 class HARRequest(BaseModel):
     """Model for a single HAR request."""
+    model_config = ConfigDict(from_attributes=True)
+
     url: str
     method: str
     status: int
@@ -19,3 +21,202 @@ class HARParseResponse(BaseModel):
     total_requests: int
     total_size: int
     total_time: float
+
+
+class HARIndexStats(BaseModel):
+    """Size and build cost of a HAR full-text index."""
+    terms: int
+    postings: int
+    build_seconds: float
+    memory_bytes: int
+    bytes_per_entry: float
+
+
+class HARSessionResponse(BaseModel):
+    """Response model for a stored HAR session."""
+    session_id: str
+    total_requests: int
+    total_size: int
+    total_time: float
+    hosts: int
+    index: Optional[HARIndexStats] = None
+
+
+class HARSessionRequest(BaseModel):
+    """Model for a single request row of a HAR session."""
+    id: int
+    url: str
+    method: str
+    status: int
+    size: int
+    time: float
+    mime_type: str
+    host: str
+
+
+class HARSessionQueryResponse(BaseModel):
+    """Response model for a paginated HAR session query."""
+    total: int
+    offset: int
+    limit: int
+    requests: list[HARSessionRequest]
+
+
+class HARGroupTimings(BaseModel):
+    """Timing percentiles of one group of HAR requests."""
+    key: str
+    count: int
+    phases: dict[str, dict[str, Optional[float]]]
+
+
+class HARAnalyticsResponse(BaseModel):
+    """Response model for HAR timing analytics."""
+    total_requests: int
+    percentiles: list[int]
+    overall: dict[str, dict[str, Optional[float]]]
+    by_host: list[HARGroupTimings]
+    by_mime_type: list[HARGroupTimings]
+    by_status_class: list[HARGroupTimings]
+    histograms: dict
+
+
+class HARDiffRequest(BaseModel):
+    """One normalized request compared across two HAR captures."""
+    method: str
+    url: str
+    host: str
+    base_count: int
+    target_count: int
+    base_size: float
+    target_size: float
+    size_delta: float
+    base_time: float
+    target_time: float
+    time_delta: float
+
+
+class HARHostDiff(BaseModel):
+    """Per-host totals compared across two HAR captures."""
+    host: str
+    base_requests: int
+    target_requests: int
+    base_size: int
+    target_size: int
+    size_delta: int
+    base_time: float
+    target_time: float
+    time_delta: float
+
+
+class HARDiffResponse(BaseModel):
+    """Response model for HAR-to-HAR diff."""
+    base_requests: int
+    target_requests: int
+    matched: int
+    added_count: int
+    removed_count: int
+    regression_count: int
+    added: list[HARDiffRequest]
+    removed: list[HARDiffRequest]
+    regressions: list[HARDiffRequest]
+    size_changes: list[HARDiffRequest]
+    hosts: list[HARHostDiff]
+
+
+class HARCacheStatsResponse(BaseModel):
+    """Response model for HAR parse cache statistics."""
+    memory_items: int
+    memory_requests: int
+    disk_items: int
+    hits: int
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    hit_rate: float
+
+
+class HARReplayLatency(BaseModel):
+    """Latency summary in milliseconds."""
+    count: int
+    min: float
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+class HARReplayEndpoint(BaseModel):
+    """Replay results of one endpoint (method and path)."""
+    endpoint: str
+    requests: int
+    errors: int
+    status_counts: dict[str, int]
+    error_counts: dict[str, int]
+    latency_ms: HARReplayLatency
+
+
+class HARReplayResponse(BaseModel):
+    """Response model for HAR replay load tests."""
+    base_url: str
+    requests: int
+    errors: int
+    duration: float
+    requests_per_second: float
+    latency_ms: HARReplayLatency
+    schedule_lag_ms: HARReplayLatency
+    endpoints: list[HARReplayEndpoint]
+
+
+class HARBatchHost(BaseModel):
+    """Merged totals of one host across a batch."""
+    host: str
+    requests: int
+    size: int
+    time: float
+
+
+class HARBatchFile(BaseModel):
+    """Summary of one file of a batch."""
+    name: str
+    total_requests: int
+    total_size: int
+    total_time: float
+    hosts: int
+    status_counts: dict[str, int]
+    error: Optional[str] = None
+
+
+class HARBatchResponse(BaseModel):
+    """Response model for batch HAR ingestion."""
+    files: int
+    failed: int
+    total_requests: int
+    total_size: int
+    total_time: float
+    status_counts: dict[str, int]
+    hosts: list[HARBatchHost]
+    workers: int
+    elapsed_seconds: float
+    per_file: list[HARBatchFile]
+
+
+class HARTimelineEntry(HARSessionRequest):
+    """One of the slowest requests of a timeline bucket."""
+    bucket: int
+    offset_ms: float
+
+
+class HARTimelineResponse(BaseModel):
+    """Response model for a downsampled HAR timeline."""
+    total_requests: int
+    window_requests: int
+    origin: Optional[float]
+    start_ms: float
+    end_ms: float
+    bucket_ms: float
+    offsets_ms: list[float]
+    counts: list[int]
+    in_flight: list[int]
+    bytes_in_flight: list[int]
+    slowest: list[HARTimelineEntry]
@@ -1,6 +1,6 @@
 """Pydantic models for utility tools."""
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, Optional
 
 
 class PasswordCheckRequest(BaseModel):
@@ -73,14 +73,113 @@ class JSONValidateResponse(BaseModel):
     error: Optional[str] = None
 
 
+class JSONFileValidateResponse(BaseModel):
+    """Response model for streamed JSON file validation.
+
+    ``line`` and ``column`` locate the first syntax error. The structure
+    counts cover the document up to that error.
+    """
+    valid: bool
+    error: Optional[str] = None
+    line: Optional[int] = None
+    column: Optional[int] = None
+    depth: int
+    keys: int
+    elements: int
+    bytes: int
+
+
+class JSONQueryResponse(BaseModel):
+    """Response model for JSON queries."""
+    expression: str
+    results: list[Any]
+    count: int
+    truncated: bool
+
+
+class JSONSchemaValidateRequest(BaseModel):
+    """Request model for JSON Schema validation."""
+    schema_string: str
+    json_string: str
+
+
+class JSONSchemaValidateResponse(BaseModel):
+    """Response model for JSON Schema validation.
+
+    Each error has the JSON Pointer ``path`` of the failing value, the
+    schema ``keyword`` that failed and a ``message``.
+    """
+    valid: bool
+    errors: list[dict] = []
+
+
+class JSONSchemaBatchResponse(BaseModel):
+    """Response model for NDJSON batch validation against a JSON Schema.
+
+    ``records`` lists invalid records by line number, up to the requested
+    maximum; ``truncated`` is set when more were found.
+    """
+    total: int
+    valid: int
+    invalid: int
+    records: list[dict] = []
+    truncated: bool
+    duration: float
+    records_per_second: float
+
+
+class JSONCanonicalRequest(BaseModel):
+    """Request model for JSON canonicalization."""
+    json_string: str
+    algorithm: str = "sha256"
+
+
+class JSONCanonicalResponse(BaseModel):
+    """Response model for JSON canonicalization.
+
+    ``digest`` is the hex digest of the UTF-8 canonical form.
+    """
+    canonical: str
+    digest: str
+    algorithm: str
+    bytes: int
+
+
+class JSONCanonicalBatchResponse(BaseModel):
+    """Response model for grouping JSON files by canonical digest.
+
+    ``groups`` are ordered largest first; ``files`` lists every file with
+    its digest or error.
+    """
+    algorithm: str
+    total_files: int
+    unique: int
+    duplicates: int
+    groups: list[dict]
+    files: list[dict]
+    processing_time: float
+
+
 class JSONDiffRequest(BaseModel):
-    """Request model for JSON diff."""
+    """Request model for JSON diff.
+
+    ``array_key`` names an identity field (e.g. ``id``) used to match the
+    elements of arrays of objects; other arrays are diffed by LCS.
+    """
     json1: str
     json2: str
+    array_key: Optional[str] = None
 
 
 class JSONDiffResponse(BaseModel):
-    """Response model for JSON diff."""
+    """Response model for JSON diff.
+
+    ``added``, ``removed`` and ``modified`` summarize the top-level members
+    of two objects by name; ``patch`` and ``changes`` cover nested values
+    by JSON Pointer.
+    """
     added: dict
     removed: dict
     modified: dict
+    patch: list[dict] = []
+    changes: list[dict] = []
@@ -0,0 +1,52 @@
+"""Columnar JSON output for CSV conversion."""
+from typing import Optional, Sequence, Union
+from app.config.settings import settings
+from app.services.csv_types import convert_column, transpose_rows
+
+
+def dictionary_encode(values: Sequence) -> Union[list, dict]:
+    """Encode a low-cardinality column as ``{"dictionary", "indices"}``.
+
+    Columns whose distinct values exceed ``settings.csv_dictionary_max_ratio``
+    of their length are returned as a plain list.
+    """
+    distinct = list(dict.fromkeys(values))
+    if len(distinct) > len(values) * settings.csv_dictionary_max_ratio:
+        return list(values)
+    index = {value: i for i, value in enumerate(distinct)}
+    return {"dictionary": distinct, "indices": list(map(index.__getitem__, values))}
+
+
+def columnar_batch(
+    header: list[str],
+    rows: list[list[str]],
+    kinds: Optional[list[str]] = None,
+    dictionary: bool = False
+) -> dict:
+    """Lay out a batch of CSV rows as ``{"columns", "data", "count"}``.
+
+    ``data`` maps each header name to its column of values, so names are
+    written once per batch rather than once per row. Rows follow
+    ``csv.DictReader``: blank rows are skipped, missing cells are ``null``
+    and, when any row has extra cells, they are listed per row under a
+    ``null`` key.
+
+    Args:
+        header: Field names
+        rows: Parsed CSV rows
+        kinds: Column types to convert to, from ``infer_column_types``
+        dictionary: Dictionary-encode low-cardinality columns
+    """
+    rows = [row for row in rows if row]
+    columns = transpose_rows(header, rows)
+    if kinds is not None:
+        columns = [convert_column(values, kind) for values, kind in zip(columns, kinds)]
+
+    # Columns stay tuples, which every codec writes as arrays
+    data: dict = {}
+    for name, values in zip(header, columns):
+        data[name] = dictionary_encode(values) if dictionary else values
+    width = len(header)
+    if rows and max(map(len, rows)) > width:
+        data[None] = [row[width:] or None for row in rows]
+    return {"columns": header, "data": data, "count": len(rows)}
@@ -0,0 +1,335 @@
+"""Streaming and parallel CSV to JSON conversion."""
+import asyncio
+import csv
+import io
+import mmap
+import os
+from collections import deque
+from itertools import chain, islice
+from typing import IO, AsyncIterator, Iterator, Optional
+from app.config.settings import settings
+from app.core.exceptions import ValidationError
+from app.core.json_codec import codec
+from app.core.process_pool import pool_size, run_in_process
+from app.services.csv_columnar import columnar_batch
+from app.services.csv_types import infer_column_types, typed_records
+
+
+def iter_record_ranges(data: mmap.mmap, start: int, block_size: int) -> Iterator[tuple[int, int]]:
+    """Yield ``(start, end)`` byte ranges of whole CSV records.
+
+    Each range is about ``block_size`` bytes and ends after a newline that
+    is outside quotes. RFC 4180 quotes always come in pairs (``""`` escapes
+    one), so the parity of the quote count since the previous boundary
+    tells whether a newline is inside a quoted field. ``start`` must be a
+    record boundary.
+    """
+    size = len(data)
+    while start < size:
+        end = min(start + block_size, size)
+        quoted = data[start:end].count(b'"') & 1
+        while end < size:
+            newline = data.find(b"\n", end)
+            if newline < 0:
+                end = size
+                break
+            quoted ^= data[end:newline].count(b'"') & 1
+            end = newline + 1
+            if not quoted:
+                break
+        yield start, end
+        start = end
+
+
+def read_csv_header(data: mmap.mmap) -> tuple[list[str], int]:
+    """Parse the header record; return the field names and where rows start."""
+    if not len(data):
+        return [], 0
+    _, end = next(iter_record_ranges(data, 0, 0))
+    text = data[:end].decode("utf-8-sig")
+    return next(csv.reader(io.StringIO(text, newline="")), []), end
+
+
+def _row_dicts(rows: Iterator[list[str]], header: list[str]) -> Iterator[dict]:
+    """Key rows by header as ``csv.DictReader`` does, skipping blank rows."""
+    width = len(header)
+    for row in rows:
+        if not row:
+            continue
+        record = dict(zip(header, row))
+        if len(row) > width:
+            record[None] = row[width:]
+        else:
+            for key in header[len(row):]:
+                record[key] = None
+        yield record
+
+
+def convert_csv_range(
+    path: str,
+    start: int,
+    end: int,
+    header: list[str],
+    separator: str,
+    kinds: Optional[list[str]] = None,
+    layout: str = "rows",
+    dictionary: bool = False
+) -> dict:
+    """Convert the CSV records in a byte range of a file to JSON objects.
+
+    Runs in a worker process, which maps the file itself so only the range
+    bounds are sent to it. With ``kinds`` the columns are converted to
+    those types; with the ``columns`` layout the rows are written as
+    ``columnar_batch`` objects of ``settings.csv_type_batch_rows`` rows.
+    Failures are returned rather than raised.
+
+    Returns:
+        The row count and the rows' (or batches') JSON joined by ``separator``
+    """
+    try:
+        with open(path, "rb") as fileobj, mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            text = data[start:end].decode("utf-8")
+        reader = csv.reader(io.StringIO(text, newline=""))
+        if layout == "columns":
+            rows = list(reader)
+            size = settings.csv_type_batch_rows
+            batches = [columnar_batch(header, rows[i:i + size], kinds, dictionary) for i in range(0, len(rows), size)]
+            batches = [batch for batch in batches if batch["count"]]
+            return {
+                "rows": sum(batch["count"] for batch in batches),
+                "output": separator.join(codec.dumps(batch) for batch in batches),
+                "error": None
+            }
+        records = typed_records(header, reader, kinds) if kinds is not None else _row_dicts(reader, header)
+        rows = [codec.dumps(record) for record in records]
+        return {"rows": len(rows), "output": separator.join(rows), "error": None}
+    except UnicodeDecodeError as e:
+        return {"rows": 0, "output": "", "error": f"Invalid UTF-8 at byte {start + e.start}"}
+    except Exception as e:
+        return {"rows": 0, "output": "", "error": str(e)}
+
+
+class CSVStreamService:
+    """Service converting CSV files to JSON without loading them into memory."""
+
+    def iter_json(
+        self,
+        fileobj: IO[bytes],
+        output_format: str = "json",
+        infer_types: bool = False,
+        layout: str = "rows",
+        dictionary: bool = False
+    ) -> Iterator[bytes]:
+        """Stream the rows of a CSV file as JSON objects keyed by header.
+
+        The file is decoded incrementally as UTF-8 (a byte order mark is
+        skipped) and rows are written as they are read: the first row on its
+        own, so the response starts at once, then pieces of about
+        ``settings.csv_chunk_size`` bytes. With ``json`` output the rows are
+        written as ``{"data": [...], "count": n}``; with ``ndjson`` one row
+        is written per line, followed by a trailing ``{"summary": {"count": n}}``
+        line. The file is closed once the stream ends.
+
+        An error before the first row is written is raised. An error after
+        that is reported at the end of the stream, after the rows read so
+        far: as an ``{"error": ...}`` line, or with ``json`` output by
+        closing the array and ending the object with an ``"error"`` member
+        in place of the count.
+
+        With ``infer_types`` each column's type is inferred from the first
+        ``settings.csv_infer_sample_rows`` rows, rows are converted in
+        column batches of ``settings.csv_type_batch_rows`` and the types are
+        added next to the count as ``"types": {column: type}``.
+
+        With the ``columns`` layout (``ndjson`` only) each line is instead a
+        ``columnar_batch`` of ``settings.csv_type_batch_rows`` rows.
+
+        Args:
+            fileobj: Binary file object holding the CSV document
+            output_format: ``json`` or ``ndjson``
+            infer_types: Convert cells to inferred column types
+            layout: ``rows`` for one object per row, or ``columns``
+            dictionary: Dictionary-encode low-cardinality columns of
+                columnar batches
+
+        Raises:
+            UnicodeDecodeError: If the file is not valid UTF-8 up to the first row
+            csv.Error: If the file is not valid CSV up to the first row
+        """
+        as_json = output_format == "json"
+        separator = "," if as_json else "\n"
+        flush_size = 0
+        started = False
+        text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+        pending: list[str] = ['{"data":['] if as_json else []
+        pending_size = 0
+        count = 0
+        try:
+            reader = csv.reader(text)
+            header = next(reader, [])
+            kinds = types = None
+            batches = iter(lambda: list(islice(reader, settings.csv_type_batch_rows)), [])
+            if infer_types:
+                sample = list(islice(reader, settings.csv_infer_sample_rows))
+                kinds = infer_column_types(header, sample)
+                types = dict(zip(header, kinds))
+                batches = chain([sample], batches)
+
+            if layout == "columns":
+                items = (columnar_batch(header, batch, kinds, dictionary) for batch in batches)
+                items = ((codec.dumps(batch), batch["count"]) for batch in items if batch["count"])
+            elif infer_types:
+                records = chain.from_iterable(typed_records(header, batch, kinds) for batch in batches)
+                items = ((codec.dumps(record), 1) for record in records)
+            else:
+                items = ((codec.dumps(record), 1) for record in _row_dicts(reader, header))
+
+            for line, rows in items:
+                if count:
+                    pending.append(separator)
+                pending.append(line)
+                pending_size += len(line)
+                count += rows
+                if pending_size >= flush_size:
+                    yield "".join(pending).encode("utf-8")
+                    pending.clear()
+                    pending_size = 0
+                    flush_size = settings.csv_chunk_size
+                    started = True
+            pending.append(self._trailer(as_json, count, types))
+            yield "".join(pending).encode("utf-8")
+        except (UnicodeDecodeError, csv.Error) as e:
+            if not started:
+                raise
+            pending.append(self._error_trailer(as_json, count, str(e)))
+            yield "".join(pending).encode("utf-8")
+        finally:
+            text.close()
+
+    @staticmethod
+    def _trailer(as_json: bool, count: int, types: Optional[dict]) -> str:
+        """Close a ``json`` stream, or write the ``ndjson`` summary line."""
+        summary = {"count": count}
+        if types is not None:
+            summary["types"] = types
+        if as_json:
+            return "]," + codec.dumps(summary)[1:]
+        return ("\n" if count else "") + codec.dumps({"summary": summary}) + "\n"
+
+    @staticmethod
+    def _error_trailer(as_json: bool, count: int, message: str) -> str:
+        """End a stream that failed part way with an error member or line."""
+        if as_json:
+            return '],"error":' + codec.dumps(message) + "}"
+        return ("\n" if count else "") + codec.dumps({"error": message}) + "\n"
+
+    async def iter_json_parallel(
+        self,
+        path: str,
+        output_format: str = "json",
+        infer_types: bool = False,
+        layout: str = "rows",
+        dictionary: bool = False
+    ) -> AsyncIterator[bytes]:
+        """Stream the rows of a CSV file as JSON, converted across processes.
+
+        The file is memory-mapped and cut into ranges of about
+        ``settings.csv_parallel_block_size`` bytes at record boundaries
+        (quoted newlines are respected). Each range is converted by a worker
+        of the shared pool, at most two per worker in flight, and the output
+        is written in file order, in the same shapes as ``iter_json``.
+        Quoting must follow RFC 4180. With ``infer_types`` the column types
+        are inferred once, from the rows at the start of the file, and
+        every worker converts to them. The file is removed once the stream
+        ends.
+
+        Nothing is yielded before the first block with rows is converted, so
+        an error up to there is raised before a response starts. An error
+        after that ends the stream as in ``iter_json``.
+
+        Args:
+            path: Path of the spooled CSV file
+            output_format: ``json`` or ``ndjson``
+            infer_types: Convert cells to inferred column types
+            layout: ``rows``, or ``columns`` (``ndjson`` only) for
+                columnar batches
+            dictionary: Dictionary-encode low-cardinality columns of
+                columnar batches
+
+        Raises:
+            ValidationError: If the file is not valid UTF-8 or CSV up to the
+                first block with rows
+        """
+        as_json = output_format == "json"
+        separator = "," if as_json else "\n"
+        in_flight: deque = deque()
+        data: Optional[mmap.mmap] = None
+        # The opening of a ``json`` stream goes out with the first rows, so
+        # an error in the first block is raised before anything is sent
+        opening = '{"data":[' if as_json else ""
+        count = 0
+        started = False
+        try:
+            with open(path, "rb") as fileobj:
+                if os.fstat(fileobj.fileno()).st_size:
+                    data = mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ)
+            header, body = read_csv_header(data) if data is not None else ([], 0)
+            kinds = types = None
+            if infer_types:
+                kinds = infer_column_types(header, self._sample_rows(data, body) if data is not None else [])
+                types = dict(zip(header, kinds))
+
+            def emit(result: dict) -> bytes:
+                nonlocal count, opening
+                if result["error"] is not None:
+                    raise ValidationError(result["error"])
+                if not result["rows"]:
+                    return b""
+                piece = opening + (separator if count else "") + result["output"]
+                opening = ""
+                count += result["rows"]
+                return piece.encode("utf-8")
+
+            ranges = iter_record_ranges(data, body, settings.csv_parallel_block_size) if data is not None else ()
+            for start, end in ranges:
+                in_flight.append(asyncio.ensure_future(
+                    run_in_process(convert_csv_range, path, start, end, header, separator, kinds, layout, dictionary)
+                ))
+                if len(in_flight) >= pool_size() * 2:
+                    piece = emit(await in_flight.popleft())
+                    if piece:
+                        yield piece
+                        started = True
+            while in_flight:
+                piece = emit(await in_flight.popleft())
+                if piece:
+                    yield piece
+                    started = True
+
+            yield (opening + self._trailer(as_json, count, types)).encode("utf-8")
+        except (UnicodeDecodeError, csv.Error, ValidationError) as e:
+            if not started:
+                raise
+            message = e.message if isinstance(e, ValidationError) else str(e)
+            yield self._error_trailer(as_json, count, message).encode("utf-8")
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if data is not None:
+                data.close()
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _sample_rows(data: mmap.mmap, body: int) -> list[list[str]]:
+        """Parse up to ``settings.csv_infer_sample_rows`` rows from ``body`` on."""
+        ranges = iter_record_ranges(data, body, settings.csv_chunk_size)
+        start, end = next(ranges, (body, body))
+        reader = csv.reader(io.StringIO(data[start:end].decode("utf-8"), newline=""))
+        return list(islice(reader, settings.csv_infer_sample_rows))
+
+
+# Singleton instance
+csv_stream_service = CSVStreamService()
@@ -0,0 +1,157 @@
+"""Column type inference and batch conversion for typed CSV output."""
+import math
+import re
+from itertools import zip_longest
+from typing import Any, Iterable, Optional, Sequence
+from app.core.json_codec import JSONDecodeError, codec
+
+
+# Column types are named as in JSON Schema, plus ``date``. Characters a
+# batch of each type may contain (before its JSON parse checks the
+# grammar), with "," separating cells
+_ALLOWED = {
+    "boolean": b"truefalsn,",
+    "integer": b"0123456789-,",
+    "number": b"0123456789-+.eE,",
+}
+_PARSED = {
+    "boolean": {bool},
+    "integer": {int},
+    "number": {int, float},
+}
+
+# Integers are kept within 64 bits, which JSON readers generally hold exactly
+_INTEGER_MIN = -2 ** 63
+_INTEGER_MAX = 2 ** 63 - 1
+# Shorter digit strings always parse within 64 bits, and without an
+# exponent a number needs hundreds of digits to overflow to infinity
+_SAFE_DIGITS = 18
+
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?")
+
+
+def _in_range(value: Any) -> bool:
+    if type(value) is int:
+        return _INTEGER_MIN <= value <= _INTEGER_MAX
+    return value is None or type(value) is bool or math.isfinite(value)
+
+
+def _parse_batch(values: Sequence[Optional[str]], kind: str) -> Optional[list]:
+    """Convert a column batch with one JSON parse; None if any cell contradicts ``kind``.
+
+    Cells are joined into a JSON array with empty cells as ``null``. The
+    character check rules out other JSON types and the parse checks the
+    number and literal grammar, so every cell is validated without a
+    per-cell call. Values out of range (integers beyond 64 bits, numbers
+    that overflow to infinity) contradict every type.
+    """
+    raw = ",".join(value or "" for value in values)
+    if kind == "boolean":
+        raw = raw.lower()
+    try:
+        if raw.encode("ascii").translate(None, _ALLOWED[kind]):
+            return None
+    except UnicodeEncodeError:
+        return None
+    joined = f",{raw},".replace(",,", ",null,").replace(",,", ",null,")
+    try:
+        parsed = codec.loads(f"[{joined[1:-1]}]")
+    except JSONDecodeError:
+        return None
+    # A quoted cell holding a comma parses as several values
+    if len(parsed) != len(values):
+        return None
+    # A cell may parse as another type ("1.5" for an integer)
+    types = set(map(type, parsed))
+    types.discard(type(None))
+    if not types <= _PARSED[kind]:
+        return None
+    if kind == "boolean":
+        # A literal null cell parses as null too
+        if parsed.count(None) != len(values) - sum(map(bool, values)):
+            return None
+    elif "e" in raw or "E" in raw or max(map(len, filter(None, values)), default=0) > _SAFE_DIGITS:
+        if not all(map(_in_range, parsed)):
+            return None
+    return parsed
+
+
+def _parse_cell(value: Optional[str], kind: str) -> Any:
+    """Convert one cell, keeping it as a string if it contradicts ``kind``."""
+    if not value:
+        return None
+    parsed = _parse_batch([value], kind)
+    return value if parsed is None else parsed[0]
+
+
+def convert_column(values: Sequence[Optional[str]], kind: str) -> Sequence:
+    """Convert a batch of one column's cells to values of an inferred type.
+
+    Empty cells become ``null`` except in ``string`` columns; ``date``
+    columns keep their ISO strings. When a cell contradicts the type, the
+    batch is converted cell by cell: other numbers in an ``integer`` column
+    stay numbers, and remaining contradicting cells (including values out
+    of range) are kept as strings.
+    """
+    if kind == "string":
+        return values
+    if kind in ("null", "date"):
+        return [value or None for value in values]
+    parsed = _parse_batch(values, kind)
+    if parsed is None:
+        if kind == "integer":
+            kind = "number"
+        return [_parse_cell(value, kind) for value in values]
+    return parsed
+
+
+def infer_column_types(header: list[str], sample: list[list[str]]) -> list[str]:
+    """Infer each column's type from a sample of rows.
+
+    A column takes the first of ``null`` (all empty), ``boolean``,
+    ``integer``, ``number`` and ``date`` that all its non-empty sample
+    cells satisfy, and ``string`` otherwise.
+    """
+    columns = transpose_rows(header, [row for row in sample if row])
+    kinds = []
+    for values in columns:
+        present = [value for value in values if value]
+        if not present:
+            kinds.append("null")
+            continue
+        for kind in ("boolean", "integer", "number"):
+            if _parse_batch(present, kind) is not None:
+                kinds.append(kind)
+                break
+        else:
+            kinds.append("date" if all(_DATE.fullmatch(value) for value in present) else "string")
+    return kinds
+
+
+def transpose_rows(header: list[str], rows: list[list[str]]) -> list[tuple[Optional[str], ...]]:
+    """Transpose rows into the header's columns, padding short rows with None."""
+    width = len(header)
+    if all(len(row) == width for row in rows):
+        return list(zip(*rows)) if rows else [()] * width
+    columns = list(zip_longest(*rows))[:width]
+    columns.extend((None,) * len(rows) for _ in range(width - len(columns)))
+    return columns
+
+
+def typed_records(header: list[str], rows: Iterable[list[str]], kinds: list[str]) -> list[dict]:
+    """Key a batch of rows by header with each column converted to its type.
+
+    Matches ``csv.DictReader``: blank rows are skipped, missing cells are
+    ``null`` and extra cells are listed under a ``null`` key.
+    """
+    rows = [row for row in rows if row]
+    if not header:
+        return [{None: row} for row in rows]
+    columns = transpose_rows(header, rows)
+    converted = [convert_column(values, kind) for values, kind in zip(columns, kinds)]
+    records = [dict(zip(header, values)) for values in zip(*converted)]
+    width = len(header)
+    for record, row in zip(records, rows):
+        if len(row) > width:
+            record[None] = row[width:]
+    return records
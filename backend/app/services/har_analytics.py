@@ -0,0 +1,178 @@
+"""HAR timing analytics computed over column arrays."""
+from typing import Optional
+import numpy as np
+from app.services.har_store import HARTable, TIMING_PHASES
+
+
+PERCENTILES = (50, 90, 99)
+
+# Phases reported per group: the HAR timing phases plus the entry total
+_PHASES = TIMING_PHASES + ("total",)
+
+
+def grouped_percentiles(
+    codes: np.ndarray,
+    values: np.ndarray,
+    groups: int,
+    percentiles=PERCENTILES,
+    value_order: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Compute percentiles of ``values`` for every group code at once.
+
+    Rows are put in (group, value) order by a stable sort of the group codes
+    over the value ordering; each percentile is then read by linear
+    interpolation at computed offsets inside each group's run. Passing a
+    precomputed ``value_order`` (``np.argsort(values)``) lets several
+    groupings share one value sort. NaN values are ignored and groups
+    without values yield NaN.
+
+    Returns:
+        Array of shape ``(groups, len(percentiles))``
+    """
+    if value_order is None:
+        value_order = np.argsort(values)
+    value_order = value_order[:int(np.count_nonzero(~np.isnan(values)))]
+
+    # Small integer codes get numpy's linear-time radix sort
+    group_codes = codes[value_order]
+    if groups <= np.iinfo(np.uint16).max:
+        group_codes = group_codes.astype(np.uint16)
+    ordered = values[value_order[np.argsort(group_codes, kind="stable")]]
+    counts = np.bincount(group_codes, minlength=groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    result = np.full((groups, len(percentiles)), np.nan)
+    present = counts > 0
+    if not present.any():
+        return result
+
+    for i, q in enumerate(percentiles):
+        position = starts[present] + (counts[present] - 1) * (q / 100)
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        fraction = position - low
+        result[present, i] = ordered[low] + (ordered[high] - ordered[low]) * fraction
+    return result
+
+
+class HARAnalyticsService:
+    """Service for HAR timing analytics."""
+
+    def analyze(self, table: HARTable, buckets: int = 50, max_groups: int = 50) -> dict:
+        """Compute timing percentiles per host, MIME type and status class.
+
+        Args:
+            table: Parsed HAR table
+            buckets: Number of buckets in the histograms
+            max_groups: Maximum groups reported per dimension, busiest first
+        """
+        phases = dict(table.timings)
+        phases["total"] = table.time
+        orders = {phase: np.argsort(values) for phase, values in phases.items()}
+
+        status_class = (table.status // 100).astype(np.int64)
+        status_class[(status_class < 1) | (status_class > 5)] = 0
+        status_labels = ["other", "1xx", "2xx", "3xx", "4xx", "5xx"]
+
+        overall_codes = np.zeros(table.count, dtype=np.int64)
+        overall = self._group_stats(overall_codes, ["all"], phases, orders, 1)
+
+        return {
+            "total_requests": table.count,
+            "percentiles": list(PERCENTILES),
+            "overall": overall[0]["phases"] if overall else {},
+            "by_host": self._group_stats(table.host_codes, table.hosts.values, phases, orders, max_groups),
+            "by_mime_type": self._group_stats(table.mime_codes, table.mimes.values, phases, orders, max_groups),
+            "by_status_class": self._group_stats(status_class, status_labels, phases, orders, len(status_labels)),
+            "histograms": {
+                "timeline": self._timeline_histogram(table, phases, buckets),
+                "duration": self._duration_histogram(table.time, buckets)
+            }
+        }
+
+    def _group_stats(
+        self,
+        codes: np.ndarray,
+        labels: list[str],
+        phases: dict,
+        orders: dict,
+        max_groups: int
+    ) -> list[dict]:
+        """Percentiles of every phase for the busiest groups."""
+        groups = len(labels)
+        if groups == 0 or len(codes) == 0:
+            return []
+
+        counts = np.bincount(codes, minlength=groups)
+        busiest = [int(g) for g in np.argsort(-counts, kind="stable")[:max_groups] if counts[g] > 0]
+        stats = {
+            phase: grouped_percentiles(codes, values, groups, value_order=orders[phase])
+            for phase, values in phases.items()
+        }
+
+        return [
+            {
+                "key": labels[g],
+                "count": int(counts[g]),
+                "phases": {
+                    phase: self._percentile_dict(stats[phase][g])
+                    for phase in _PHASES
+                }
+            }
+            for g in busiest
+        ]
+
+    @staticmethod
+    def _percentile_dict(values: np.ndarray) -> dict:
+        return {
+            f"p{q}": (None if np.isnan(v) else round(float(v), 3))
+            for q, v in zip(PERCENTILES, values)
+        }
+
+    @staticmethod
+    def _timeline_histogram(table: HARTable, phases: dict, buckets: int) -> dict:
+        """Request counts and mean phase durations per start-time bucket."""
+        valid = ~np.isnan(table.started)
+        if not valid.any():
+            return {"start": None, "bucket_ms": 0, "counts": [], "mean_ms": {}}
+
+        started = table.started[valid]
+        start = started.min()
+        span = max(started.max() - start, 1.0)
+        width = span / buckets
+        index = np.minimum(((started - start) / width).astype(np.int64), buckets - 1)
+        counts = np.bincount(index, minlength=buckets)
+
+        mean_ms = {}
+        for phase in _PHASES:
+            values = phases[phase][valid]
+            present = ~np.isnan(values)
+            sums = np.bincount(index[present], weights=values[present], minlength=buckets)
+            seen = np.bincount(index[present], minlength=buckets)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means = np.where(seen > 0, sums / seen, 0.0)
+            mean_ms[phase] = np.round(means, 3).tolist()
+
+        return {
+            "start": float(start),
+            "bucket_ms": round(float(width), 3),
+            "counts": counts.tolist(),
+            "mean_ms": mean_ms
+        }
+
+    @staticmethod
+    def _duration_histogram(times: np.ndarray, buckets: int) -> dict:
+        """Log-spaced histogram of total request durations."""
+        if len(times) == 0:
+            return {"edges": [], "counts": []}
+        upper = max(float(times.max()), 1.0)
+        edges = np.concatenate(([0.0], np.logspace(0, np.log10(upper), buckets)))
+        counts, _ = np.histogram(times, bins=edges)
+        return {
+            "edges": np.round(edges, 3).tolist(),
+            "counts": counts.tolist()
+        }
+
+
+# Singleton instance
+har_analytics_service = HARAnalyticsService()
@@ -0,0 +1,187 @@
+"""Batch summaries of many HAR files, parsed across a process pool."""
+import asyncio
+import os
+import time
+import zipfile
+from typing import IO, Optional
+from app.config.settings import settings
+from app.core.exceptions import ValidationError
+from app.core.process_pool import pool_size, run_in_process
+from app.core.uploads import iter_chunks, save_upload
+from app.services.har_service import har_service, response_size
+from app.services.har_store import url_host
+
+
+_STATUS_CLASSES = ("other", "1xx", "2xx", "3xx", "4xx", "5xx")
+
+
+def _status_class(status) -> str:
+    try:
+        status_class = int(status) // 100
+    except (TypeError, ValueError):
+        return "other"
+    return _STATUS_CLASSES[status_class] if 1 <= status_class <= 5 else "other"
+
+
+def _open_source(path: str, member: Optional[str]) -> IO[bytes]:
+    if member is None:
+        return open(path, "rb")
+    # The member stays readable after the archive object is closed
+    with zipfile.ZipFile(path) as archive:
+        return archive.open(member)
+
+
+def summarize_har_source(name: str, path: str, member: Optional[str] = None) -> dict:
+    """Summarize one HAR file, or one member of a zip archive.
+
+    Runs in a worker process, so failures are returned in the summary
+    rather than raised.
+
+    Returns:
+        Totals, status class counts and per-host ``[requests, size, time]``
+    """
+    summary = {
+        "name": name,
+        "total_requests": 0,
+        "total_size": 0,
+        "total_time": 0.0,
+        "status_counts": {},
+        "hosts": {},
+        "error": None
+    }
+    status_counts = summary["status_counts"]
+    hosts = summary["hosts"]
+    try:
+        with _open_source(path, member) as fileobj:
+            for entry in har_service.iter_entries(iter_chunks(fileobj, settings.har_chunk_size)):
+                request = entry.get("request", {})
+                response = entry.get("response", {})
+                size = response_size(response)
+                elapsed = entry.get("time", 0) or 0
+                summary["total_requests"] += 1
+                summary["total_size"] += size
+                summary["total_time"] += elapsed
+
+                status_class = _status_class(response.get("status", 0))
+                status_counts[status_class] = status_counts.get(status_class, 0) + 1
+                host = url_host(request.get("url", ""))
+                totals = hosts.get(host)
+                if totals is None:
+                    totals = hosts[host] = [0, 0, 0.0]
+                totals[0] += 1
+                totals[1] += size
+                totals[2] += elapsed
+    except Exception as e:
+        summary["error"] = getattr(e, "message", None) or str(e)
+    return summary
+
+
+class HARBatchService:
+    """Service summarizing batches of HAR files."""
+
+    async def summarize(self, files: list, max_hosts: int = 50) -> dict:
+        """Parse many HAR uploads in parallel and merge their statistics.
+
+        Zip uploads are expanded into their members; each file or member is
+        parsed by one worker of the shared process pool. Files that fail to
+        parse are reported with their error and left out of the totals.
+
+        Args:
+            files: Uploaded HAR files and/or zip archives of HAR files
+            max_hosts: Maximum hosts reported, busiest first
+        """
+        paths = []
+        try:
+            sources = []
+            for file in files:
+                path = await save_upload(file, settings.har_chunk_size)
+                paths.append(path)
+                name = file.filename or f"file-{len(paths)}"
+                if zipfile.is_zipfile(path):
+                    sources.extend(
+                        (f"{name}/{member}", path, member)
+                        for member in self._zip_members(path)
+                    )
+                else:
+                    sources.append((name, path, None))
+
+            if not sources:
+                raise ValidationError("No HAR files found in the upload")
+            if len(sources) > settings.har_batch_max_files:
+                raise ValidationError(f"A batch may contain at most {settings.har_batch_max_files} HAR files")
+
+            started = time.perf_counter()
+            summaries = await asyncio.gather(*(
+                run_in_process(summarize_har_source, name, path, member)
+                for name, path, member in sources
+            ))
+            elapsed = time.perf_counter() - started
+        finally:
+            for path in paths:
+                os.remove(path)
+
+        return self._merge(summaries, elapsed, max_hosts)
+
+    @staticmethod
+    def _zip_members(path: str) -> list[str]:
+        with zipfile.ZipFile(path) as archive:
+            return [
+                info.filename for info in archive.infolist()
+                if not info.is_dir()
+                and not info.filename.startswith("__MACOSX/")
+                and not os.path.basename(info.filename).startswith(".")
+            ]
+
+    @staticmethod
+    def _merge(summaries: list[dict], elapsed: float, max_hosts: int) -> dict:
+        """Combine per-file summaries into batch totals."""
+        total_requests = 0
+        total_size = 0
+        total_time = 0.0
+        status_counts: dict[str, int] = {}
+        hosts: dict[str, list] = {}
+        files = []
+
+        for summary in summaries:
+            files.append({
+                "name": summary["name"],
+                "total_requests": summary["total_requests"],
+                "total_size": summary["total_size"],
+                "total_time": round(summary["total_time"], 2),
+                "hosts": len(summary["hosts"]),
+                "status_counts": summary["status_counts"],
+                "error": summary["error"]
+            })
+            if summary["error"] is not None:
+                continue
+            total_requests += summary["total_requests"]
+            total_size += summary["total_size"]
+            total_time += summary["total_time"]
+            for status_class, count in summary["status_counts"].items():
+                status_counts[status_class] = status_counts.get(status_class, 0) + count
+            for host, (requests, size, host_time) in summary["hosts"].items():
+                totals = hosts.setdefault(host, [0, 0, 0.0])
+                totals[0] += requests
+                totals[1] += size
+                totals[2] += host_time
+
+        busiest = sorted(hosts.items(), key=lambda item: -item[1][0])[:max_hosts]
+        return {
+            "files": len(files),
+            "failed": sum(1 for summary in files if summary["error"] is not None),
+            "total_requests": total_requests,
+            "total_size": total_size,
+            "total_time": round(total_time, 2),
+            "status_counts": status_counts,
+            "hosts": [
+                {"host": host, "requests": requests, "size": size, "time": round(host_time, 2)}
+                for host, (requests, size, host_time) in busiest
+            ],
+            "workers": pool_size(),
+            "elapsed_seconds": round(elapsed, 3),
+            "per_file": files
+        }
+
+
+# Singleton instance
+har_batch_service = HARBatchService()
@@ -0,0 +1,145 @@
+"""Content-addressed cache of parsed HAR results."""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+from app.config.settings import settings
+from app.core.json_codec import codec
+from app.services.har_records import HARRequestRecord
+
+
+class HARResultCache:
+    """Bounded LRU cache of parse results keyed by upload digest.
+
+    Results live in memory until the total number of cached requests
+    exceeds ``settings.har_cache_memory_requests``; least recently used
+    results are then spilled to JSON files under ``settings.temp_dir`` and
+    the oldest files are removed beyond ``settings.har_cache_disk_items``.
+    A disk hit is promoted back into memory.
+    """
+
+    def __init__(self):
+        self._memory: OrderedDict[str, dict] = OrderedDict()
+        self._memory_requests = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def directory(self) -> str:
+        return os.path.join(settings.temp_dir, "har-cache")
+
+    async def digest_upload(self, file) -> str:
+        """Hash an upload chunk by chunk and rewind it."""
+        digest = hashlib.sha256()
+        await file.seek(0)
+        while True:
+            chunk = await file.read(settings.har_chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+        await file.seek(0)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return a cached result, or None on a miss."""
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return result
+
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    result = codec.loads(f.read())
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+            result["requests"] = [HARRequestRecord.from_row(row) for row in result.get("requests", [])]
+
+            os.remove(path)
+            self.disk_hits += 1
+            self._store(key, result)
+            return result
+
+    def put(self, key: str, result: dict) -> None:
+        """Cache a parse result."""
+        with self._lock:
+            self._store(key, result)
+
+    def clear(self) -> None:
+        """Drop every cached result and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_requests = 0
+            for name in self._disk_files():
+                os.remove(os.path.join(self.directory, name))
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """Return cache occupancy and hit/miss counters."""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_items": len(self._memory),
+                "memory_requests": self._memory_requests,
+                "disk_items": len(self._disk_files()),
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0
+            }
+
+    def _store(self, key: str, result: dict) -> None:
+        """Insert into memory, spilling least recently used results to disk."""
+        if key in self._memory:
+            self._memory_requests -= self._weight(self._memory.pop(key))
+        self._memory[key] = result
+        self._memory_requests += self._weight(result)
+
+        while self._memory and self._memory_requests > settings.har_cache_memory_requests:
+            old_key, old_result = self._memory.popitem(last=False)
+            self._memory_requests -= self._weight(old_result)
+            self._spill(old_key, old_result)
+
+    def _spill(self, key: str, result: dict) -> None:
+        """Write a result to disk and trim the spill directory."""
+        if settings.har_cache_disk_items <= 0:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        rows = [record.to_row() for record in result.get("requests", [])]
+        with open(self._path(key), "wb") as f:
+            f.write(codec.dumpb({**result, "requests": rows}))
+
+        files = self._disk_files()
+        if len(files) > settings.har_cache_disk_items:
+            paths = sorted(
+                (os.path.join(self.directory, name) for name in files),
+                key=os.path.getmtime
+            )
+            for path in paths[:len(files) - settings.har_cache_disk_items]:
+                os.remove(path)
+
+    def _disk_files(self) -> list[str]:
+        try:
+            return [name for name in os.listdir(self.directory) if name.endswith(".json")]
+        except OSError:
+            return []
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    @staticmethod
+    def _weight(result: dict) -> int:
+        """Memory weight of a result, in cached requests (at least one)."""
+        return max(len(result.get("requests", [])), 1)
+
+
+# Singleton instance
+har_cache = HARResultCache()
@@ -0,0 +1,190 @@
+"""HAR-to-HAR regression diff service."""
+from typing import Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from app.config.settings import settings
+from app.services.har_service import har_service, response_size
+
+
+def normalize_url(url: str, ignored_params: frozenset = frozenset()) -> tuple[str, str]:
+    """Normalize a URL for matching across captures.
+
+    The scheme and host are lower-cased, the fragment is dropped, volatile
+    query parameters are removed and the remaining ones are sorted.
+
+    Returns:
+        Tuple of (normalized URL, host)
+    """
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url, ""
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in ignored_params
+    )
+    netloc = parts.netloc.lower()
+    normalized = urlunsplit((parts.scheme.lower(), netloc, parts.path or "/", urlencode(query), ""))
+    return normalized, (parts.hostname or "")
+
+
+class _Aggregate:
+    """Running totals for one normalized request."""
+
+    __slots__ = ("method", "url", "host", "count", "size", "time")
+
+    def __init__(self, method: str, url: str, host: str):
+        self.method = method
+        self.url = url
+        self.host = host
+        self.count = 0
+        self.size = 0
+        self.time = 0.0
+
+
+class HARDiffService:
+    """Service for comparing two HAR captures."""
+
+    def ignored_params(self, extra: Iterable[str] = ()) -> frozenset:
+        """Return the lower-cased set of volatile query parameter names."""
+        return frozenset(
+            name.strip().lower()
+            for name in list(settings.har_volatile_params) + list(extra)
+            if name.strip()
+        )
+
+    async def aggregate(self, file, ignored_params: frozenset) -> tuple[dict, int]:
+        """Stream a HAR upload into per-request totals keyed by normalized URL.
+
+        Only one entry of the capture is held at a time; memory grows with
+        the number of distinct normalized requests, not with the file size.
+
+        Returns:
+            Tuple of (aggregates keyed by "METHOD url", entry count)
+        """
+        aggregates: dict[str, _Aggregate] = {}
+        entries = 0
+        async for entry in har_service.iter_upload(file):
+            request = entry.get("request", {})
+            method = (request.get("method", "") or "").upper()
+            url, host = normalize_url(request.get("url", ""), ignored_params)
+            key = f"{method} {url}"
+
+            aggregate = aggregates.get(key)
+            if aggregate is None:
+                aggregate = aggregates[key] = _Aggregate(method, url, host)
+            aggregate.count += 1
+            aggregate.size += response_size(entry.get("response", {}))
+            aggregate.time += entry.get("time", 0) or 0
+            entries += 1
+        return aggregates, entries
+
+    async def diff(
+        self,
+        base_file,
+        target_file,
+        ignore_params: Iterable[str] = (),
+        regression_ms: float = 50,
+        regression_ratio: float = 0.2,
+        limit: int = 100
+    ) -> dict:
+        """Compare a base capture with a target capture.
+
+        The captures are streamed one after the other, so only their
+        aggregates are ever in memory together.
+
+        Args:
+            base_file: HAR upload captured before the change
+            target_file: HAR upload captured after the change
+            ignore_params: Extra volatile query parameter names to ignore
+            regression_ms: Minimum mean time increase to flag a regression
+            regression_ratio: Minimum relative mean time increase to flag a regression
+            limit: Maximum items per reported list
+        """
+        ignored = self.ignored_params(ignore_params)
+        base, base_entries = await self.aggregate(base_file, ignored)
+        target, target_entries = await self.aggregate(target_file, ignored)
+
+        added = [self._row(None, target[key]) for key in target.keys() - base.keys()]
+        removed = [self._row(base[key], None) for key in base.keys() - target.keys()]
+        matched = [self._row(base[key], target[key]) for key in base.keys() & target.keys()]
+
+        regressions = [
+            row for row in matched
+            if row["time_delta"] >= regression_ms
+            and row["time_delta"] >= row["base_time"] * regression_ratio
+        ]
+        size_changes = [row for row in matched if row["size_delta"] != 0]
+
+        added.sort(key=lambda row: (-row["target_count"], row["url"]))
+        removed.sort(key=lambda row: (-row["base_count"], row["url"]))
+        regressions.sort(key=lambda row: -row["time_delta"])
+        size_changes.sort(key=lambda row: -abs(row["size_delta"]))
+
+        return {
+            "base_requests": base_entries,
+            "target_requests": target_entries,
+            "matched": len(matched),
+            "added_count": len(added),
+            "removed_count": len(removed),
+            "regression_count": len(regressions),
+            "added": added[:limit],
+            "removed": removed[:limit],
+            "regressions": regressions[:limit],
+            "size_changes": size_changes[:limit],
+            "hosts": self._host_deltas(base, target)
+        }
+
+    @staticmethod
+    def _row(base: Optional[_Aggregate], target: Optional[_Aggregate]) -> dict:
+        """Describe one normalized request on both sides, using per-request means."""
+        ref = base or target
+        base_size = base.size / base.count if base else 0.0
+        target_size = target.size / target.count if target else 0.0
+        base_time = base.time / base.count if base else 0.0
+        target_time = target.time / target.count if target else 0.0
+        return {
+            "method": ref.method,
+            "url": ref.url,
+            "host": ref.host,
+            "base_count": base.count if base else 0,
+            "target_count": target.count if target else 0,
+            "base_size": round(base_size, 2),
+            "target_size": round(target_size, 2),
+            "size_delta": round(target_size - base_size, 2),
+            "base_time": round(base_time, 2),
+            "target_time": round(target_time, 2),
+            "time_delta": round(target_time - base_time, 2)
+        }
+
+    @staticmethod
+    def _host_deltas(base: dict, target: dict) -> list[dict]:
+        """Sum both captures per host and report the differences."""
+        hosts: dict[str, list] = {}
+        for side, aggregates in ((0, base), (1, target)):
+            for aggregate in aggregates.values():
+                totals = hosts.setdefault(aggregate.host, [0, 0, 0, 0, 0.0, 0.0])
+                totals[side] += aggregate.count
+                totals[2 + side] += aggregate.size
+                totals[4 + side] += aggregate.time
+
+        rows = [
+            {
+                "host": host,
+                "base_requests": totals[0],
+                "target_requests": totals[1],
+                "base_size": totals[2],
+                "target_size": totals[3],
+                "size_delta": totals[3] - totals[2],
+                "base_time": round(totals[4], 2),
+                "target_time": round(totals[5], 2),
+                "time_delta": round(totals[5] - totals[4], 2)
+            }
+            for host, totals in hosts.items()
+        ]
+        rows.sort(key=lambda row: -abs(row["time_delta"]))
+        return rows
+
+
+# Singleton instance
+har_diff_service = HARDiffService()
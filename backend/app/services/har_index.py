@@ -0,0 +1,245 @@
+"""Inverted full-text index over HAR entries."""
+import base64
+import binascii
+import bisect
+import re
+import sys
+import time
+from array import array
+from typing import Optional
+import numpy as np
+from app.config.settings import settings
+from app.core.exceptions import ValidationError
+
+
+_TOKEN = re.compile(r"\w+")
+
+# Prefix queries matching more vocabulary terms than this are rejected
+_MAX_PREFIX_TERMS = 10_000
+
+_TEXT_MIME_HINTS = ("json", "xml", "javascript", "html", "css", "csv", "x-www-form-urlencoded")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lower-cased word tokens."""
+    return _TOKEN.findall(text.lower())
+
+
+def _is_text(mime_type: str) -> bool:
+    mime_type = mime_type.lower()
+    return mime_type.startswith("text/") or any(hint in mime_type for hint in _TEXT_MIME_HINTS)
+
+
+class _Postings:
+    """Per-term postings: entry ids, occurrence counts and positions."""
+
+    __slots__ = ("ids", "counts", "positions")
+
+    def __init__(self):
+        self.ids = array("I")
+        self.counts = array("I")
+        self.positions = array("I")
+
+
+class HARTextIndexBuilder:
+    """Builds a positional inverted index while entries are parsed.
+
+    Every entry is one document made of its URL, request and response
+    header values and, optionally, its decoded text response body. Fields
+    are separated by a position gap so phrases never span two fields.
+    """
+
+    def __init__(self, include_bodies: bool = False):
+        self.include_bodies = include_bodies
+        self._postings: dict[str, _Postings] = {}
+        self._entries = 0
+        self._seconds = 0.0
+
+    def add(self, entry_id: int, entry: dict) -> None:
+        """Index one HAR entry."""
+        started = time.perf_counter()
+        request = entry.get("request", {})
+        response = entry.get("response", {})
+
+        fields = [request.get("url", "")]
+        fields.extend(header.get("value", "") for header in request.get("headers", []))
+        fields.extend(header.get("value", "") for header in response.get("headers", []))
+        if self.include_bodies:
+            body = self._body_text(response.get("content", {}))
+            if body:
+                fields.append(body)
+
+        occurrences: dict[str, list[int]] = {}
+        position = 0
+        for field in fields:
+            if not isinstance(field, str):
+                continue
+            for token in _TOKEN.findall(field.lower()):
+                positions = occurrences.get(token)
+                if positions is None:
+                    occurrences[token] = [position]
+                else:
+                    positions.append(position)
+                position += 1
+            position += 1
+
+        postings = self._postings
+        for token, positions in occurrences.items():
+            term = postings.get(token)
+            if term is None:
+                term = postings[token] = _Postings()
+            term.ids.append(entry_id)
+            term.counts.append(len(positions))
+            term.positions.extend(positions)
+
+        self._entries += 1
+        self._seconds += time.perf_counter() - started
+
+    @staticmethod
+    def _body_text(content: dict) -> Optional[str]:
+        """Return the decoded text of a response body, if it is textual."""
+        text = content.get("text")
+        if not isinstance(text, str) or not _is_text(content.get("mimeType", "") or ""):
+            return None
+        if content.get("encoding") == "base64":
+            try:
+                raw = base64.b64decode(text[:settings.har_index_max_body * 4 // 3 + 4])
+            except (binascii.Error, ValueError):
+                return None
+            text = raw.decode("utf-8", errors="replace")
+        return text[:settings.har_index_max_body]
+
+    def build(self) -> "HARTextIndex":
+        """Freeze the postings into a queryable index."""
+        return HARTextIndex(self._postings, self._entries, self._seconds)
+
+
+class HARTextIndex:
+    """Queryable inverted index supporting term, prefix and phrase queries.
+
+    On build the per-term postings are packed, in sorted term order, into
+    three flat arrays: entry ids, per-posting position offsets and
+    positions. A term is located by binary search over the sorted
+    vocabulary, so no per-term objects outlive the build.
+    """
+
+    def __init__(self, postings: dict[str, _Postings], entries: int, seconds: float):
+        started = time.perf_counter()
+        self.entries = entries
+        self._terms = sorted(postings)
+
+        ids = array("I")
+        counts = array("I")
+        positions = array("I")
+        term_offsets = array("Q", [0])
+        for token in self._terms:
+            term = postings.pop(token)
+            ids.extend(term.ids)
+            counts.extend(term.counts)
+            positions.extend(term.positions)
+            term_offsets.append(len(ids))
+
+        self._term_offsets = np.frombuffer(term_offsets, dtype=np.uint64)
+        self._ids = np.frombuffer(ids, dtype=np.uint32)
+        self._positions = np.frombuffer(positions, dtype=np.uint32)
+        offset_type = np.uint32 if len(positions) <= np.iinfo(np.uint32).max else np.uint64
+        self._position_offsets = np.zeros(len(counts) + 1, dtype=offset_type)
+        np.cumsum(np.frombuffer(counts, dtype=np.uint32), out=self._position_offsets[1:])
+        self.build_seconds = seconds + time.perf_counter() - started
+
+    def stats(self) -> dict:
+        """Report index size and build cost."""
+        total = (
+            sys.getsizeof(self._terms) + sum(sys.getsizeof(token) for token in self._terms)
+            + self._term_offsets.nbytes + self._ids.nbytes
+            + self._position_offsets.nbytes + self._positions.nbytes
+        )
+        return {
+            "terms": len(self._terms),
+            "postings": int(len(self._ids)),
+            "build_seconds": round(self.build_seconds, 3),
+            "memory_bytes": total,
+            "bytes_per_entry": round(total / self.entries, 1) if self.entries else 0.0
+        }
+
+    def _term_range(self, token: str) -> Optional[tuple[int, int]]:
+        """Return the posting range of a term, or None if absent."""
+        index = bisect.bisect_left(self._terms, token)
+        if index == len(self._terms) or self._terms[index] != token:
+            return None
+        return int(self._term_offsets[index]), int(self._term_offsets[index + 1])
+
+    def _term_ids(self, token: str) -> Optional[np.ndarray]:
+        bounds = self._term_range(token)
+        return self._ids[bounds[0]:bounds[1]] if bounds is not None else None
+
+    def search(self, query: str, mode: str = "term") -> np.ndarray:
+        """Return sorted ids of entries matching a query.
+
+        Args:
+            query: Query text
+            mode: ``term`` (all words present), ``prefix`` (all words present
+                as word prefixes) or ``phrase`` (words adjacent and in order)
+
+        Raises:
+            ValidationError: If a prefix matches more than
+                ``_MAX_PREFIX_TERMS`` terms, so results are never silently
+                incomplete
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            raise ValidationError("Query must contain at least one word")
+
+        if mode == "term":
+            return self._intersect([self._term_ids(token) for token in tokens])
+        if mode == "prefix":
+            return self._intersect([self._prefix_ids(token) for token in tokens])
+        if mode == "phrase":
+            return self._phrase_ids(tokens)
+        raise ValidationError("Mode must be 'term', 'prefix' or 'phrase'")
+
+    @staticmethod
+    def _intersect(id_lists: list[Optional[np.ndarray]]) -> np.ndarray:
+        if any(ids is None or len(ids) == 0 for ids in id_lists):
+            return np.empty(0, dtype=np.uint32)
+        id_lists = sorted(id_lists, key=len)
+        result = id_lists[0]
+        for ids in id_lists[1:]:
+            result = np.intersect1d(result, ids, assume_unique=True)
+        return result
+
+    def _prefix_ids(self, prefix: str) -> np.ndarray:
+        start = bisect.bisect_left(self._terms, prefix)
+        end = bisect.bisect_left(self._terms, prefix + "\U0010ffff", lo=start)
+        if end - start > _MAX_PREFIX_TERMS:
+            raise ValidationError(
+                f"Prefix '{prefix}' matches more than {_MAX_PREFIX_TERMS} terms; use a longer prefix"
+            )
+        if start == end:
+            return np.empty(0, dtype=np.uint32)
+        # Terms sharing a prefix are adjacent, so their postings are contiguous
+        low, high = int(self._term_offsets[start]), int(self._term_offsets[end])
+        return np.unique(self._ids[low:high])
+
+    def _term_positions(self, token: str, entry_id: int) -> np.ndarray:
+        low, high = self._term_range(token)
+        posting = low + int(np.searchsorted(self._ids[low:high], entry_id))
+        start, stop = self._position_offsets[posting], self._position_offsets[posting + 1]
+        return self._positions[start:stop]
+
+    def _phrase_ids(self, tokens: list[str]) -> np.ndarray:
+        candidates = self._intersect([self._term_ids(token) for token in tokens])
+        if len(tokens) == 1:
+            return candidates
+
+        matches = []
+        for entry_id in candidates.tolist():
+            starts = self._term_positions(tokens[0], entry_id).astype(np.int64)
+            for offset, token in enumerate(tokens[1:], start=1):
+                following = self._term_positions(token, entry_id).astype(np.int64) - offset
+                starts = np.intersect1d(starts, following, assume_unique=True)
+                if len(starts) == 0:
+                    break
+            if len(starts):
+                matches.append(entry_id)
+        return np.array(matches, dtype=np.uint32)
@@ -0,0 +1,164 @@
+"""Compact in-memory records of parsed HAR requests."""
+import threading
+from typing import Iterable, Iterator, Union
+from app.config.settings import settings
+
+
+# Values seen once are remembered up to this many before the set is reset
+_SEEN_ONCE_LIMIT = 10_000
+
+# Request headers whose repeated values are joined with "; " instead of ", "
+_SEMICOLON_JOINED = frozenset({"cookie"})
+
+
+def response_size(response: dict) -> int:
+    """Return the body size of a HAR response, falling back to content size."""
+    size = response.get("bodySize", 0)
+    if size < 0:
+        size = response.get("content", {}).get("size", 0)
+    return size
+
+
+def combine_headers(pairs: Iterable[tuple[str, str]]) -> dict[str, str]:
+    """Map header names to values, combining the values of repeated names."""
+    headers: dict[str, str] = {}
+    for name, value in pairs:
+        if name in headers:
+            separator = "; " if name.lower() in _SEMICOLON_JOINED else ", "
+            headers[name] = headers[name] + separator + value
+        else:
+            headers[name] = value
+    return headers
+
+
+class HeaderSymbols:
+    """Process-wide symbol table of header names and interned header values.
+
+    Header names map to small integer ids, for at most
+    ``settings.har_intern_max_names`` names of up to
+    ``settings.har_intern_max_value`` characters; records keep any other
+    name as a plain string, so uploads with arbitrary header names cannot
+    grow the table without bound. Values up to
+    ``settings.har_intern_max_value`` characters are interned on their
+    second sighting, so that a repeated value (user agent, accept, session
+    cookie) is stored once for all records while one-off values (request
+    ids, trace headers) never enter the table. The table holds at most
+    ``settings.har_intern_max_values`` values.
+    """
+
+    def __init__(self):
+        self.names: list[str] = []
+        self._name_ids: dict[str, int] = {}
+        self._values: dict[str, str] = {}
+        self._seen_once: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def name_id(self, name: str) -> Union[int, str]:
+        """Return the id of a header name, adding it if new.
+
+        Once the table is full, or for an overlong name, the name itself is
+        returned in place of an id.
+        """
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            if len(name) > settings.har_intern_max_value:
+                return name
+            with self._lock:
+                name_id = self._name_ids.get(name)
+                if name_id is None:
+                    if len(self.names) >= settings.har_intern_max_names:
+                        return name
+                    name_id = self._name_ids[name] = len(self.names)
+                    self.names.append(name)
+        return name_id
+
+    def value(self, value: str) -> str:
+        """Return the shared copy of a header value."""
+        interned = self._values.get(value)
+        if interned is not None:
+            return interned
+        if len(value) > settings.har_intern_max_value:
+            return value
+        first = self._seen_once.pop(value, None)
+        if first is None:
+            if len(self._seen_once) >= _SEEN_ONCE_LIMIT:
+                self._seen_once.clear()
+            self._seen_once[value] = value
+            return value
+        if len(self._values) < settings.har_intern_max_values:
+            self._values[value] = first
+        return first
+
+    def stats(self) -> dict:
+        """Return the number of known header names and interned values."""
+        return {"names": len(self.names), "values": len(self._values)}
+
+
+header_symbols = HeaderSymbols()
+
+
+class HARRequestRecord:
+    """Request summary of one HAR entry, stored compactly.
+
+    Headers are kept in capture order, duplicates included, as one flat
+    tuple alternating header name ids (or names the symbol table has no
+    room for) and interned values.
+    """
+
+    __slots__ = ("url", "method", "status", "size", "time", "_headers")
+
+    def __init__(self, url: str, method: str, status: int, size: int, time: float, headers: tuple):
+        self.url = url
+        self.method = method
+        self.status = status
+        self.size = size
+        self.time = time
+        self._headers = headers
+
+    @classmethod
+    def from_entry(cls, entry: dict) -> "HARRequestRecord":
+        """Build a record from a parsed HAR entry."""
+        request = entry.get("request", {})
+        response = entry.get("response", {})
+        return cls(
+            request.get("url", ""),
+            header_symbols.value(request.get("method", "")),
+            response.get("status", 0),
+            response_size(response),
+            entry.get("time", 0),
+            cls._pack(
+                (header.get("name", ""), header.get("value", ""))
+                for header in request.get("headers", [])
+            )
+        )
+
+    @staticmethod
+    def _pack(pairs) -> tuple:
+        packed = []
+        for name, value in pairs:
+            packed.append(header_symbols.name_id(name))
+            packed.append(header_symbols.value(value))
+        return tuple(packed)
+
+    def header_items(self) -> Iterator[tuple[str, str]]:
+        """Yield (name, value) pairs in capture order, duplicates included."""
+        names = header_symbols.names
+        headers = self._headers
+        for i in range(0, len(headers), 2):
+            name = headers[i]
+            yield names[name] if type(name) is int else name, headers[i + 1]
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Headers as a mapping; values of repeated names are combined."""
+        return combine_headers(self.header_items())
+
+    def to_row(self) -> list:
+        """Serialize to a JSON-compatible row."""
+        return [self.url, self.method, self.status, self.size, self.time, list(self.header_items())]
+
+    @classmethod
+    def from_row(cls, row: list) -> "HARRequestRecord":
+        """Rebuild a record serialized with ``to_row``."""
+        url, method, status, size, time, headers = row
+        return cls(url, header_symbols.value(method), status, size, time, cls._pack(headers))
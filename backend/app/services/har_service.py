@@ -0,0 +1,405 @@
+"""HAR service for streaming HAR file parsing."""
+import codecs
+import re
+from typing import IO, AsyncIterator, Iterable, Iterator, Optional
+from fastapi.concurrency import run_in_threadpool
+from app.config.settings import settings
+from app.core.compression import StreamDecompressor
+from app.core.exceptions import FileProcessingError
+from app.core.json_codec import JSONDecodeError, codec
+from app.core.uploads import iter_chunks
+from app.services.har_cache import har_cache
+from app.services.har_records import HARRequestRecord, combine_headers, response_size
+
+
+# Tokens outside of entries: insignificant whitespace, the body of a string
+# up to its closing quote (stopping early at a control character, a bad
+# escape or one cut off by the end of a chunk), and numbers and literals,
+# which are matched whole once a character that cannot extend them follows.
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRING_BODY = re.compile(r'[^"\\\x00-\x1f]*(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*')
+_PARTIAL_ESCAPE = re.compile(r'\\(?:u[0-9a-fA-F]{0,3})?')
+_SCALAR_RUN = re.compile(r'[-+.0-9A-Za-z]+')
+_SCALAR = re.compile(r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?|-?Infinity|NaN|true|false|null')
+
+# What the scanner accepts next
+_VALUE = "value"
+_VALUE_OR_CLOSE = "value or ]"
+_KEY = "key"
+_KEY_OR_CLOSE = "key or }"
+_COLON = ":"
+_COMMA_OR_CLOSE = ", or close"
+_END = "end"
+_VALUES = (_VALUE, _VALUE_OR_CLOSE)
+
+# Keys longer than this are never "log" or "entries", so they are not kept.
+_MAX_KEY_LENGTH = 64
+
+_ENTRIES_PATH = ['log', 'entries']
+
+
+class HARStreamParser:
+    """Incremental parser yielding ``log.entries`` items from HAR bytes.
+
+    Bytes are pushed in with ``feed`` in arbitrarily sized chunks. gzip,
+    deflate and bz2 input is recognised by its magic bytes and decompressed
+    piece by piece on the way in. Outside
+    of the entries array the parser checks the document token by token,
+    rejecting anything ``json.loads`` would, including text after the root
+    value; each entry is decoded in one ``raw_decode`` call once its text
+    is buffered. Memory is bounded by the chunk size plus the largest
+    single entry rather than by the file size.
+    """
+
+    def __init__(self):
+        self._decompressor = StreamDecompressor(
+            settings.har_chunk_size, settings.har_max_decompressed_size
+        )
+        self._text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._pos = 0
+        self._stack: list[tuple[str, Optional[str]]] = []
+        self._in_string = False
+        self._string_start: Optional[int] = None
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._entry_start: Optional[int] = None
+        self._retry_length = 0
+        self._seen_root = False
+        self._expect = _VALUE
+
+    def feed(self, data: bytes) -> Iterator[list[dict]]:
+        """Consume a chunk of bytes, yielding the entries completed by it.
+
+        A compressed chunk may expand many times over, so entries are
+        yielded in one batch per decompressed piece rather than all at once.
+        The generator must be exhausted before the next chunk is fed.
+        """
+        for piece in self._decompressor.decompress(data):
+            entries = self._feed_text(piece)
+            if entries:
+                yield entries
+
+    def close(self) -> Iterator[list[dict]]:
+        """Signal end of input, yielding any entries still pending."""
+        for piece in self._decompressor.flush():
+            entries = self._feed_text(piece)
+            if entries:
+                yield entries
+        entries = self._scan(final=True)
+        if not self._seen_root or self._expect != _END or self._in_string:
+            raise FileProcessingError("Invalid JSON in HAR file")
+        if entries:
+            yield entries
+
+    def _feed_text(self, data: bytes) -> list[dict]:
+        """Scan a chunk of (decompressed) document bytes."""
+        try:
+            self._buffer += self._text_decoder.decode(data)
+        except UnicodeDecodeError:
+            raise FileProcessingError("Invalid UTF-8 in HAR file")
+        entries = self._scan(final=False)
+        self._compact()
+        return entries
+
+    def _in_entries(self) -> bool:
+        """Whether the innermost container is the ``log.entries`` array."""
+        return (
+            len(self._stack) == 3
+            and self._stack[2][0] == '['
+            and [key for _, key in self._stack[1:]] == _ENTRIES_PATH
+        )
+
+    def _decode_entry(self, start: int, final: bool) -> Optional[tuple[dict, int]]:
+        """Decode the entry starting at ``start``, or None if incomplete."""
+        buffer = self._buffer
+        pending = len(buffer) - start
+        # Retry a partial entry only once its text has doubled, which keeps
+        # entries spanning many chunks linear rather than quadratic.
+        if not final and pending < self._retry_length:
+            return None
+        try:
+            entry, end = codec.raw_decode(buffer, start)
+        except JSONDecodeError as e:
+            truncated = e.msg.startswith("Unterminated string") or e.pos >= len(buffer) - 6
+            if final or not truncated:
+                raise FileProcessingError("Invalid JSON in HAR file")
+            self._retry_length = pending * 2
+            return None
+        self._retry_length = 0
+        return (entry if isinstance(entry, dict) else {}), end
+
+    def _after_value(self) -> str:
+        """What may follow a complete value at the current depth."""
+        return _COMMA_OR_CLOSE if self._stack else _END
+
+    def _scan(self, final: bool) -> list[dict]:
+        """Walk the buffered text, collecting completed entries."""
+        buffer = self._buffer
+        end = len(buffer)
+        pos = self._pos
+        entries = []
+
+        if self._entry_start is not None:
+            decoded = self._decode_entry(self._entry_start, final)
+            if decoded is None:
+                return entries
+            entries.append(decoded[0])
+            pos = decoded[1]
+            self._entry_start = None
+
+        while pos < end:
+            if self._in_string:
+                stop = _STRING_BODY.match(buffer, pos).end()
+                if stop < end and buffer[stop] != '"':
+                    # A control character or bad escape, unless an escape is
+                    # only cut off by the end of the chunk
+                    if final or not _PARTIAL_ESCAPE.fullmatch(buffer, stop):
+                        raise FileProcessingError("Invalid JSON in HAR file")
+                if stop >= end or buffer[stop] != '"':
+                    pos = stop
+                    break
+                self._in_string = False
+                if self._string_start is not None:
+                    self._last_string = buffer[self._string_start:stop]
+                    self._string_start = None
+                pos = stop + 1
+                continue
+
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos >= end:
+                break
+            token = buffer[pos]
+            expect = self._expect
+
+            if token == '"':
+                if expect in (_KEY, _KEY_OR_CLOSE):
+                    self._expect = _COLON
+                elif expect in _VALUES:
+                    self._expect = self._after_value()
+                else:
+                    raise FileProcessingError("Invalid JSON in HAR file")
+                pos += 1
+                self._in_string = True
+                self._last_string = None
+                # Only shallow strings can be one of the keys we follow
+                if len(self._stack) <= 2:
+                    self._string_start = pos
+            elif token == ':':
+                if expect != _COLON:
+                    raise FileProcessingError("Invalid JSON in HAR file")
+                pos += 1
+                self._key = self._last_string
+                self._expect = _VALUE
+            elif token == ',':
+                if expect != _COMMA_OR_CLOSE:
+                    raise FileProcessingError("Invalid JSON in HAR file")
+                pos += 1
+                self._expect = _KEY if self._stack[-1][0] == '{' else _VALUE
+            elif token in ('{', '['):
+                if expect not in _VALUES:
+                    raise FileProcessingError("Invalid JSON in HAR file")
+                if token == '{' and self._in_entries():
+                    self._expect = _COMMA_OR_CLOSE
+                    decoded = self._decode_entry(pos, final)
+                    if decoded is None:
+                        self._entry_start = pos
+                        pos += 1
+                        break
+                    entries.append(decoded[0])
+                    pos = decoded[1]
+                    continue
+                pos += 1
+                parent = self._stack[-1][0] if self._stack else None
+                self._stack.append((token, self._key if parent == '{' else None))
+                self._key = None
+                self._seen_root = True
+                self._expect = _KEY_OR_CLOSE if token == '{' else _VALUE_OR_CLOSE
+            elif token in ('}', ']'):
+                opening = '{' if token == '}' else '['
+                if not self._stack or self._stack[-1][0] != opening or expect not in (
+                    _COMMA_OR_CLOSE, _KEY_OR_CLOSE if token == '}' else _VALUE_OR_CLOSE
+                ):
+                    raise FileProcessingError("Invalid JSON in HAR file")
+                pos += 1
+                self._stack.pop()
+                self._key = None
+                self._expect = self._after_value()
+            else:
+                run = _SCALAR_RUN.match(buffer, pos)
+                if run is None or expect not in _VALUES:
+                    raise FileProcessingError("Invalid JSON in HAR file")
+                if run.end() >= end and not final:
+                    # The number or literal may continue in the next chunk
+                    break
+                if not _SCALAR.fullmatch(run.group()):
+                    raise FileProcessingError("Invalid JSON in HAR file")
+                pos = run.end()
+                self._expect = self._after_value()
+
+        self._pos = pos
+        return entries
+
+    def _compact(self) -> None:
+        """Drop consumed text that no longer belongs to a pending token."""
+        keep = self._pos
+        if self._entry_start is not None:
+            keep = min(keep, self._entry_start)
+        if self._string_start is not None:
+            if self._pos - self._string_start > _MAX_KEY_LENGTH:
+                self._string_start = None
+            else:
+                keep = min(keep, self._string_start)
+
+        if keep == 0:
+            return
+
+        self._buffer = self._buffer[keep:]
+        self._pos -= keep
+        if self._entry_start is not None:
+            self._entry_start -= keep
+        if self._string_start is not None:
+            self._string_start -= keep
+
+
+class HARService:
+    """Service for HAR file operations."""
+
+    def iter_entry_batches(self, chunks: Iterable[bytes]) -> Iterator[list[dict]]:
+        """Yield the HAR entries completed by each of a series of byte chunks."""
+        parser = HARStreamParser()
+        for chunk in chunks:
+            yield from parser.feed(chunk)
+        yield from parser.close()
+
+    def iter_entries(self, chunks: Iterable[bytes]) -> Iterator[dict]:
+        """Yield HAR entries from an iterable of byte chunks."""
+        for entries in self.iter_entry_batches(chunks):
+            yield from entries
+
+    async def iter_upload(self, file) -> AsyncIterator[dict]:
+        """Yield HAR entries from an uploaded file, reading it in chunks.
+
+        Args:
+            file: Uploaded HAR file (``UploadFile``)
+        """
+        parser = HARStreamParser()
+        while True:
+            chunk = await file.read(settings.har_chunk_size)
+            if not chunk:
+                break
+            for entries in parser.feed(chunk):
+                for entry in entries:
+                    yield entry
+        for entries in parser.close():
+            for entry in entries:
+                yield entry
+
+    def summarize_entry(self, entry: dict) -> dict:
+        """Extract the request summary fields from a HAR entry."""
+        request = entry.get("request", {})
+        response = entry.get("response", {})
+
+        return {
+            "url": request.get("url", ""),
+            "method": request.get("method", ""),
+            "status": response.get("status", 0),
+            "size": response_size(response),
+            "time": entry.get("time", 0),
+            "headers": combine_headers(
+                (header.get("name", ""), header.get("value", ""))
+                for header in request.get("headers", [])
+            )
+        }
+
+    async def parse_upload(self, file, include_requests: bool = True) -> dict:
+        """Parse an uploaded HAR file into request summaries and totals.
+
+        Results are cached by the SHA-256 digest of the upload, so a repeat
+        upload of the same file is answered without parsing it again.
+
+        Args:
+            file: Uploaded HAR file (``UploadFile``)
+            include_requests: Keep per-request summaries. When False only
+                the totals are computed and memory stays bounded.
+        """
+        digest = await har_cache.digest_upload(file)
+        key = digest if include_requests else f"{digest}-summary"
+        cached = await run_in_threadpool(har_cache.get, key)
+        if cached is not None:
+            return cached
+
+        result = await self._parse_upload(file, include_requests)
+        await run_in_threadpool(har_cache.put, key, result)
+        return result
+
+    async def _parse_upload(self, file, include_requests: bool) -> dict:
+        """Parse an uploaded HAR file without consulting the cache."""
+        requests = []
+        total_requests = 0
+        total_size = 0
+        total_time = 0
+
+        async for entry in self.iter_upload(file):
+            if include_requests:
+                record = HARRequestRecord.from_entry(entry)
+                requests.append(record)
+                size, time = record.size, record.time
+            else:
+                size, time = response_size(entry.get("response", {})), entry.get("time", 0)
+            total_requests += 1
+            total_size += size
+            total_time += time
+
+        return {
+            "requests": requests,
+            "total_requests": total_requests,
+            "total_size": total_size,
+            "total_time": round(total_time, 2)
+        }
+
+    def iter_ndjson(self, fileobj: IO[bytes]) -> Iterator[str]:
+        """Stream request summaries of a HAR file as NDJSON.
+
+        One line is written per entry as soon as it is parsed, followed by a
+        trailing ``{"summary": {...}}`` line with the totals. A parse error
+        after streaming has started is reported as an ``{"error": ...}``
+        line. The file is closed once the stream ends.
+
+        Args:
+            fileobj: Binary file object holding the HAR document
+        """
+        total_requests = 0
+        total_size = 0
+        total_time = 0
+
+        try:
+            chunks = iter_chunks(fileobj, settings.har_chunk_size)
+            for entries in self.iter_entry_batches(chunks):
+                lines = []
+                for entry in entries:
+                    summary = self.summarize_entry(entry)
+                    total_requests += 1
+                    total_size += summary["size"]
+                    total_time += summary["time"]
+                    lines.append(codec.dumps(summary))
+                lines.append("")
+                yield "\n".join(lines)
+
+            yield codec.dumps({
+                "summary": {
+                    "total_requests": total_requests,
+                    "total_size": total_size,
+                    "total_time": round(total_time, 2)
+                }
+            }) + "\n"
+        except FileProcessingError as e:
+            yield codec.dumps({"error": e.message}) + "\n"
+        except Exception as e:
+            yield codec.dumps({"error": str(e)}) + "\n"
+        finally:
+            fileobj.close()
+
+
+# Singleton instance
+har_service = HARService()
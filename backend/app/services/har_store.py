@@ -0,0 +1,377 @@
+"""HAR session store backed by indexed columns."""
+import math
+import re
+import time
+import uuid
+from datetime import datetime
+from array import array
+from collections import OrderedDict
+from typing import Optional
+import numpy as np
+from app.config.settings import settings
+from app.core.exceptions import NotFoundError, ValidationError
+from app.services.har_index import HARTextIndexBuilder
+from app.services.har_service import har_service, response_size
+
+
+# Number of URL substring searches remembered per table
+_SEARCH_CACHE_SIZE = 16
+
+# Host part of an absolute URL, skipping any userinfo and port
+_URL_HOST = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*://(?:[^/?#@]*@)?(\[[^\]/?#]*\]|[^/?#:]*)')
+
+
+# Timing phases recorded per entry, in HAR order
+TIMING_PHASES = ("blocked", "dns", "connect", "ssl", "send", "wait", "receive")
+
+
+def url_host(url: str) -> str:
+    """Return the lower-cased host of a URL, or an empty string."""
+    match = _URL_HOST.match(url)
+    return match.group(1).lower() if match else ""
+
+
+def _epoch_ms(started: str) -> float:
+    """Parse a HAR ``startedDateTime`` into epoch milliseconds, NaN if invalid."""
+    try:
+        if started.endswith("Z"):
+            started = started[:-1] + "+00:00"
+        return datetime.fromisoformat(started).timestamp() * 1000
+    except (AttributeError, TypeError, ValueError):
+        return math.nan
+
+
+def _phase(timings: dict, name: str) -> float:
+    """Return a timing phase in ms, NaN when absent or marked -1."""
+    value = timings.get(name, -1)
+    if value is None or value < 0:
+        return math.nan
+    return value
+
+
+class _Vocabulary:
+    """Dictionary encoding of a low-cardinality string column."""
+
+    def __init__(self):
+        self.values: list[str] = []
+        self.codes: dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+class HARTableBuilder:
+    """Accumulates HAR entries into column arrays.
+
+    Args:
+        index: Optional full-text index builder fed with every entry
+    """
+
+    def __init__(self, index: Optional[HARTextIndexBuilder] = None):
+        self.index = index
+        self.urls: list[str] = []
+        self.methods = _Vocabulary()
+        self.hosts = _Vocabulary()
+        self.mimes = _Vocabulary()
+        self.method_codes = array("H")
+        self.host_codes = array("I")
+        self.mime_codes = array("I")
+        self.statuses = array("i")
+        self.sizes = array("q")
+        self.times = array("d")
+        self.started = array("d")
+        self.timings = {phase: array("d") for phase in TIMING_PHASES}
+
+    def add(self, entry: dict) -> None:
+        """Append one HAR entry."""
+        request = entry.get("request", {})
+        response = entry.get("response", {})
+        url = request.get("url", "")
+        mime = response.get("content", {}).get("mimeType", "") or ""
+
+        if self.index is not None:
+            self.index.add(len(self.urls), entry)
+        self.urls.append(url)
+        self.method_codes.append(self.methods.encode(request.get("method", "")))
+        self.host_codes.append(self.hosts.encode(url_host(url)))
+        self.mime_codes.append(self.mimes.encode(mime.split(";", 1)[0].strip().lower()))
+        self.statuses.append(response.get("status", 0) or 0)
+        self.sizes.append(response_size(response))
+        self.times.append(entry.get("time", 0) or 0)
+        self.started.append(_epoch_ms(entry.get("startedDateTime")))
+
+        timings = entry.get("timings") or {}
+        for phase in TIMING_PHASES:
+            self.timings[phase].append(_phase(timings, phase))
+
+    def build(self) -> "HARTable":
+        """Freeze the accumulated columns into an indexed table."""
+        return HARTable(self)
+
+
+class HARTable:
+    """Immutable column store of HAR requests with precomputed indexes.
+
+    URLs are kept as one newline-joined string with row offsets, string
+    columns are dictionary encoded, and numeric columns are NumPy arrays.
+    Status, host and method filters are answered from row-id indexes and
+    sorting uses precomputed orderings, so a query costs a few vectorized
+    operations regardless of how the table was built.
+    """
+
+    def __init__(self, builder: HARTableBuilder):
+        self.count = len(builder.urls)
+
+        self._urls = "\n".join(builder.urls) + "\n"
+        lengths = np.fromiter((len(url) + 1 for url in builder.urls), dtype=np.int64, count=self.count)
+        self._url_offsets = np.zeros(self.count + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self._url_offsets[1:])
+
+        self.methods = builder.methods
+        self.hosts = builder.hosts
+        self.mimes = builder.mimes
+        self.method_codes = np.frombuffer(builder.method_codes, dtype=np.uint16).copy()
+        self.host_codes = np.frombuffer(builder.host_codes, dtype=np.uint32).copy()
+        self.mime_codes = np.frombuffer(builder.mime_codes, dtype=np.uint32).copy()
+        self.status = np.frombuffer(builder.statuses, dtype=np.int32).copy()
+        self.size = np.frombuffer(builder.sizes, dtype=np.int64).copy()
+        self.time = np.frombuffer(builder.times, dtype=np.float64).copy()
+        self.started = np.frombuffer(builder.started, dtype=np.float64).copy()
+        self.timings = {
+            phase: np.frombuffer(values, dtype=np.float64).copy()
+            for phase, values in builder.timings.items()
+        }
+
+        self._host_index = self._group_rows(self.host_codes, len(self.hosts.values))
+        self._method_index = self._group_rows(self.method_codes, len(self.methods.values))
+        statuses, status_codes = np.unique(self.status, return_inverse=True)
+        self._status_values = statuses
+        self._status_index = self._group_rows(status_codes, len(statuses))
+
+        self._orders = {
+            "time": np.argsort(self.time, kind="stable"),
+            "size": np.argsort(self.size, kind="stable"),
+        }
+        self._search_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.text_index = builder.index.build() if builder.index is not None else None
+
+    @staticmethod
+    def _group_rows(codes: np.ndarray, groups: int) -> list[np.ndarray]:
+        """Build a row-id list per code value."""
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(groups + 1))
+        return [order[bounds[i]:bounds[i + 1]] for i in range(groups)]
+
+    def url(self, row: int) -> str:
+        """Return the URL of a row."""
+        return self._urls[self._url_offsets[row]:self._url_offsets[row + 1] - 1]
+
+    def _rows_with_url(self, term: str) -> np.ndarray:
+        """Return ids of rows whose URL contains ``term``."""
+        cached = self._search_cache.get(term)
+        if cached is not None:
+            self._search_cache.move_to_end(term)
+            return cached
+
+        rows = []
+        if term and "\n" not in term:
+            urls = self._urls
+            offsets = self._url_offsets
+            pos = urls.find(term)
+            while pos != -1:
+                row = int(np.searchsorted(offsets, pos, side="right")) - 1
+                rows.append(row)
+                pos = urls.find(term, offsets[row + 1])
+        result = np.array(rows, dtype=np.int64)
+
+        self._search_cache[term] = result
+        if len(self._search_cache) > _SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        return result
+
+    def _status_rows(self, status: str) -> np.ndarray:
+        """Return ids of rows matching an exact status or a class like ``4xx``."""
+        status = status.strip().lower()
+        if len(status) == 3 and status.endswith("xx") and status[0].isdigit():
+            low = int(status[0]) * 100
+            selected = np.flatnonzero((self._status_values >= low) & (self._status_values < low + 100))
+        elif status.isdigit():
+            selected = np.flatnonzero(self._status_values == int(status))
+        else:
+            raise ValidationError("Status must be a code like 404 or a class like 4xx")
+        if len(selected) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self._status_index[i] for i in selected])
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        host: Optional[str] = None,
+        method: Optional[str] = None,
+        url_contains: Optional[str] = None,
+        sort: Optional[str] = None,
+        descending: bool = False,
+        offset: int = 0,
+        limit: int = 100
+    ) -> dict:
+        """Filter, sort and paginate the table.
+
+        Args:
+            status: Exact status code or status class (e.g. ``4xx``)
+            host: Exact host name
+            method: HTTP method
+            url_contains: Substring the URL must contain
+            sort: ``time`` or ``size``; row order when omitted
+            descending: Sort in descending order
+            offset: Number of matching rows to skip
+            limit: Maximum number of rows to return
+        """
+        selections = []
+        if status is not None:
+            selections.append(self._status_rows(status))
+        if host is not None:
+            code = self.hosts.codes.get(host)
+            selections.append(self._host_index[code] if code is not None else np.empty(0, dtype=np.int64))
+        if method is not None:
+            code = self.methods.codes.get(method.upper())
+            selections.append(self._method_index[code] if code is not None else np.empty(0, dtype=np.int64))
+        if url_contains is not None:
+            selections.append(self._rows_with_url(url_contains))
+
+        mask = None
+        for rows in selections:
+            selected = np.zeros(self.count, dtype=bool)
+            selected[rows] = True
+            mask = selected if mask is None else mask & selected
+
+        if sort is not None:
+            order = self._orders.get(sort)
+            if order is None:
+                raise ValidationError("Sort must be 'time' or 'size'")
+            if descending:
+                order = order[::-1]
+            rows = order if mask is None else order[mask[order]]
+        else:
+            rows = np.arange(self.count) if mask is None else np.flatnonzero(mask)
+            if descending:
+                rows = rows[::-1]
+
+        page = rows[offset:offset + limit]
+        return {
+            "total": int(len(rows)),
+            "offset": offset,
+            "limit": limit,
+            "requests": [self.row(int(row)) for row in page]
+        }
+
+    def search(self, query: str, mode: str = "term", offset: int = 0, limit: int = 100) -> dict:
+        """Run a full-text query and paginate the matching rows.
+
+        Args:
+            query: Query text
+            mode: ``term``, ``prefix`` or ``phrase``
+            offset: Number of matching rows to skip
+            limit: Maximum number of rows to return
+        """
+        if self.text_index is None:
+            raise ValidationError("This session was created without a full-text index")
+        rows = self.text_index.search(query, mode)
+        return {
+            "total": int(len(rows)),
+            "offset": offset,
+            "limit": limit,
+            "requests": [self.row(int(row)) for row in rows[offset:offset + limit]]
+        }
+
+    def row(self, row: int) -> dict:
+        """Materialize a single row."""
+        return {
+            "id": row,
+            "url": self.url(row),
+            "method": self.methods.values[self.method_codes[row]],
+            "status": int(self.status[row]),
+            "size": int(self.size[row]),
+            "time": float(self.time[row]),
+            "mime_type": self.mimes.values[self.mime_codes[row]],
+            "host": self.hosts.values[self.host_codes[row]]
+        }
+
+    def summary(self) -> dict:
+        """Return table-wide totals."""
+        return {
+            "total_requests": self.count,
+            "total_size": int(self.size.sum()),
+            "total_time": round(float(self.time.sum()), 2),
+            "hosts": len(self.hosts.values),
+            "index": self.text_index.stats() if self.text_index is not None else None
+        }
+
+
+class HARSessionStore:
+    """In-memory store of parsed HAR tables keyed by session id.
+
+    Sessions expire after ``settings.har_session_ttl`` seconds of inactivity
+    and the least recently used session is evicted once
+    ``settings.har_max_sessions`` is exceeded.
+    """
+
+    def __init__(self):
+        self._sessions: OrderedDict[str, tuple[HARTable, float]] = OrderedDict()
+
+    async def load(self, file, index: bool = False, index_bodies: bool = False) -> HARTable:
+        """Parse an uploaded HAR file into a table without storing it.
+
+        Args:
+            file: Uploaded HAR file
+            index: Build a full-text index while parsing
+            index_bodies: Include decoded text response bodies in the index
+        """
+        text_index = HARTextIndexBuilder(include_bodies=index_bodies) if index or index_bodies else None
+        builder = HARTableBuilder(index=text_index)
+        async for entry in har_service.iter_upload(file):
+            builder.add(entry)
+        return builder.build()
+
+    async def create(self, file, index: bool = False, index_bodies: bool = False) -> tuple[str, HARTable]:
+        """Parse an uploaded HAR file and store it under a new session id."""
+        table = await self.load(file, index=index, index_bodies=index_bodies)
+
+        self._expire()
+        session_id = uuid.uuid4().hex
+        self._sessions[session_id] = (table, time.monotonic())
+        while len(self._sessions) > settings.har_max_sessions:
+            self._sessions.popitem(last=False)
+        return session_id, table
+
+    def get(self, session_id: str) -> HARTable:
+        """Return the table of a live session."""
+        self._expire()
+        stored = self._sessions.get(session_id)
+        if stored is None:
+            raise NotFoundError(f"HAR session '{session_id}' not found")
+        self._sessions[session_id] = (stored[0], time.monotonic())
+        self._sessions.move_to_end(session_id)
+        return stored[0]
+
+    def delete(self, session_id: str) -> None:
+        """Drop a session."""
+        if self._sessions.pop(session_id, None) is None:
+            raise NotFoundError(f"HAR session '{session_id}' not found")
+
+    def _expire(self) -> None:
+        """Drop sessions idle for longer than the configured TTL."""
+        cutoff = time.monotonic() - settings.har_session_ttl
+        while self._sessions:
+            session_id, (_, last_used) = next(iter(self._sessions.items()))
+            if last_used >= cutoff:
+                break
+            self._sessions.popitem(last=False)
+
+
+# Singleton instance
+har_store = HARSessionStore()
@@ -0,0 +1,145 @@
+"""Downsampled HAR waterfall timelines."""
+from typing import Optional
+import numpy as np
+from app.core.exceptions import ValidationError
+from app.services.har_store import HARTable
+
+
+class HARTimelineService:
+    """Service reducing a capture to a bounded level-of-detail timeline."""
+
+    def timeline(
+        self,
+        table: HARTable,
+        points: int = 2000,
+        top: int = 3,
+        start_ms: Optional[float] = None,
+        end_ms: Optional[float] = None
+    ) -> dict:
+        """Bucket the requests of a capture over time.
+
+        The window is split into equal buckets so that the buckets plus up
+        to ``top`` slowest entries per bucket fit in ``points``. Each bucket
+        reports the requests started in it, and the requests and response
+        bytes in flight (requests whose [start, start + time] span overlaps
+        it). All columns are computed with array passes over the start
+        times; nothing is done per entry except for the reported slowest.
+
+        Args:
+            table: Parsed HAR table
+            points: Maximum buckets plus slowest entries returned
+            top: Slowest entries reported per bucket
+            start_ms: Window start, in ms from the first request (default 0)
+            end_ms: Window end, in ms from the first request (default: last
+                request end)
+        """
+        if points < top + 1:
+            raise ValidationError("Point budget must cover at least one bucket and its slowest entries")
+
+        valid = np.flatnonzero(~np.isnan(table.started))
+        if len(valid) == 0:
+            return self._empty(table.count)
+
+        origin = float(table.started[valid].min())
+        offsets = table.started[valid] - origin
+        durations = np.nan_to_num(table.time[valid], nan=0.0).clip(min=0)
+        ends = offsets + durations
+
+        low = 0.0 if start_ms is None else float(start_ms)
+        high = float(ends.max()) if end_ms is None else float(end_ms)
+        if high <= low:
+            high = low + 1.0
+
+        buckets = max(points // (top + 1), 1)
+        width = (high - low) / buckets
+
+        overlapping = (ends >= low) & (offsets <= high)
+        rows = valid[overlapping]
+        offsets = offsets[overlapping]
+        ends = ends[overlapping]
+        first = np.clip(((offsets - low) // width).astype(np.int64), 0, buckets - 1)
+        last = np.clip(((ends - low) // width).astype(np.int64), 0, buckets - 1)
+
+        # Spans are added as +1 at their first bucket and -1 after their last
+        sizes = table.size[rows].clip(min=0).astype(np.float64)
+        in_flight = np.cumsum(
+            np.bincount(first, minlength=buckets + 1) - np.bincount(last + 1, minlength=buckets + 1)
+        )[:buckets]
+        bytes_in_flight = np.cumsum(
+            np.bincount(first, weights=sizes, minlength=buckets + 1)
+            - np.bincount(last + 1, weights=sizes, minlength=buckets + 1)
+        )[:buckets]
+
+        started_inside = offsets >= low
+        counts = np.bincount(first[started_inside], minlength=buckets)
+
+        return {
+            "total_requests": table.count,
+            "window_requests": int(started_inside.sum()),
+            "origin": origin,
+            "start_ms": round(low, 3),
+            "end_ms": round(high, 3),
+            "bucket_ms": round(width, 3),
+            "offsets_ms": np.round(low + np.arange(buckets) * width, 3).tolist(),
+            "counts": counts.tolist(),
+            "in_flight": in_flight.tolist(),
+            "bytes_in_flight": np.round(bytes_in_flight).astype(np.int64).tolist(),
+            "slowest": self._slowest(
+                table, rows[started_inside], first[started_inside],
+                offsets[started_inside], buckets, top
+            )
+        }
+
+    @staticmethod
+    def _slowest(
+        table: HARTable,
+        rows: np.ndarray,
+        bucket: np.ndarray,
+        offsets: np.ndarray,
+        buckets: int,
+        top: int
+    ) -> list[dict]:
+        """Up to ``top`` slowest entries started in each bucket."""
+        if top == 0 or len(rows) == 0:
+            return []
+
+        # Slowest first, then a stable sort by bucket keeps that order per bucket
+        order = np.argsort(-np.nan_to_num(table.time[rows], nan=-1.0), kind="stable")
+        bucket_codes = bucket[order]
+        if buckets <= np.iinfo(np.uint16).max:
+            bucket_codes = bucket_codes.astype(np.uint16)
+        order = order[np.argsort(bucket_codes, kind="stable")]
+        grouped = bucket[order]
+
+        starts = np.searchsorted(grouped, np.arange(buckets))
+        rank = np.arange(len(order)) - starts[grouped]
+        selected = order[rank < top]
+
+        return [
+            {
+                "bucket": int(bucket[i]),
+                "offset_ms": round(float(offsets[i]), 3),
+                **table.row(int(rows[i]))
+            }
+            for i in selected.tolist()
+        ]
+
+    @staticmethod
+    def _empty(count: int) -> dict:
+        return {
+            "total_requests": count,
+            "window_requests": 0,
+            "origin": None,
+            "start_ms": 0.0,
+            "end_ms": 0.0,
+            "bucket_ms": 0.0,
+            "offsets_ms": [],
+            "counts": [],
+            "in_flight": [],
+            "bytes_in_flight": [],
+            "slowest": []
+        }
+
+
+# Singleton instance
+har_timeline_service = HARTimelineService()
@@ -0,0 +1,215 @@
+"""Canonical JSON (RFC 8785, JCS) serialization and content digests."""
+import asyncio
+import hashlib
+import math
+import os
+import time
+from json.encoder import encode_basestring
+from typing import Any, Callable
+from app.config.settings import settings
+from app.core.exceptions import ValidationError
+from app.core.json_codec import JSONDecodeError, codec
+from app.core.process_pool import run_in_process
+from app.core.uploads import save_upload
+
+
+DIGEST_ALGORITHMS = ("sha256", "sha384", "sha512", "sha1", "md5", "blake2b")
+
+
+def format_number(value: float) -> str:
+    """Serialize a number as ECMAScript's ``Number.prototype.toString``.
+
+    Python's ``repr`` already yields the shortest round-tripping digits;
+    only the placement of the decimal point and exponent differs.
+    """
+    if value == 0:
+        return "0"
+    if not math.isfinite(value):
+        raise ValidationError("NaN and Infinity cannot be canonicalized")
+    mantissa, _, exponent = repr(abs(value)).partition("e")
+    point = mantissa.find(".")
+    if point < 0:
+        point = len(mantissa)
+    digits = mantissa.replace(".", "")
+    stripped = digits.lstrip("0")
+    # Decimal exponent n such that value = 0.<digits> * 10**n
+    n = point - (len(digits) - len(stripped)) + int(exponent or 0)
+    digits = stripped.rstrip("0")
+    k = len(digits)
+
+    if k <= n <= 21:
+        text = digits + "0" * (n - k)
+    elif 0 < n <= 21:
+        text = digits[:n] + "." + digits[n:]
+    elif -6 < n <= 0:
+        text = "0." + "0" * -n + digits
+    else:
+        e = n - 1
+        text = (digits[0] + "." + digits[1:] if k > 1 else digits) + ("e+" if e > 0 else "e-") + str(abs(e))
+    return "-" + text if value < 0 else text
+
+
+# Integers up to 2**53 are exact doubles and print the same either way
+_EXACT_INTEGER = 2 ** 53
+
+
+def _utf16_key(key: str) -> bytes:
+    return key.encode("utf-16-be", "surrogatepass")
+
+
+def _write(value: Any, append: Callable[[str], None]) -> None:
+    kind = type(value)
+    if kind is str:
+        append(encode_basestring(value))
+    elif kind is dict:
+        append("{")
+        separator = ""
+        for key in sorted(value, key=_utf16_key):
+            append(separator)
+            append(encode_basestring(key))
+            append(":")
+            _write(value[key], append)
+            separator = ","
+        append("}")
+    elif kind is list:
+        append("[")
+        separator = ""
+        for item in value:
+            append(separator)
+            _write(item, append)
+            separator = ","
+        append("]")
+    elif value is None:
+        append("null")
+    elif value is True:
+        append("true")
+    elif value is False:
+        append("false")
+    elif kind is int and -_EXACT_INTEGER <= value <= _EXACT_INTEGER:
+        append(str(value))
+    elif kind is int or kind is float:
+        try:
+            append(format_number(float(value)))
+        except OverflowError:
+            raise ValidationError("Number is out of the IEEE 754 double range")
+    else:
+        raise ValidationError(f"Cannot canonicalize a value of type {kind.__name__}")
+
+
+def canonicalize(value: Any) -> bytes:
+    """Serialize a decoded JSON value as RFC 8785 canonical UTF-8 bytes.
+
+    Members are sorted by their UTF-16 code units as each object is
+    written, so the document is traversed once.
+    """
+    parts: list = []
+    _write(value, parts.append)
+    try:
+        return "".join(parts).encode("utf-8")
+    except UnicodeEncodeError:
+        raise ValidationError("Strings with lone surrogates cannot be canonicalized")
+
+
+def _digest(data: bytes, algorithm: str) -> str:
+    if algorithm not in DIGEST_ALGORITHMS:
+        raise ValidationError(f"Unsupported digest algorithm: {algorithm}")
+    return hashlib.new(algorithm, data).hexdigest()
+
+
+def digest_json_file(name: str, path: str, algorithm: str) -> dict:
+    """Canonicalize and digest one JSON file.
+
+    Runs in a worker process, so failures are returned in the result
+    rather than raised.
+    """
+    result = {"name": name, "digest": None, "bytes": 0, "error": None}
+    try:
+        with open(path, "rb") as fileobj:
+            canonical = canonicalize(codec.loads(fileobj.read()))
+        result["digest"] = _digest(canonical, algorithm)
+        result["bytes"] = len(canonical)
+    except JSONDecodeError as e:
+        result["error"] = f"Invalid JSON: {e}"
+    except Exception as e:
+        result["error"] = getattr(e, "message", None) or str(e)
+    return result
+
+
+class JSONCanonicalService:
+    """Service producing canonical JSON and grouping documents by content."""
+
+    def canonicalize(self, json_string: str, algorithm: str = "sha256") -> dict:
+        """Canonicalize one JSON document and digest the canonical bytes."""
+        try:
+            value = codec.loads(json_string)
+        except JSONDecodeError as e:
+            raise ValidationError(f"Invalid JSON: {e}")
+        canonical = canonicalize(value)
+        return {
+            "canonical": canonical.decode("utf-8"),
+            "digest": _digest(canonical, algorithm),
+            "algorithm": algorithm,
+            "bytes": len(canonical)
+        }
+
+    async def group(self, files: list, algorithm: str = "sha256") -> dict:
+        """Digest many JSON uploads in parallel and group identical ones.
+
+        Documents are identical when their canonical forms are, regardless
+        of key order, whitespace, escapes or number spelling. Files that fail
+        to parse are reported with their error and left out of the groups.
+
+        Args:
+            files: Uploaded JSON files
+            algorithm: Digest algorithm
+        """
+        if algorithm not in DIGEST_ALGORITHMS:
+            raise ValidationError(f"Unsupported digest algorithm: {algorithm}")
+        if not files:
+            raise ValidationError("No JSON files found in the upload")
+        if len(files) > settings.json_canonical_max_files:
+            raise ValidationError(f"A batch may contain at most {settings.json_canonical_max_files} files")
+
+        paths = []
+        try:
+            sources = []
+            for file in files:
+                path = await save_upload(file, settings.json_chunk_size)
+                paths.append(path)
+                sources.append((file.filename or f"file-{len(paths)}", path))
+
+            started = time.perf_counter()
+            results = await asyncio.gather(*(
+                run_in_process(digest_json_file, name, path, algorithm)
+                for name, path in sources
+            ))
+            elapsed = time.perf_counter() - started
+        finally:
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+        groups: dict[str, list[str]] = {}
+        for result in results:
+            if result["error"] is None:
+                groups.setdefault(result["digest"], []).append(result["name"])
+        ordered = sorted(groups.items(), key=lambda item: -len(item[1]))
+
+        return {
+            "algorithm": algorithm,
+            "total_files": len(results),
+            "unique": len(groups),
+            "duplicates": sum(len(names) - 1 for names in groups.values()),
+            "groups": [
+                {"digest": digest, "count": len(names), "files": names}
+                for digest, names in ordered
+            ],
+            "files": results,
+            "processing_time": round(elapsed, 3)
+        }
+
+
+# Singleton instance
+json_canonical_service = JSONCanonicalService()
@@ -0,0 +1,419 @@
+"""Recursive structural JSON diff producing RFC 6902 patches."""
+import bisect
+import hashlib
+from typing import Any, Optional
+
+
+_CONTAINERS = (dict, list)
+
+# Array diffs needing more edits fall back to positional comparison
+_MAX_EDIT_DISTANCE = 1000
+
+
+def escape_pointer(token: str) -> str:
+    """Escape one JSON Pointer reference token (RFC 6901)."""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _kind(value: Any) -> str:
+    """JSON type of a value; booleans are not numbers."""
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, bool) or value is None:
+        return "literal"
+    if isinstance(value, (int, float)):
+        return "number"
+    return "string"
+
+
+class SubtreeHashes:
+    """Merkle digests of every object and array of a document.
+
+    Each container's digest is computed bottom-up from its scalar members
+    and its child containers' digests (object members in key order), so
+    two subtrees with equal digests are equal, and comparing them is O(1)
+    once the digests are known. A container's members are serialized in
+    one ``repr`` call, keeping the per-value work in C. Digests are keyed
+    by container identity.
+    """
+
+    def __init__(self, document: Any):
+        self._digests: dict[int, bytes] = {}
+        if type(document) in _CONTAINERS:
+            self._encode(document)
+
+    def _encode(self, node: Any) -> bytes:
+        encode = self._encode
+        if type(node) is dict:
+            keys = sorted(node)
+            members = (b"o", keys, [
+                encode(value) if type(value) in _CONTAINERS else value
+                for value in map(node.__getitem__, keys)
+            ])
+        else:
+            members = (b"a", [
+                encode(value) if type(value) in _CONTAINERS else value
+                for value in node
+            ])
+        digest = hashlib.blake2b(
+            repr(members).encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+        self._digests[id(node)] = digest
+        return digest
+
+    def digest(self, node: Any) -> Optional[bytes]:
+        """Digest of a container of the document, None for scalars."""
+        return self._digests.get(id(node))
+
+
+class _DiffWalk:
+    """One diff run: hashes of both sides and the collected output."""
+
+    def __init__(self, old_hashes: SubtreeHashes, new_hashes: SubtreeHashes, array_key: Optional[str]):
+        self.old_hashes = old_hashes
+        self.new_hashes = new_hashes
+        self.array_key = array_key
+        self.patch: list[dict] = []
+        self.changes: list[dict] = []
+
+    def same(self, old: Any, new: Any) -> bool:
+        """Whether two values are equal, by digest for containers."""
+        kind = _kind(old)
+        if kind != _kind(new):
+            return False
+        if kind in ("object", "array"):
+            return self.old_hashes.digest(old) == self.new_hashes.digest(new)
+        return old == new
+
+    def add(self, path: str, value: Any) -> None:
+        self.patch.append({"op": "add", "path": path, "value": value})
+        self.changes.append({"path": path, "type": "added", "old": None, "new": value})
+
+    def remove(self, path: str, value: Any) -> None:
+        self.patch.append({"op": "remove", "path": path})
+        self.changes.append({"path": path, "type": "removed", "old": value, "new": None})
+
+    def move(self, source: str, path: str) -> None:
+        self.patch.append({"op": "move", "from": source, "path": path})
+        self.changes.append({"path": path, "type": "moved", "from": source, "old": None, "new": None})
+
+    def replace(self, path: str, old: Any, new: Any) -> None:
+        self.patch.append({"op": "replace", "path": path, "value": new})
+        self.changes.append({"path": path, "type": "modified", "old": old, "new": new})
+
+    def compare(self, old: Any, new: Any, path: str) -> None:
+        """Record the operations turning ``old`` into ``new`` at ``path``."""
+        if self.same(old, new):
+            return
+        kind = _kind(old)
+        if kind != _kind(new) or kind not in ("object", "array"):
+            self.replace(path, old, new)
+        elif kind == "object":
+            self.compare_objects(old, new, path)
+        else:
+            self.compare_arrays(old, new, path)
+
+    def compare_objects(self, old: dict, new: dict, path: str) -> None:
+        for key, value in old.items():
+            if key not in new:
+                self.remove(f"{path}/{escape_pointer(key)}", value)
+        for key, value in new.items():
+            child = f"{path}/{escape_pointer(key)}"
+            if key not in old:
+                self.add(child, value)
+            else:
+                self.compare(old[key], value, child)
+
+    def token(self, value: Any, hashes: SubtreeHashes) -> Any:
+        """Hashable stand-in for an array element, equal for equal values."""
+        digest = hashes.digest(value)
+        return digest if digest is not None else (_kind(value), value)
+
+    def compare_arrays(self, old: list, new: list, path: str) -> None:
+        """Diff two arrays by identity key when possible, else by LCS."""
+        if self.array_key is not None:
+            old_keys = self.identities(old)
+            new_keys = self.identities(new) if old_keys is not None else None
+            if new_keys is not None:
+                self.compare_keyed(old, new, old_keys, new_keys, path)
+                return
+        self.compare_sequences(old, new, path)
+
+    def identities(self, items: list) -> Optional[list]:
+        """Identity key tokens of array elements, None unless all are unique."""
+        key = self.array_key
+        tokens = []
+        for item in items:
+            if type(item) is not dict or key not in item or type(item[key]) in _CONTAINERS:
+                return None
+            tokens.append((_kind(item[key]), item[key]))
+        return tokens if len(set(tokens)) == len(tokens) else None
+
+    def compare_keyed(self, old: list, new: list, old_keys: list, new_keys: list, path: str) -> None:
+        """Match elements by identity key in hashed O(n), then diff each pair.
+
+        Elements are removed, moved and added so that the array order
+        matches ``new``; only elements outside the longest run already in
+        order are moved. Matched elements are then compared recursively at
+        their final positions.
+        """
+        new_index = {token: j for j, token in enumerate(new_keys)}
+        old_index = {token: i for i, token in enumerate(old_keys)}
+
+        for i in range(len(old) - 1, -1, -1):
+            if old_keys[i] not in new_index:
+                self.remove(f"{path}/{i}", old[i])
+
+        survivors = [token for token in old_keys if token in new_index]
+        for source, target in _keyed_moves([new_index[token] for token in survivors]):
+            self.move(f"{path}/{source}", f"{path}/{target}")
+
+        for j, token in enumerate(new_keys):
+            if token not in old_index:
+                self.add(f"{path}/{j}", new[j])
+
+        for j, token in enumerate(new_keys):
+            i = old_index.get(token)
+            if i is not None:
+                self.compare(old[i], new[j], f"{path}/{j}")
+
+    def compare_sequences(self, old: list, new: list, path: str) -> None:
+        """Diff arrays positionally with Myers' O(ND) LCS algorithm.
+
+        Elements are compared by digest; after the common prefix and
+        suffix are trimmed, unmatched runs between LCS matches become
+        replacements (diffed recursively) pairwise, then removals or
+        additions. Past ``_MAX_EDIT_DISTANCE`` edits the middle section is
+        compared position by position instead.
+        """
+        old_tokens = [self.token(item, self.old_hashes) for item in old]
+        new_tokens = [self.token(item, self.new_hashes) for item in new]
+
+        start = 0
+        limit = min(len(old), len(new))
+        while start < limit and old_tokens[start] == new_tokens[start]:
+            start += 1
+        old_end, new_end = len(old), len(new)
+        while old_end > start and new_end > start and old_tokens[old_end - 1] == new_tokens[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+
+        matches = _myers(old_tokens[start:old_end], new_tokens[start:new_end], _MAX_EDIT_DISTANCE)
+        if matches is None:
+            matches = []
+        matches = [(start + i, start + j) for i, j in matches]
+        matches.append((old_end, new_end))
+
+        # ``offset`` maps old indices to indices in the array being patched
+        i = j = start
+        offset = 0
+        for match_i, match_j in matches:
+            removed, added = match_i - i, match_j - j
+            paired = min(removed, added)
+            for t in range(paired):
+                self.compare(old[i + t], new[j + t], f"{path}/{i + t + offset}")
+            for t in range(paired, removed):
+                self.remove(f"{path}/{i + paired + offset}", old[i + t])
+            for t in range(paired, added):
+                self.add(f"{path}/{i + t + offset}", new[j + t])
+            offset += added - removed
+            i, j = match_i + 1, match_j + 1
+
+
+def _increasing_run(ranks: list) -> list[int]:
+    """Indices of a longest strictly increasing subsequence of ``ranks``."""
+    tails: list[int] = []
+    tail_ranks: list[int] = []
+    parents = [-1] * len(ranks)
+    for index, rank in enumerate(ranks):
+        position = bisect.bisect_left(tail_ranks, rank)
+        if position:
+            parents[index] = tails[position - 1]
+        if position == len(tails):
+            tails.append(index)
+            tail_ranks.append(rank)
+        else:
+            tails[position] = index
+            tail_ranks[position] = rank
+
+    run = []
+    index = tails[-1] if tails else -1
+    while index >= 0:
+        run.append(index)
+        index = parents[index]
+    run.reverse()
+    return run
+
+
+def _keyed_moves(ranks: list) -> list[tuple[int, int]]:
+    """Move operations putting distinct ranks into ascending order.
+
+    Elements on a longest increasing run stay; every other element is moved
+    to just after its predecessor in the target order. In the gap after
+    each staying element, moved elements therefore come first (by rank)
+    and not-yet-moved ones after (by position), which gives every element
+    a sort key before and after its move. A Fenwick tree over those keys
+    turns each move's source and target index into a prefix count, for
+    O(n log n) overall instead of list scans.
+
+    Returns:
+        (from, to) index pairs with RFC 6902 ``move`` semantics, in order
+    """
+    staying = _increasing_run(ranks)
+    if len(staying) == len(ranks):
+        return []
+    staying_ranks = [ranks[position] for position in staying]
+    is_staying = [False] * len(ranks)
+    for position in staying:
+        is_staying[position] = True
+
+    initial = []
+    moved = {}
+    for position, rank in enumerate(ranks):
+        gap = bisect.bisect_left(staying, position)
+        if is_staying[position]:
+            initial.append((gap, 0, 0))
+        else:
+            initial.append((gap - 1, 2, position))
+            moved[position] = (bisect.bisect_left(staying_ranks, rank) - 1, 1, rank)
+    slots = {key: slot for slot, key in enumerate(sorted(initial + list(moved.values())))}
+
+    tree = [0] * (len(slots) + 1)
+
+    def update(slot: int, delta: int) -> None:
+        slot += 1
+        while slot < len(tree):
+            tree[slot] += delta
+            slot += slot & -slot
+
+    def before(slot: int) -> int:
+        count = 0
+        while slot > 0:
+            count += tree[slot]
+            slot -= slot & -slot
+        return count
+
+    for key in initial:
+        update(slots[key], 1)
+
+    moves = []
+    for position in sorted(moved, key=ranks.__getitem__):
+        current = slots[initial[position]]
+        source = before(current)
+        update(current, -1)
+        final = slots[moved[position]]
+        target = before(final)
+        update(final, 1)
+        if source != target:
+            moves.append((source, target))
+    return moves
+
+
+def _myers(a: list, b: list, max_edits: int) -> Optional[list[tuple[int, int]]]:
+    """Matched index pairs of a shortest edit script, or None past ``max_edits``."""
+    n, m = len(a), len(b)
+    if n == 0 or m == 0:
+        return []
+    max_d = min(n + m, max_edits)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+    for d in range(max_d + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                trace.append(v[offset - d:offset + d + 1])
+                return _myers_matches(trace, n, m)
+        trace.append(v[offset - d:offset + d + 1])
+    return None
+
+
+def _myers_matches(trace: list, n: int, m: int) -> list[tuple[int, int]]:
+    """Walk the Myers trace back from (n, m), collecting diagonal moves."""
+    matches = []
+    x, y = n, m
+    for d in range(len(trace) - 1, 0, -1):
+        previous = trace[d - 1]
+        k = x - y
+        # ``previous`` holds diagonals -(d - 1)..(d - 1)
+        if k == -d or (k != d and previous[k - 1 + d - 1] < previous[k + 1 + d - 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = previous[prev_k + d - 1]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            matches.append((x, y))
+        x, y = prev_x, prev_y
+    while x > 0 and y > 0:
+        x -= 1
+        y -= 1
+        matches.append((x, y))
+    matches.reverse()
+    return matches
+
+
+class JSONDiffService:
+    """Service computing structural differences between JSON documents."""
+
+    def diff(self, old: Any, new: Any, array_key: Optional[str] = None) -> dict:
+        """Compare two parsed JSON documents recursively.
+
+        Both documents are hashed once; the walk then descends only into
+        subtrees whose digests differ, so unchanged branches are skipped
+        regardless of their size.
+
+        Args:
+            old: Original document
+            new: Changed document
+            array_key: Identity field matching elements of arrays of objects
+                (e.g. ``id``). Arrays whose elements do not all carry a
+                unique scalar value of it are diffed by LCS.
+
+        Returns:
+            ``patch`` (RFC 6902 operations turning ``old`` into ``new``),
+            ``changes`` (path, type, old and new value per change, plus
+            ``from`` for moves) and, when both documents are objects,
+            ``added``/``removed``/``modified`` top-level members by name
+        """
+        walker = _DiffWalk(SubtreeHashes(old), SubtreeHashes(new), array_key)
+        walker.compare(old, new, "")
+
+        # The summary keeps its original shape: top-level members of two
+        # objects, by name, with whole values
+        added = {}
+        removed = {}
+        modified = {}
+        if isinstance(old, dict) and isinstance(new, dict):
+            for key, value in old.items():
+                if key not in new:
+                    removed[key] = value
+                elif not walker.same(value, new[key]):
+                    modified[key] = {"old": value, "new": new[key]}
+            for key, value in new.items():
+                if key not in old:
+                    added[key] = value
+
+        return {
+            "added": added,
+            "removed": removed,
+            "modified": modified,
+            "patch": walker.patch,
+            "changes": walker.changes
+        }
+
+
+# Singleton instance
+json_diff_service = JSONDiffService()
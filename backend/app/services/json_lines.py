@@ -0,0 +1,231 @@
+"""NDJSON (JSON Lines) validation and normalization across the process pool."""
+import asyncio
+import time
+from collections import deque
+from typing import IO, AsyncIterator, Callable
+from fastapi.concurrency import run_in_threadpool
+from app.config.settings import settings
+from app.core.json_codec import JSONDecodeError, codec
+from app.core.process_pool import pool_size, run_in_process
+
+
+async def map_line_blocks(fileobj: IO[bytes], func: Callable, *args) -> AsyncIterator:
+    """Apply a worker function to blocks of whole lines, in file order.
+
+    The file is read in chunks of ``settings.json_chunk_size`` bytes and cut
+    at the last newline of each, so no line is split between blocks. Each
+    block is passed to ``func(block, first_line, *args)`` in the shared
+    process pool, at most two per worker in flight, and results are yielded
+    in the order of the blocks.
+
+    Args:
+        fileobj: Binary file object positioned at the start of the lines
+        func: Module-level worker function
+        *args: Extra arguments passed to every call
+    """
+    in_flight: deque = deque()
+    line = 1
+    tail = b""
+    try:
+        while True:
+            chunk = await run_in_threadpool(fileobj.read, settings.json_chunk_size)
+            data = tail + chunk
+            cut = data.rfind(b"\n") + 1 if chunk else len(data)
+            block, tail = data[:cut], data[cut:]
+            if block:
+                in_flight.append(asyncio.ensure_future(run_in_process(func, block, line, *args)))
+                line += block.count(b"\n")
+                if len(in_flight) >= pool_size() * 2:
+                    yield await in_flight.popleft()
+            if not chunk:
+                break
+        while in_flight:
+            yield await in_flight.popleft()
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def _records(block: bytes, first_line: int):
+    """Yield ``(line, record, error)`` for the non-blank lines of a block."""
+    for offset, text in enumerate(block.split(b"\n")):
+        if not text.strip():
+            continue
+        try:
+            yield first_line + offset, codec.loads(text), None
+        except JSONDecodeError as e:
+            yield first_line + offset, None, str(e)
+        except UnicodeDecodeError:
+            yield first_line + offset, None, "Invalid UTF-8"
+        except RecursionError:
+            yield first_line + offset, None, "Nesting too deep"
+        except Exception as e:
+            # One bad record must not fail the rest of its block
+            yield first_line + offset, None, str(e) or type(e).__name__
+
+
+def validate_lines(block: bytes, first_line: int, errors_only: bool) -> dict:
+    """Check that every line of a block is a JSON document.
+
+    Returns:
+        Valid and invalid line counts and the NDJSON result lines
+    """
+    valid = 0
+    invalid = 0
+    output = []
+    for line, _, error in _records(block, first_line):
+        if error is None:
+            valid += 1
+            if not errors_only:
+                output.append(codec.dumps({"line": line, "valid": True}) + "\n")
+        else:
+            invalid += 1
+            output.append(codec.dumps({"line": line, "valid": False, "error": error}) + "\n")
+    return {"valid": valid, "invalid": invalid, "output": "".join(output), "errors": []}
+
+
+def normalize_lines(block: bytes, first_line: int, sort_keys: bool, separator: str) -> dict:
+    """Re-serialize every valid line of a block as compact JSON.
+
+    Invalid lines, and records that cannot be re-serialized, are left out
+    of the output and reported as errors.
+
+    Returns:
+        Valid and invalid line counts, the records joined by ``separator``
+        and ``[line, error]`` per invalid line
+    """
+    records = []
+    errors = []
+    for line, record, error in _records(block, first_line):
+        if error is None:
+            try:
+                records.append(codec.dumps(record, sort_keys=sort_keys))
+                continue
+            except RecursionError:
+                error = "Nesting too deep"
+            except Exception as e:
+                error = f"Cannot serialize: {e}"
+        errors.append([line, error])
+    return {
+        "valid": len(records),
+        "invalid": len(errors),
+        "output": separator.join(records),
+        "errors": errors
+    }
+
+
+class JSONLinesService:
+    """Service processing NDJSON uploads in parallel blocks of lines."""
+
+    async def _run(self, fileobj: IO[bytes], func: Callable, *args) -> AsyncIterator:
+        """Yield each block's output, then the ``summary`` dict.
+
+        The summary counts valid and invalid lines, lists up to
+        ``settings.json_lines_max_errors`` of the errors the worker returned
+        and reports throughput.
+        """
+        valid = 0
+        invalid = 0
+        errors = []
+        started = time.perf_counter()
+        async for result in map_line_blocks(fileobj, func, *args):
+            valid += result["valid"]
+            invalid += result["invalid"]
+            for line, error in result["errors"]:
+                if len(errors) < settings.json_lines_max_errors:
+                    errors.append({"line": line, "error": error})
+            if result["output"]:
+                yield result["output"]
+        duration = time.perf_counter() - started
+
+        lines = valid + invalid
+        summary = {
+            "lines": lines,
+            "valid": valid,
+            "invalid": invalid,
+            "duration": round(duration, 3),
+            "lines_per_second": round(lines / duration, 1) if duration > 0 else 0.0
+        }
+        if errors:
+            summary["errors"] = errors
+        yield summary
+
+    async def iter_validation(self, fileobj: IO[bytes], errors_only: bool = True) -> AsyncIterator[str]:
+        """Stream the validation results of an NDJSON file as NDJSON.
+
+        One ``{"line", "valid", "error"}`` line is written per invalid line
+        (or per line, unless ``errors_only``), followed by a trailing
+        ``{"summary": {...}}`` line. An error after streaming has started is
+        reported as an ``{"error": ...}`` line. The file is closed once the
+        stream ends.
+
+        Args:
+            fileobj: Binary file object holding the NDJSON document
+            errors_only: Only write results for invalid lines
+        """
+        try:
+            async for piece in self._run(fileobj, validate_lines, errors_only):
+                if isinstance(piece, dict):
+                    yield codec.dumps({"summary": piece}) + "\n"
+                else:
+                    yield piece
+        except Exception as e:
+            yield codec.dumps({"error": str(e)}) + "\n"
+        finally:
+            fileobj.close()
+
+    async def iter_conversion(
+        self,
+        fileobj: IO[bytes],
+        output_format: str = "ndjson",
+        sort_keys: bool = False
+    ) -> AsyncIterator[str]:
+        """Stream the records of an NDJSON file as compact, normalized JSON.
+
+        With ``ndjson`` output one record is written per line, followed by a
+        trailing ``{"summary": {...}}`` line; with ``json`` the records are
+        written as ``{"data": [...], "summary": {...}}``. Invalid lines are
+        skipped and listed in the summary. The file is closed once the
+        stream ends.
+
+        Nothing is written before the first block is converted, so an error
+        in it is raised before a response starts. An error after that is
+        reported at the end of the stream: as an ``{"error": ...}`` line, or
+        with ``json`` output by closing the array and ending the object with
+        an ``"error"`` member in place of the summary.
+
+        Args:
+            fileobj: Binary file object holding the NDJSON document
+            output_format: ``ndjson`` or ``json``
+            sort_keys: Sort object members by key
+        """
+        as_json = output_format == "json"
+        separator = "," if as_json else "\n"
+        # The opening goes out with the first records, so nothing is
+        # written until the first block has been converted
+        opening = '{"data":[' if as_json else ""
+        started = False
+        try:
+            async for piece in self._run(fileobj, normalize_lines, sort_keys, separator):
+                if isinstance(piece, dict):
+                    if as_json:
+                        yield opening + '],"summary":' + codec.dumps(piece) + "}"
+                    else:
+                        yield ("\n" if started else "") + codec.dumps({"summary": piece}) + "\n"
+                else:
+                    yield opening + (separator if started else "") + piece
+                    opening = ""
+                    started = True
+        except Exception as e:
+            if not started:
+                raise
+            if as_json:
+                yield '],"error":' + codec.dumps(str(e)) + "}"
+            else:
+                yield "\n" + codec.dumps({"error": str(e)}) + "\n"
+        finally:
+            fileobj.close()
+
+
+# Singleton instance
+json_lines_service = JSONLinesService()
@@ -0,0 +1,661 @@
+"""JSONPath and JMESPath-style queries evaluated over streamed documents."""
+import re
+from functools import lru_cache
+from typing import IO, Any, Callable, Iterable, Iterator, Optional
+from app.config.settings import settings
+from app.core.exceptions import ValidationError
+from app.core.json_codec import JSONDecodeError, codec
+from app.core.uploads import iter_chunks
+from app.services.json_stream import JSONStreamParser, decode_string
+
+
+_IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_-]*')
+_INTEGER = re.compile(r'-?[0-9]+')
+_NUMBER = re.compile(r'-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?')
+_QUOTED = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"", re.DOTALL)
+_BACKTICK = re.compile(r'`(?:[^`\\]|\\.)*`', re.DOTALL)
+_COMPARISON = re.compile(r'==|!=|<=|>=|<|>')
+_SINGLE_QUOTED_ESCAPE = re.compile(r'\\(.)|"', re.DOTALL)
+
+# Transition caches stop growing beyond this many entries
+_MAX_CACHED_TRANSITIONS = 10_000
+
+
+class _Missing:
+    """Result of a filter path that does not exist."""
+
+
+_MISSING = _Missing()
+
+
+def _children(value: Any) -> Iterable[tuple]:
+    """``(key or index, child)`` pairs of a container, in document order."""
+    if isinstance(value, dict):
+        return value.items()
+    if isinstance(value, list):
+        return enumerate(value)
+    return ()
+
+
+class _Step:
+    """One selector of a compiled query.
+
+    ``matches`` tells from a child's key or index alone how many times it
+    is selected, which lets the streaming evaluator skip everything else.
+    Blocking steps also need the parent's length (``size``) and force the
+    parent to be materialized.
+    """
+
+    blocking = False
+
+    def matches(self, component, size: Optional[int] = None) -> int:
+        raise NotImplementedError
+
+
+class _Name(_Step):
+    def __init__(self, name: str):
+        self.name = name
+
+    def matches(self, component, size=None):
+        return component == self.name
+
+
+class _Index(_Step):
+    def __init__(self, index: int):
+        self.index = index
+        self.blocking = index < 0
+
+    def matches(self, component, size=None):
+        index = self.index + size if self.index < 0 and size is not None else self.index
+        return type(component) is int and component == index
+
+
+class _Slice(_Step):
+    def __init__(self, start: Optional[int], stop: Optional[int], step: Optional[int]):
+        self.start = start
+        self.stop = stop
+        self.step = 1 if step is None else step
+        self.blocking = self.step < 0 or (start or 0) < 0 or (stop or 0) < 0
+
+    def matches(self, component, size=None):
+        if type(component) is not int or self.step == 0:
+            return False
+        if self.blocking:
+            if size is None:
+                return False
+            start, stop, step = slice(self.start, self.stop, self.step).indices(size)
+            if step < 0:
+                return stop < component <= start and (start - component) % -step == 0
+            return start <= component < stop and (component - start) % step == 0
+        start = self.start or 0
+        return (
+            component >= start
+            and (self.stop is None or component < self.stop)
+            and (component - start) % self.step == 0
+        )
+
+
+class _Wildcard(_Step):
+    def matches(self, component, size=None):
+        return True
+
+
+class _Union(_Step):
+    def __init__(self, selectors: list[_Step]):
+        self.selectors = selectors
+        self.blocking = any(selector.blocking for selector in selectors)
+
+    def matches(self, component, size=None):
+        # A child named by several selectors is selected once per selector
+        return sum(selector.matches(component, size) for selector in self.selectors)
+
+
+class _Descend(_Step):
+    """Recursive descent (``..``): the next step applies at any depth."""
+
+    def matches(self, component, size=None):
+        return True
+
+
+class _Filter(_Step):
+    def __init__(self, predicate: Callable[[Any], bool]):
+        self.predicate = predicate
+
+    def matches(self, component, size=None):
+        return True
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    return a == b
+
+
+def _ordered(a: Any, b: Any) -> bool:
+    """Whether two values can be compared with <, <=, > and >=."""
+    if isinstance(a, str) and isinstance(b, str):
+        return True
+    return (
+        isinstance(a, (int, float)) and isinstance(b, (int, float))
+        and not isinstance(a, bool) and not isinstance(b, bool)
+    )
+
+
+_COMPARATORS = {
+    "==": lambda a, b: _json_equal(a, b),
+    "!=": lambda a, b: not _json_equal(a, b),
+    "<": lambda a, b: _ordered(a, b) and a < b,
+    "<=": lambda a, b: _ordered(a, b) and a <= b,
+    ">": lambda a, b: _ordered(a, b) and a > b,
+    ">=": lambda a, b: _ordered(a, b) and a >= b,
+}
+
+
+class _QueryParser:
+    """Recursive descent parser for query expressions.
+
+    Accepts JSONPath (``$.store.book[?(@.price < 10)].title``) and the
+    JMESPath-style shorthand without a root (``items[*].id``,
+    ``items[?price < `10`]``).
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+
+    def error(self, message: str):
+        raise ValidationError(f"Invalid query expression at position {self.pos}: {message}")
+
+    def skip(self) -> None:
+        while self.pos < len(self.text) and self.text[self.pos] in " \t\n\r":
+            self.pos += 1
+
+    def peek(self, token: str) -> bool:
+        return self.text.startswith(token, self.pos)
+
+    def take(self, token: str) -> bool:
+        if self.text.startswith(token, self.pos):
+            self.pos += len(token)
+            return True
+        return False
+
+    def expect(self, token: str) -> None:
+        self.skip()
+        if not self.take(token):
+            self.error(f"expected '{token}'")
+
+    def match(self, pattern: re.Pattern) -> Optional[str]:
+        m = pattern.match(self.text, self.pos)
+        if m is None:
+            return None
+        self.pos = m.end()
+        return m.group()
+
+    def parse(self) -> list[_Step]:
+        steps: list[_Step] = []
+        self.skip()
+        if not self.take("$") and not self.peek("["):
+            # JMESPath style: the expression starts with a member
+            steps.append(self.member())
+        while True:
+            self.skip()
+            if self.pos >= len(self.text):
+                return steps
+            if self.take(".."):
+                steps.append(_Descend())
+                steps.append(self.bracket() if self.peek("[") else self.member())
+            elif self.take("."):
+                steps.append(self.member())
+            elif self.peek("["):
+                steps.append(self.bracket())
+            else:
+                self.error("unexpected character")
+
+    def member(self) -> _Step:
+        if self.take("*"):
+            return _Wildcard()
+        if self.peek('"'):
+            return _Name(self.string())
+        name = self.match(_IDENTIFIER)
+        if name is None:
+            self.error("expected a member name")
+        return _Name(name)
+
+    def string(self) -> str:
+        token = self.match(_QUOTED)
+        if token is None:
+            self.error("unterminated string")
+        if token[0] == "'":
+            # Re-quote a single-quoted string as a JSON string
+            token = '"' + _SINGLE_QUOTED_ESCAPE.sub(
+                lambda m: '\\"' if m.group(1) is None else (m.group(1) if m.group(1) == "'" else m.group()),
+                token[1:-1]
+            ) + '"'
+        try:
+            return codec.loads(token)
+        except JSONDecodeError:
+            self.error("invalid string escape")
+
+    def bracket(self) -> _Step:
+        self.take("[")
+        self.skip()
+        if self.take("]"):
+            # JMESPath flatten projection
+            return _Wildcard()
+        if self.take("*"):
+            self.expect("]")
+            return _Wildcard()
+        if self.take("?"):
+            predicate = self.disjunction()
+            self.expect("]")
+            return _Filter(predicate)
+
+        selectors = []
+        while True:
+            self.skip()
+            if self.peek("'") or self.peek('"'):
+                selectors.append(_Name(self.string()))
+            else:
+                selectors.append(self.index_or_slice())
+            self.skip()
+            if self.take("]"):
+                break
+            if not self.take(","):
+                self.error("expected ',' or ']'")
+        if len(selectors) == 1:
+            return selectors[0]
+        if any(isinstance(selector, _Slice) for selector in selectors):
+            self.error("slices cannot be combined with other selectors")
+        return _Union(selectors)
+
+    def integer(self) -> Optional[int]:
+        self.skip()
+        token = self.match(_INTEGER)
+        return int(token) if token is not None else None
+
+    def index_or_slice(self) -> _Step:
+        start = self.integer()
+        self.skip()
+        if not self.peek(":"):
+            if start is None:
+                self.error("expected an index, slice, name, '*' or filter")
+            return _Index(start)
+        self.take(":")
+        stop = self.integer()
+        step = None
+        self.skip()
+        if self.take(":"):
+            step = self.integer()
+        return _Slice(start, stop, step)
+
+    # Filter expressions: ||, &&, !, parentheses, comparisons and existence tests
+
+    def disjunction(self) -> Callable[[Any], bool]:
+        terms = [self.conjunction()]
+        while True:
+            self.skip()
+            if not self.take("||"):
+                break
+            terms.append(self.conjunction())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda value: any(term(value) for term in terms)
+
+    def conjunction(self) -> Callable[[Any], bool]:
+        terms = [self.negation()]
+        while True:
+            self.skip()
+            if not self.take("&&"):
+                break
+            terms.append(self.negation())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda value: all(term(value) for term in terms)
+
+    def negation(self) -> Callable[[Any], bool]:
+        self.skip()
+        if self.take("!"):
+            term = self.negation()
+            return lambda value: not term(value)
+        if self.take("("):
+            term = self.disjunction()
+            self.expect(")")
+            return term
+        return self.comparison()
+
+    def comparison(self) -> Callable[[Any], bool]:
+        left = self.operand()
+        self.skip()
+        op = self.match(_COMPARISON)
+        if op is None:
+            return lambda value: left(value) is not _MISSING
+        right = self.operand()
+        compare = _COMPARATORS[op]
+
+        def predicate(value):
+            a, b = left(value), right(value)
+            if a is _MISSING or b is _MISSING:
+                # A missing value only equals another missing value
+                if op == "==":
+                    return a is b
+                return op == "!=" and a is not b
+            return compare(a, b)
+        return predicate
+
+    def operand(self) -> Callable[[Any], Any]:
+        self.skip()
+        if self.peek("$"):
+            self.error("filters can only refer to the current element '@'")
+        if self.take("@"):
+            return self.relative_path([])
+        if self.peek("'") or self.peek('"'):
+            constant = self.string()
+            return lambda value: constant
+        if self.peek("`"):
+            token = self.match(_BACKTICK)
+            if token is None:
+                self.error("unterminated literal")
+            try:
+                constant = codec.loads(token[1:-1].replace("\\`", "`"))
+            except JSONDecodeError:
+                self.error("invalid JSON literal")
+            return lambda value: constant
+        number = self.match(_NUMBER)
+        if number is not None:
+            constant = codec.loads(number)
+            return lambda value: constant
+        for literal, constant in (("true", True), ("false", False), ("null", None)):
+            if self.peek(literal) and not _IDENTIFIER.match(self.text, self.pos + len(literal)):
+                self.pos += len(literal)
+                return lambda value, constant=constant: constant
+        name = self.match(_IDENTIFIER)
+        if name is None:
+            self.error("expected a value, '@' path or member name")
+        # JMESPath style: a bare member name is relative to the current element
+        return self.relative_path([name])
+
+    def relative_path(self, keys: list) -> Callable[[Any], Any]:
+        while True:
+            if self.take("."):
+                member = self.member()
+                if not isinstance(member, _Name):
+                    self.error("wildcards are not allowed in filter paths")
+                keys.append(member.name)
+            elif self.peek("["):
+                self.take("[")
+                self.skip()
+                if self.peek("'") or self.peek('"'):
+                    keys.append(self.string())
+                else:
+                    index = self.integer()
+                    if index is None:
+                        self.error("expected an index or name")
+                    keys.append(index)
+                self.expect("]")
+            else:
+                break
+
+        def get(value):
+            for key in keys:
+                if isinstance(key, str):
+                    if not isinstance(value, dict) or key not in value:
+                        return _MISSING
+                    value = value[key]
+                else:
+                    if not isinstance(value, list) or not -len(value) <= key < len(value):
+                        return _MISSING
+                    value = value[key]
+            return value
+        return get
+
+
+class _ValueBuilder:
+    """Builds a Python value from the parser events of one JSON value."""
+
+    def __init__(self):
+        self._stack: list = []
+        self._keys: list = []
+        self.value = None
+
+    def add(self, kind: str, raw: str) -> bool:
+        """Consume an event; return True once the value is complete."""
+        if kind == "map_key":
+            self._keys.append(decode_string(raw))
+            return False
+        if kind == "end_map" or kind == "end_array":
+            value = self._stack.pop()
+        elif kind == "start_map":
+            self._stack.append({})
+            return False
+        elif kind == "start_array":
+            self._stack.append([])
+            return False
+        else:
+            value = scalar_value(kind, raw)
+
+        if not self._stack:
+            self.value = value
+            return True
+        parent = self._stack[-1]
+        if isinstance(parent, list):
+            parent.append(value)
+        else:
+            parent[self._keys.pop()] = value
+        return False
+
+
+def scalar_value(kind: str, raw: str) -> Any:
+    """Decode the raw text of a scalar event."""
+    if kind == "string":
+        return decode_string(raw)
+    if kind == "number":
+        if "." in raw or "e" in raw or "E" in raw:
+            return float(raw)
+        return int(raw)
+    if kind == "boolean":
+        return raw == "true"
+    return None
+
+
+class JSONQuery:
+    """A compiled query: a list of steps evaluated like an automaton.
+
+    Each node has a multiset of active steps, derived from its parent's
+    and its own key or index; a step reached along several paths (as with
+    ``$..a..b``) is active once per path, and the node is matched once per
+    active final step. Nodes are visited in document order and a node's
+    own matches come before its descendants', both in memory and over a
+    stream. Over a stream, subtrees with no active step are skipped
+    without being built, and only matched values (and the children tested
+    by filters or selected by blocking steps) are materialized.
+    """
+
+    def __init__(self, expression: str, steps: list[_Step]):
+        self.expression = expression
+        self.steps = steps
+        self._blocking = any(step.blocking for step in steps)
+        self._transitions: dict = {}
+        self._materialize: dict = {}
+        # Per set of active steps: matches at the node, and whether any step is still live
+        self._outcomes: dict = {}
+
+    def evaluate(self, document: Any) -> list:
+        """Return every match in an in-memory document, in document order."""
+        matches: list = []
+        self._walk((0,), (), document, matches)
+        return matches
+
+    def _walk(self, states: tuple, tested: tuple, value: Any, matches: list) -> None:
+        """Append the matches of a node and its descendants, in document order."""
+        if tested:
+            states = tuple(sorted(states + tuple(i + 1 for i in tested if self.steps[i].predicate(value))))
+        outcome = self._outcomes.get(states)
+        if outcome is None:
+            closure = self._closure(states)
+            final = closure.count(len(self.steps))
+            outcome = self._outcomes[states] = (final, final < len(closure))
+        final, live = outcome
+        matches.extend([value] * final)
+        if not live:
+            return
+        size = len(value) if self._blocking and isinstance(value, (dict, list)) else None
+        for component, child in _children(value):
+            child_states, child_tested = self._transition(states, component, size)
+            if child_states or child_tested:
+                self._walk(child_states, child_tested, child, matches)
+
+    def _closure(self, states: tuple) -> list:
+        """Active steps including those reached through recursive descent."""
+        closure = []
+        for i in states:
+            closure.append(i)
+            while i < len(self.steps) and isinstance(self.steps[i], _Descend):
+                i += 1
+                closure.append(i)
+        return closure
+
+    def _needs_value(self, states: tuple) -> bool:
+        """Whether a node with these active steps must be materialized."""
+        needs = self._materialize.get(states)
+        if needs is None:
+            n = len(self.steps)
+            needs = any(i == n or self.steps[i].blocking for i in self._closure(states))
+            self._materialize[states] = needs
+        return needs
+
+    def _transition(self, states: tuple, component, size: Optional[int] = None) -> tuple[tuple, tuple]:
+        """Active steps and pending filter steps of a child.
+
+        ``size`` is the parent's length, known only once it is materialized.
+        """
+        key = (states, component, size)
+        cached = self._transitions.get(key)
+        if cached is not None:
+            return cached
+        child: list = []
+        tested: list = []
+        for i in self._closure(states):
+            if i == len(self.steps):
+                continue
+            step = self.steps[i]
+            if isinstance(step, _Descend):
+                child.append(i)
+            elif isinstance(step, _Filter):
+                tested.append(i)
+            else:
+                child.extend((i + 1,) * step.matches(component, size))
+        result = (tuple(sorted(child)), tuple(tested))
+        # Only names and small indices recur often enough to be worth caching
+        if (type(component) is str or component < 256) and len(self._transitions) < _MAX_CACHED_TRANSITIONS:
+            self._transitions[key] = result
+        return result
+
+    def _evaluate_node(self, states: tuple, tested: tuple, value: Any) -> list:
+        matches: list = []
+        self._walk(states, tested, value, matches)
+        return matches
+
+    def stream(self, events: Iterable[tuple[str, str]]) -> Iterator[Any]:
+        """Yield the matches of a document given as parser events."""
+        # Open containers being walked: [is_array, next index, pending key, active steps]
+        frames: list[list] = []
+        skipped = 0
+        builder: Optional[_ValueBuilder] = None
+        pending: tuple = ((), ())
+
+        for kind, raw in events:
+            if builder is not None:
+                if builder.add(kind, raw):
+                    yield from self._evaluate_node(*pending, builder.value)
+                    builder = None
+                continue
+            if skipped:
+                if kind == "start_map" or kind == "start_array":
+                    skipped += 1
+                elif kind == "end_map" or kind == "end_array":
+                    skipped -= 1
+                continue
+            if kind == "map_key":
+                frames[-1][2] = raw
+                continue
+            if kind == "end_map" or kind == "end_array":
+                frames.pop()
+                continue
+
+            if frames:
+                parent = frames[-1]
+                if parent[0]:
+                    component = parent[1]
+                    parent[1] += 1
+                else:
+                    component = decode_string(parent[2])
+                states, tested = self._transition(parent[3], component)
+            else:
+                states, tested = (0,), ()
+
+            container = kind == "start_map" or kind == "start_array"
+            if not states and not tested:
+                if container:
+                    skipped = 1
+            elif tested or self._needs_value(states):
+                if container:
+                    builder = _ValueBuilder()
+                    builder.add(kind, raw)
+                    pending = (states, tested)
+                else:
+                    yield from self._evaluate_node(states, tested, scalar_value(kind, raw))
+            elif container:
+                frames.append([kind == "start_array", 0, None, states])
+
+
+@lru_cache(maxsize=settings.json_query_cache_size)
+def compile_query(expression: str) -> JSONQuery:
+    """Parse a query expression, reusing recently compiled ones."""
+    return JSONQuery(expression, _QueryParser(expression).parse())
+
+
+class JSONQueryService:
+    """Service evaluating queries against streamed JSON uploads."""
+
+    @staticmethod
+    def _events(fileobj: IO[bytes]) -> Iterator[tuple[str, str]]:
+        parser = JSONStreamParser()
+        for chunk in iter_chunks(fileobj, settings.json_chunk_size):
+            yield from parser.feed(chunk)
+        yield from parser.close()
+
+    def query(self, fileobj: IO[bytes], expression: str, limit: int = 1000) -> dict:
+        """Evaluate a JSONPath or JMESPath-style expression over a document.
+
+        The document is parsed as a stream and only matched values are
+        built. Reading stops as soon as more than ``limit`` matches are
+        found, so the rest of the document is not validated in that case.
+
+        Args:
+            fileobj: Binary file object holding the document
+            expression: Query such as ``$.items[*].id`` or ``items[?price > `10`].name``
+            limit: Maximum number of matches returned
+
+        Returns:
+            Matches in document order, their count and whether more exist
+        """
+        query = compile_query(expression)
+        results = []
+        matches = query.stream(self._events(fileobj))
+        for value in matches:
+            results.append(value)
+            if len(results) > limit:
+                break
+        matches.close()
+
+        truncated = len(results) > limit
+        return {
+            "expression": expression,
+            "results": results[:limit],
+            "count": min(len(results), limit),
+            "truncated": truncated
+        }
+
+
+# Singleton instance
+json_query_service = JSONQueryService()
@@ -0,0 +1,275 @@
+"""JSON Schema validation with compiled, cached validators."""
+import hashlib
+import ipaddress
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional
+from fastapi import UploadFile
+from jsonschema import Draft202012Validator, FormatChecker
+from jsonschema.exceptions import SchemaError, ValidationError as SchemaViolation
+from jsonschema.validators import extend, validator_for
+from referencing.exceptions import Unresolvable
+from app.config.settings import settings
+from app.core.exceptions import ValidationError
+from app.core.json_codec import JSONDecodeError, codec
+from app.services.json_diff import escape_pointer
+from app.services.json_lines import map_line_blocks
+
+
+_EMAIL = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+_UUID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+_URI = re.compile(r"[A-Za-z][A-Za-z0-9+.-]*:[^\s]*")
+_DATE_TIME = re.compile(
+    r"\d{4}-\d{2}-\d{2}[Tt ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:[Zz]|[+-]\d{2}:\d{2})"
+)
+_TIME = re.compile(r"\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:[Zz]|[+-]\d{2}:\d{2})")
+
+
+def _is_date(value: str) -> bool:
+    try:
+        date.fromisoformat(value)
+        return len(value) == 10
+    except ValueError:
+        return False
+
+
+def _is_date_time(value: str) -> bool:
+    if not _DATE_TIME.fullmatch(value):
+        return False
+    try:
+        datetime.fromisoformat(value[:19].replace("t", "T").replace(" ", "T"))
+        return True
+    except ValueError:
+        return False
+
+
+def _is_ip(version: int) -> Callable[[str], bool]:
+    def check(value: str) -> bool:
+        try:
+            return ipaddress.ip_address(value).version == version
+        except ValueError:
+            return False
+    return check
+
+
+# Formats asserted when present; other formats are annotations only
+_FORMATS: dict[str, Callable[[str], bool]] = {
+    "date": _is_date,
+    "date-time": _is_date_time,
+    "time": lambda value: bool(_TIME.fullmatch(value)),
+    "email": lambda value: bool(_EMAIL.fullmatch(value)),
+    "uuid": lambda value: bool(_UUID.fullmatch(value)),
+    "uri": lambda value: bool(_URI.fullmatch(value)),
+    "ipv4": _is_ip(4),
+    "ipv6": _is_ip(6),
+}
+
+
+def _pointer(path: Iterable) -> str:
+    return "".join("/" + escape_pointer(str(token)) for token in path)
+
+
+def _string_format(check: Callable[[str], bool]) -> Callable[[Any], bool]:
+    # Formats only constrain strings
+    return lambda value: not isinstance(value, str) or check(value)
+
+
+_FORMAT_CHECKER = FormatChecker(())
+for _name, _check in _FORMATS.items():
+    _FORMAT_CHECKER.checks(_name)(_string_format(_check))
+
+
+def _multiple_of(validator, divisor, instance, schema):
+    # Floats are compared with a tolerance, so 19.99 is a multiple of 0.01
+    if not validator.is_type(instance, "number"):
+        return
+    if isinstance(instance, int) and isinstance(divisor, int):
+        ok = instance % divisor == 0
+    else:
+        try:
+            quotient = instance / divisor
+        except OverflowError:
+            quotient = math.inf
+        ok = math.isfinite(quotient) and abs(quotient - round(quotient)) < 1e-9
+    if not ok:
+        yield SchemaViolation(f"{instance!r} is not a multiple of {divisor}")
+
+
+@lru_cache(maxsize=None)
+def _validator_class(draft: type) -> type:
+    return extend(draft, {"multipleOf": _multiple_of})
+
+
+def schema_key(schema: Any) -> str:
+    """Hash identifying a schema independently of its key order."""
+    return hashlib.sha256(codec.dumpb(schema, sort_keys=True)).hexdigest()
+
+
+class SchemaValidator:
+    """A JSON Schema checked once and bound to a ``jsonschema`` validator.
+
+    The draft is taken from ``$schema`` (2020-12 when absent), so ``$ref``,
+    ``$anchor``, ``$id`` and ``$dynamicRef`` resolve as that draft
+    specifies. References are resolved within the schema only; remote
+    schemas are never retrieved. ``format`` is asserted for date,
+    date-time, time, email, uuid, uri, ipv4 and ipv6, and ``multipleOf``
+    allows for float rounding.
+    """
+
+    def __init__(self, schema: Any):
+        if not isinstance(schema, (dict, bool)):
+            raise ValidationError("A JSON Schema must be an object or a boolean")
+        draft = validator_for(schema, default=Draft202012Validator)
+        try:
+            draft.check_schema(schema)
+        except SchemaError as e:
+            raise ValidationError(f"Invalid JSON Schema at {_pointer(e.path) or '/'}: {e.message}")
+        self.schema = schema
+        self._validator = _validator_class(draft)(schema, format_checker=_FORMAT_CHECKER)
+
+    def validate(self, instance: Any) -> list[dict]:
+        """Return the errors of an instance; empty when it is valid.
+
+        A reference that cannot be resolved is reported as a ``$ref`` error.
+        """
+        try:
+            return [
+                {
+                    "path": _pointer(error.absolute_path),
+                    # A false subschema reports no keyword
+                    "keyword": error.validator or "false",
+                    "message": error.message
+                }
+                for error in self._validator.iter_errors(instance)
+            ]
+        except Unresolvable as e:
+            return [{"path": "", "keyword": "$ref", "message": f"Cannot resolve $ref: {e}"}]
+
+
+class ValidatorCache:
+    """LRU cache of compiled validators keyed by schema hash.
+
+    Each process keeps its own cache, so a schema is compiled once per
+    worker rather than once per record or batch.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._validators: OrderedDict[str, SchemaValidator] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, schema: Any, key: Optional[str] = None) -> SchemaValidator:
+        """Return the validator of a schema, compiling it on a miss."""
+        key = key or schema_key(schema)
+        with self._lock:
+            validator = self._validators.get(key)
+            if validator is not None:
+                self._validators.move_to_end(key)
+                return validator
+        validator = SchemaValidator(schema)
+        with self._lock:
+            self._validators[key] = validator
+            while len(self._validators) > self.size:
+                self._validators.popitem(last=False)
+        return validator
+
+
+validator_cache = ValidatorCache(settings.json_schema_cache_size)
+
+
+def validate_ndjson_block(block: bytes, first_line: int, schema: Any, key: str) -> dict:
+    """Validate the records of a block of NDJSON lines.
+
+    Runs in a worker process, so invalid records, including lines that
+    are not UTF-8 or nest too deeply to decode or validate, are reported
+    in the result rather than raised.
+
+    Returns:
+        Valid and invalid record counts and ``[line, errors]`` per invalid record
+    """
+    validator = validator_cache.get(schema, key)
+    valid = 0
+    invalid = []
+    for offset, line in enumerate(block.split(b"\n")):
+        if not line.strip():
+            continue
+        try:
+            errors = validator.validate(codec.loads(line))
+        except UnicodeDecodeError:
+            errors = [{"path": "", "keyword": "json", "message": "Invalid UTF-8"}]
+        except RecursionError:
+            errors = [{"path": "", "keyword": "json", "message": "Nesting too deep"}]
+        except ValueError as e:
+            # JSONDecodeError included
+            errors = [{"path": "", "keyword": "json", "message": f"Invalid JSON: {e}"}]
+        if errors:
+            invalid.append([first_line + offset, errors])
+        else:
+            valid += 1
+    return {"valid": valid, "invalid": invalid}
+
+
+class JSONSchemaService:
+    """Service validating JSON documents against JSON Schemas."""
+
+    @staticmethod
+    def _load(text: str, what: str) -> Any:
+        try:
+            return codec.loads(text)
+        except JSONDecodeError as e:
+            raise ValidationError(f"Invalid JSON in {what}: {e}")
+
+    def validate(self, schema_text: str, document_text: str) -> dict:
+        """Validate one document against a schema."""
+        validator = validator_cache.get(self._load(schema_text, "schema"))
+        errors = validator.validate(self._load(document_text, "document"))
+        return {"valid": not errors, "errors": errors}
+
+    async def validate_batch(self, file: UploadFile, schema_text: str, max_records: int = 1000) -> dict:
+        """Validate every record of an NDJSON upload across the process pool.
+
+        Blocks of lines are validated by the workers of the shared pool
+        (see ``map_line_blocks``) and merged in order.
+
+        Args:
+            file: NDJSON upload, one JSON document per line
+            schema_text: JSON Schema as JSON text
+            max_records: Maximum invalid records listed with their errors
+        """
+        schema = self._load(schema_text, "schema")
+        key = schema_key(schema)
+        # Compile here first so schema errors are reported before any work is queued
+        validator_cache.get(schema, key)
+
+        total_valid = 0
+        total_invalid = 0
+        records = []
+        started = time.perf_counter()
+        await file.seek(0)
+        async for result in map_line_blocks(file.file, validate_ndjson_block, schema, key):
+            total_valid += result["valid"]
+            total_invalid += len(result["invalid"])
+            for line, errors in result["invalid"]:
+                if len(records) < max_records:
+                    records.append({"line": line, "errors": errors})
+        duration = time.perf_counter() - started
+
+        total = total_valid + total_invalid
+        return {
+            "total": total,
+            "valid": total_valid,
+            "invalid": total_invalid,
+            "records": records,
+            "truncated": total_invalid > len(records),
+            "duration": round(duration, 3),
+            "records_per_second": round(total / duration, 1) if duration > 0 else 0.0
+        }
+
+
+# Singleton instance
+json_schema_service = JSONSchemaService()
@@ -0,0 +1,446 @@
+"""Incremental JSON tokenizer and event parser for streamed documents."""
+import codecs
+import re
+from json.encoder import encode_basestring, encode_basestring_ascii
+from typing import IO, Iterable, Iterator, Optional
+from app.config.settings import settings
+from app.core.exceptions import JSONSyntaxError
+from app.core.json_codec import codec
+from app.core.uploads import iter_chunks
+
+
+# One token after optional whitespace; the group index identifies its kind
+_TOKEN = re.compile(
+    r'[ \t\n\r]*(?:'
+    r'(\{)|(\[)|(\})|(\])|(:)|(,)'
+    r'|("(?:[^"\\\x00-\x1f]|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*")'
+    r'|(-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)'
+    r'|(true|false|null)'
+    r'|([^ \t\n\r]))'
+)
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRING_PREFIX = re.compile(r'"(?:[^"\\\x00-\x1f]|\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4}))*')
+_PARTIAL_ESCAPE = re.compile(r'\\(?:u[0-9a-fA-F]{0,3})?')
+# A token never ends inside a run of these characters, so a buffer that is
+# not final is only scanned up to the last one
+_DELIMITERS = "{}[]:, \t\n\r"
+
+_START_MAP, _START_ARRAY, _END_MAP, _END_ARRAY, _COLON_TOKEN, _COMMA_TOKEN = 1, 2, 3, 4, 5, 6
+_STRING, _NUMBER, _LITERAL, _OTHER = 7, 8, 9, 10
+
+# Parser states: what the grammar accepts next
+_VALUE = 0         # any value (document root, after ':' or after ',' in an array)
+_FIRST_VALUE = 1   # a value or ']' (just after '[')
+_FIRST_KEY = 2     # a key or '}' (just after '{')
+_KEY = 3           # a key (after ',' in an object)
+_COLON = 4
+_COMMA = 5         # ',' or the closing bracket (after a member or element)
+_DONE = 6          # only whitespace (after the root value)
+
+_EXPECTED = {
+    _VALUE: "Expecting value",
+    _FIRST_VALUE: "Expecting value",
+    _FIRST_KEY: "Expecting property name enclosed in double quotes",
+    _KEY: "Expecting property name enclosed in double quotes",
+    _COLON: "Expecting ':' delimiter",
+    _COMMA: "Expecting ',' delimiter",
+    _DONE: "Extra data",
+}
+
+_LITERAL_EVENTS = {"true": "boolean", "false": "boolean", "null": "null"}
+_SURROGATE = re.compile('[\ud800-\udfff]')
+
+
+class JSONStreamParser:
+    """Push parser turning JSON bytes into ``(event, raw text)`` pairs.
+
+    Bytes are fed in arbitrarily sized chunks. Tokens are matched with one
+    regular expression and checked against the grammar; events are
+    ``start_map``, ``end_map``, ``start_array``, ``end_array``, ``map_key``,
+    ``string``, ``number``, ``boolean`` and ``null``, each paired with the
+    token's raw source text (strings keep their quotes and escapes).
+
+    Memory is bounded by the chunk size, the nesting depth and the longest
+    single token. The first syntax error raises ``JSONSyntaxError`` with
+    its line and column. Depth, object key and array element counts are
+    tracked as the document is read.
+
+    Args:
+        events: Collect events; validation-only callers pass False
+    """
+
+    def __init__(self, events: bool = True):
+        self._collect = events
+        self._text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._pos = 0
+        self._retry_length = 0
+        self._state = _VALUE
+        self._stack: list[str] = []
+        # Position bookkeeping for text already dropped from the buffer
+        self._consumed = 0
+        self._lines = 0
+        self._line_start = 0
+        self.max_depth = 0
+        self.keys = 0
+        self.elements = 0
+
+    @property
+    def depth(self) -> int:
+        """Current nesting depth."""
+        return len(self._stack)
+
+    def feed(self, data: bytes) -> list[tuple[str, str]]:
+        """Consume a chunk of bytes and return the events it completes."""
+        try:
+            text = self._text_decoder.decode(data)
+        except UnicodeDecodeError as e:
+            self._buffer += e.object[:e.start].decode("utf-8", "ignore")
+            self._scan(final=False)
+            self._fail("Invalid UTF-8", len(self._buffer))
+        self._buffer += text
+        events = self._scan(final=False)
+        self._compact()
+        return events
+
+    def close(self) -> list[tuple[str, str]]:
+        """Signal end of input and return the remaining events."""
+        events = self._scan(final=True)
+        if self._state != _DONE:
+            self._fail(_EXPECTED[self._state], len(self._buffer))
+        return events
+
+    def position(self, index: int) -> tuple[int, int]:
+        """Line and column (1-based) of a buffer index."""
+        buffer = self._buffer
+        line = self._lines + buffer.count("\n", 0, index) + 1
+        newline = buffer.rfind("\n", 0, index)
+        if newline >= 0:
+            return line, index - newline
+        return line, self._consumed + index - self._line_start + 1
+
+    def _fail(self, reason: str, index: int):
+        line, column = self.position(index)
+        raise JSONSyntaxError(reason, line, column)
+
+    def _scan(self, final: bool) -> list[tuple[str, str]]:
+        buffer = self._buffer
+        pos = self._pos
+        if final:
+            limit = len(buffer)
+        else:
+            if len(buffer) - pos < self._retry_length:
+                return []
+            limit = max(map(buffer.rfind, _DELIMITERS))
+            if limit < pos:
+                return []
+        self._retry_length = 0
+
+        events = []
+        collect = self._collect
+        stack = self._stack
+        state = self._state
+        keys, elements, max_depth = self.keys, self.elements, self.max_depth
+        in_array = bool(stack) and stack[-1] == "["
+        m = None
+        try:
+            for m in _TOKEN.finditer(buffer, pos, limit):
+                kind = m.lastindex
+                if kind >= _STRING:
+                    if kind == _OTHER:
+                        pos = m.start(kind)
+                        if state <= _KEY and self._incomplete(buffer, pos, limit, final, state):
+                            break
+                        self._state = state
+                        self._fail(_EXPECTED[state], pos)
+                    if state <= _FIRST_VALUE:
+                        if in_array:
+                            elements += 1
+                        state = _COMMA if stack else _DONE
+                        if collect:
+                            token = m.group(kind)
+                            if kind == _STRING:
+                                events.append(("string", token))
+                            elif kind == _NUMBER:
+                                events.append(("number", token))
+                            else:
+                                events.append((_LITERAL_EVENTS[token], token))
+                    elif kind == _STRING and (state == _KEY or state == _FIRST_KEY):
+                        keys += 1
+                        state = _COLON
+                        if collect:
+                            events.append(("map_key", m.group(kind)))
+                    else:
+                        self._state = state
+                        self._fail(_EXPECTED[state], m.start(kind))
+                elif kind == _COMMA_TOKEN:
+                    if state != _COMMA:
+                        self._state = state
+                        self._fail(_EXPECTED[state], m.start(kind))
+                    state = _VALUE if in_array else _KEY
+                elif kind == _COLON_TOKEN:
+                    if state != _COLON:
+                        self._state = state
+                        self._fail(_EXPECTED[state], m.start(kind))
+                    state = _VALUE
+                elif kind <= _START_ARRAY:
+                    if state > _FIRST_VALUE:
+                        self._state = state
+                        self._fail(_EXPECTED[state], m.start(kind))
+                    if in_array:
+                        elements += 1
+                    if kind == _START_MAP:
+                        stack.append("{")
+                        state = _FIRST_KEY
+                        if collect:
+                            events.append(("start_map", "{"))
+                    else:
+                        stack.append("[")
+                        state = _FIRST_VALUE
+                        if collect:
+                            events.append(("start_array", "["))
+                    in_array = kind == _START_ARRAY
+                    if len(stack) > max_depth:
+                        max_depth = len(stack)
+                else:
+                    opener, first = ("{", _FIRST_KEY) if kind == _END_MAP else ("[", _FIRST_VALUE)
+                    if not (stack and stack[-1] == opener and (state == _COMMA or state == first)):
+                        self._state = state
+                        self._fail(_EXPECTED[state], m.start(kind))
+                    stack.pop()
+                    state = _COMMA if stack else _DONE
+                    in_array = bool(stack) and stack[-1] == "["
+                    if collect:
+                        events.append(("end_map", "}") if kind == _END_MAP else ("end_array", "]"))
+            else:
+                if m is not None:
+                    pos = m.end()
+        finally:
+            self.keys, self.elements, self.max_depth = keys, elements, max_depth
+
+        self._pos = pos
+        self._state = state
+        return events
+
+    def _incomplete(self, buffer: str, start: int, limit: int, final: bool, state: int) -> bool:
+        """Whether text that is not a token may still become one.
+
+        Raises the syntax error of a malformed string; the caller reports
+        anything else that cannot start a token.
+        """
+        if buffer[start] != '"':
+            return False
+        stop = _STRING_PREFIX.match(buffer, start, limit).end()
+        if stop == limit or (not final and _PARTIAL_ESCAPE.fullmatch(buffer, stop, limit)):
+            if final:
+                self._state = state
+                self._fail("Unterminated string starting at", start)
+            # Retry an unterminated string once its text has doubled
+            self._retry_length = (len(buffer) - start) * 2
+            return True
+        self._state = state
+        if buffer[stop] != "\\":
+            self._fail("Invalid control character at", stop)
+        if buffer[stop + 1:stop + 2] == "u":
+            self._fail("Invalid \\uXXXX escape", stop + 1)
+        self._fail("Invalid \\escape", stop)
+
+    def _compact(self) -> None:
+        """Drop consumed text, keeping line bookkeeping for error positions."""
+        keep = self._pos
+        if keep == 0:
+            return
+        buffer = self._buffer
+        self._lines += buffer.count("\n", 0, keep)
+        newline = buffer.rfind("\n", 0, keep)
+        if newline >= 0:
+            self._line_start = self._consumed + newline + 1
+        self._consumed += keep
+        self._buffer = buffer[keep:]
+        self._pos = 0
+
+
+def decode_string(raw: str) -> str:
+    """Decode the raw text of a string token."""
+    if "\\" in raw:
+        return codec.loads(raw)
+    return raw[1:-1]
+
+
+class JSONStreamFormatter:
+    """Re-serializes parser events as indented or minified JSON text.
+
+    Output matches ``json.dumps`` with the same ``indent``, ``sort_keys``
+    and ``ensure_ascii`` options, except that numbers are copied verbatim
+    rather than round-tripped through floats. Text is produced as events
+    arrive; with ``sort_keys`` each object is held until it closes so its
+    members can be reordered, which bounds memory by the largest object.
+    """
+
+    def __init__(self, indent: Optional[int] = None, sort_keys: bool = False, ensure_ascii: bool = False):
+        self.indent = indent
+        self.sort_keys = sort_keys
+        self.ensure_ascii = ensure_ascii
+        self._colon = ":" if indent is None else ": "
+        self._newlines = ["\n"]
+        self._root: list[str] = []
+        self._out = self._root
+        # One frame per open container: [opener, items written, sorted members, parent output]
+        self._frames: list[list] = []
+
+    def _newline(self, depth: int) -> str:
+        if self.indent is None:
+            return ""
+        while len(self._newlines) <= depth:
+            self._newlines.append("\n" + " " * (self.indent * len(self._newlines)))
+        return self._newlines[depth]
+
+    def _string(self, raw: str) -> str:
+        if "\\" not in raw and (raw.isascii() or not self.ensure_ascii):
+            return raw
+        value = decode_string(raw)
+        if self.ensure_ascii or _SURROGATE.search(value):
+            # Lone surrogates have no UTF-8 encoding and stay escaped
+            return encode_basestring_ascii(value)
+        return encode_basestring(value)
+
+    def _separate(self, frame: list) -> None:
+        if frame[1]:
+            self._out.append(",")
+        frame[1] += 1
+        self._out.append(self._newline(len(self._frames)))
+
+    def write(self, events: Iterable[tuple[str, str]]) -> str:
+        """Consume parser events and return the text they complete."""
+        frames = self._frames
+        for kind, raw in events:
+            frame = frames[-1] if frames else None
+            if kind == "map_key":
+                if frame[2] is None:
+                    self._separate(frame)
+                else:
+                    self._out = []
+                    frame[2].append((decode_string(raw), self._out))
+                self._out.append(self._string(raw))
+                self._out.append(self._colon)
+                continue
+            if kind == "end_map" or kind == "end_array":
+                self._close(frames.pop(), raw)
+                continue
+
+            if frame is not None and frame[0] == "[":
+                self._separate(frame)
+            if kind == "start_map" or kind == "start_array":
+                if kind == "start_map" and self.sort_keys:
+                    frames.append([raw, 0, [], self._out])
+                else:
+                    self._out.append(raw)
+                    frames.append([raw, 0, None, self._out])
+            elif kind == "string":
+                self._out.append(self._string(raw))
+            else:
+                self._out.append(raw)
+
+        text = "".join(self._root)
+        self._root.clear()
+        return text
+
+    def _close(self, frame: list, closer: str) -> None:
+        opener, count, members, parent = frame
+        depth = len(self._frames)
+        self._out = parent
+        if members is not None:
+            members.sort(key=lambda member: member[0])
+            parent.append(opener)
+            newline = self._newline(depth + 1)
+            for i, (_, pieces) in enumerate(members):
+                if i:
+                    parent.append(",")
+                parent.append(newline)
+                parent.extend(pieces)
+            count = len(members)
+        if count:
+            parent.append(self._newline(depth))
+        parent.append(closer)
+
+
+class JSONStreamService:
+    """Service for JSON tools that work on streamed uploads."""
+
+    def validate(self, fileobj: IO[bytes]) -> dict:
+        """Validate a JSON document without building it, in constant memory.
+
+        Args:
+            fileobj: Binary file object holding the document
+
+        Returns:
+            Validity, the first error with its line and column, and the
+            document's maximum depth, object key count and array element
+            count (up to the error, if any)
+        """
+        parser = JSONStreamParser(events=False)
+        size = 0
+        error: Optional[JSONSyntaxError] = None
+        try:
+            for chunk in iter_chunks(fileobj, settings.json_chunk_size):
+                size += len(chunk)
+                parser.feed(chunk)
+            parser.close()
+        except JSONSyntaxError as e:
+            error = e
+
+        return {
+            "valid": error is None,
+            "error": error.reason if error else None,
+            "line": error.line if error else None,
+            "column": error.column if error else None,
+            "depth": parser.max_depth,
+            "keys": parser.keys,
+            "elements": parser.elements,
+            "bytes": size
+        }
+
+    def reformat(
+        self,
+        fileobj: IO[bytes],
+        indent: Optional[int] = None,
+        sort_keys: bool = False,
+        ensure_ascii: bool = False
+    ) -> Iterator[bytes]:
+        """Stream a JSON document re-serialized as indented or minified text.
+
+        Output is produced in pieces of about ``settings.json_chunk_size``
+        bytes; a document whose output fits in one piece is fully parsed
+        before anything is yielded. The file is closed once the stream ends.
+
+        Args:
+            fileobj: Binary file object holding the document
+            indent: Spaces per nesting level, or None to minify
+            sort_keys: Sort object members by key
+            ensure_ascii: Escape non-ASCII characters
+
+        Raises:
+            JSONSyntaxError: If the document is malformed
+        """
+        parser = JSONStreamParser()
+        formatter = JSONStreamFormatter(indent, sort_keys, ensure_ascii)
+        chunk_size = settings.json_chunk_size
+        pending: list[str] = []
+        pending_size = 0
+        try:
+            for chunk in iter_chunks(fileobj, chunk_size):
+                text = formatter.write(parser.feed(chunk))
+                pending.append(text)
+                pending_size += len(text)
+                if pending_size >= chunk_size:
+                    yield "".join(pending).encode("utf-8")
+                    pending.clear()
+                    pending_size = 0
+            pending.append(formatter.write(parser.close()))
+            yield "".join(pending).encode("utf-8")
+        finally:
+            fileobj.close()
+
+
+# Singleton instance
+json_stream_service = JSONStreamService()
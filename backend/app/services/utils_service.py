@@ -3,10 +3,12 @@ import re
 import math
 import string
 import secrets
-import json
 import uuid
-from typing import Dict
+from typing import Dict, Optional
+from app.config.settings import settings
 from app.core.exceptions import ValidationError
+from app.core.json_codec import JSONDecodeError, codec
+from app.services.json_diff import json_diff_service
 
 
 class UtilsService:
@@ -258,63 +260,69 @@ class UtilsService:
     def validate_json(self, json_string: str) -> dict:
         """Validate and format JSON."""
         try:
-            parsed = json.loads(json_string)
-            formatted = json.dumps(parsed, indent=2, sort_keys=True)
+            parsed = codec.loads(json_string)
+            formatted = codec.dumps(parsed, indent=2, sort_keys=True)
             return {
                 "valid": True,
                 "formatted": formatted,
                 "error": None
             }
-        except json.JSONDecodeError as e:
+        except JSONDecodeError as e:
             return {
                 "valid": False,
                 "formatted": None,
                 "error": str(e)
             }
     
-    def diff_json(self, json1: str, json2: str) -> dict:
-        """Compare two JSON objects."""
+    def diff_json(self, json1: str, json2: str, array_key: Optional[str] = None) -> dict:
+        """Compare two JSON documents recursively."""
         try:
-            obj1 = json.loads(json1)
-            obj2 = json.loads(json2)
-        except json.JSONDecodeError as e:
+            obj1 = codec.loads(json1)
+            obj2 = codec.loads(json2)
+        except JSONDecodeError as e:
             raise ValidationError(f"Invalid JSON: {str(e)}")
         
-        added = {}
-        removed = {}
-        modified = {}
-        
-        # Simple diff (works for flat objects)
-        if isinstance(obj1, dict) and isinstance(obj2, dict):
-            keys1 = set(obj1.keys())
-            keys2 = set(obj2.keys())
-            
-            # Added keys
-            for key in keys2 - keys1:
-                added[key] = obj2[key]
-            
-            # Removed keys
-            for key in keys1 - keys2:
-                removed[key] = obj1[key]
-            
-            # Modified keys
-            for key in keys1 & keys2:
-                if obj1[key] != obj2[key]:
-                    modified[key] = {"old": obj1[key], "new": obj2[key]}
-        
-        return {
-            "added": added,
-            "removed": removed,
-            "modified": modified
-        }
+        return json_diff_service.diff(obj1, obj2, array_key)
     
-    def csv_to_json(self, csv_content: str) -> list[dict]:
-        """Convert CSV to JSON."""
+    def csv_to_json(self, csv_content: str, infer_types: bool = False) -> list[dict]:
+        """Convert CSV to JSON.
+        
+        With ``infer_types`` cells are converted to column types inferred
+        from the first ``settings.csv_infer_sample_rows`` rows.
+        """
         import csv
         from io import StringIO
         
+        if infer_types:
+            from app.services.csv_types import infer_column_types, typed_records
+            
+            reader = csv.reader(StringIO(csv_content))
+            header = next(reader, [])
+            rows = list(reader)
+            kinds = infer_column_types(header, rows[:settings.csv_infer_sample_rows])
+            return typed_records(header, rows, kinds)
+        
         reader = csv.DictReader(StringIO(csv_content))
         return list(reader)
+    
+    def csv_to_columns(self, csv_content: str, infer_types: bool = False, dictionary: bool = False) -> dict:
+        """Convert CSV to columnar JSON: ``{"columns", "data", "count"}``.
+        
+        With ``dictionary`` low-cardinality columns are written as
+        ``{"dictionary": [...], "indices": [...]}``.
+        """
+        import csv
+        from io import StringIO
+        from app.services.csv_columnar import columnar_batch
+        from app.services.csv_types import infer_column_types
+        
+        reader = csv.reader(StringIO(csv_content))
+        header = next(reader, [])
+        rows = list(reader)
+        kinds = None
+        if infer_types:
+            kinds = infer_column_types(header, rows[:settings.csv_infer_sample_rows])
+        return columnar_batch(header, rows, kinds, dictionary)
 
 
 # Singleton instance
@@ -0,0 +1 @@
+"""Benchmark scripts for the backend services (run with ``python -m benchmarks.<name>``)."""
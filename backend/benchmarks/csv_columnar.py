@@ -0,0 +1,51 @@
+"""Payload size and serialization time of row and columnar CSV conversion.
+
+Usage: python -m benchmarks.csv_columnar [rows] [repeats]
+"""
+import csv
+import io
+import sys
+from app.core.json_codec import available_backends, get_codec
+from app.services.csv_columnar import columnar_batch
+from app.services.csv_types import infer_column_types, typed_records
+from benchmarks.fixtures import synthetic_csv_bytes
+from benchmarks.json_codec import best
+
+
+def main(rows: int, repeats: int) -> None:
+    text = synthetic_csv_bytes(rows).decode("utf-8")
+    reader = csv.reader(io.StringIO(text, newline=""))
+    header = next(reader)
+    parsed = list(reader)
+    kinds = infer_column_types(header, parsed[:1000])
+
+    layouts = {
+        # Fixture rows are all full width, so this is what csv.DictReader builds
+        "rows": lambda typed: typed_records(header, parsed, kinds) if typed else [dict(zip(header, row)) for row in parsed],
+        "columns": lambda typed: columnar_batch(header, parsed, kinds if typed else None),
+        "columns+dict": lambda typed: columnar_batch(header, parsed, kinds if typed else None, dictionary=True),
+    }
+
+    print(f"rows: {rows}, {len(text) / 1e6:.1f} MB CSV, best of {repeats}")
+    print(f"{'backend':8s} {'typed':6s} {'layout':13s} {'payload MB':>11s} {'build s':>8s} {'serialize s':>12s} {'vs rows':>8s}")
+    for name in available_backends():
+        codec = get_codec(name)
+        for typed in (False, True):
+            baseline = None
+            for layout, build in layouts.items():
+                document = build(typed)
+                built = best(lambda: build(typed), repeats)
+                serialized = best(lambda: codec.dumpb(document), repeats)
+                size = len(codec.dumpb(document))
+                baseline = baseline or size
+                print(
+                    f"{name:8s} {str(typed):6s} {layout:13s} {size / 1e6:11.2f} {built:8.3f} "
+                    f"{serialized:12.3f} {size / baseline:7.0%}"
+                )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    )
@@ -0,0 +1,76 @@
+"""CSV to JSON conversion throughput, sequential and across process pool sizes.
+
+Usage: python -m benchmarks.csv_parallel [rows] [block_megabytes]
+"""
+import io
+import mmap
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from app.services.csv_stream import convert_csv_range, csv_stream_service, iter_record_ranges, read_csv_header
+from benchmarks.fixtures import synthetic_csv_bytes
+
+
+def sequential(path: str) -> float:
+    """Seconds to convert the file with the single-process streaming converter."""
+    started = time.perf_counter()
+    for _ in csv_stream_service.iter_json(open(path, "rb")):
+        pass
+    return time.perf_counter() - started
+
+
+def parallel(path: str, workers: int, block_size: int) -> tuple[float, int]:
+    """Seconds to convert the file with ``workers`` processes, and the row count."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Start the workers before timing
+        list(pool.map(abs, range(workers)))
+        started = time.perf_counter()
+        with open(path, "rb") as fileobj, mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            header, body = read_csv_header(data)
+            futures = [
+                pool.submit(convert_csv_range, path, start, end, header, ",")
+                for start, end in iter_record_ranges(data, body, block_size)
+            ]
+            output = io.StringIO()
+            rows = 0
+            for future in futures:
+                result = future.result()
+                assert result["error"] is None, result["error"]
+                output.write(result["output"])
+                rows += result["rows"]
+        elapsed = time.perf_counter() - started
+    return elapsed, rows
+
+
+def main(rows: int, block_megabytes: int) -> None:
+    cores = os.cpu_count() or 1
+    block_size = block_megabytes * 1024 * 1024
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "export.csv")
+        with open(path, "wb") as f:
+            f.write(synthetic_csv_bytes(rows))
+        megabytes = os.path.getsize(path) / 1e6
+
+        print(f"rows: {rows}, {megabytes:.1f} MB, block: {block_megabytes} MB, cores: {cores}")
+        baseline = sequential(path)
+        print(f"sequential  : {baseline:7.2f} s  {megabytes / baseline:7.1f} MB/s  {rows / baseline:11,.0f} rows/s")
+        workers = 1
+        while True:
+            elapsed, converted = parallel(path, workers, block_size)
+            assert converted == rows, (converted, rows)
+            print(
+                f"workers {workers:3d} : {elapsed:7.2f} s  {megabytes / elapsed:7.1f} MB/s  "
+                f"{rows / elapsed:11,.0f} rows/s  speedup {baseline / elapsed:5.2f}x"
+            )
+            if workers >= cores:
+                break
+            workers = min(workers * 2, cores)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    )
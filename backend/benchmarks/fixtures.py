@@ -0,0 +1,93 @@
+"""Synthetic inputs shared by the benchmark scripts."""
+import json
+import random
+
+
+_HOSTS = ["www.example.com", "api.example.com", "cdn.example.net", "static.example.org", "metrics.tracker.io"]
+_MIME_TYPES = ["application/json", "text/html", "image/png", "application/javascript", "text/css"]
+_USER_AGENTS = [
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15",
+]
+
+
+def synthetic_har(entries: int, seed: int = 0) -> dict:
+    """Build a browser-like HAR capture with ``entries`` entries."""
+    rnd = random.Random(seed)
+    session = "%032x" % rnd.getrandbits(128)
+    items = []
+    for i in range(entries):
+        host = rnd.choice(_HOSTS)
+        mime = rnd.choice(_MIME_TYPES)
+        timings = {
+            phase: round(rnd.expovariate(1 / scale), 3)
+            for phase, scale in (
+                ("blocked", 2), ("dns", 1), ("connect", 3), ("ssl", 3),
+                ("send", 0.5), ("wait", 40), ("receive", 5)
+            )
+        }
+        items.append({
+            "startedDateTime": "2024-01-01T00:%02d:%02d.%03dZ" % (i // 60000 % 60, i // 1000 % 60, i % 1000),
+            "time": round(sum(timings.values()), 3),
+            "request": {
+                "method": rnd.choice(["GET", "GET", "GET", "POST"]),
+                "url": f"https://{host}/v1/resource/{rnd.randrange(2000)}?page={rnd.randrange(20)}&_={i}",
+                "httpVersion": "HTTP/2",
+                "headers": [
+                    {"name": ":authority", "value": host},
+                    {"name": "accept", "value": "application/json, text/plain, */*"},
+                    {"name": "accept-encoding", "value": "gzip, deflate, br"},
+                    {"name": "accept-language", "value": "en-US,en;q=0.9"},
+                    {"name": "user-agent", "value": _USER_AGENTS[i % len(_USER_AGENTS)]},
+                    {"name": "referer", "value": "https://www.example.com/app/dashboard"},
+                    {"name": "cookie", "value": f"session={session}"},
+                    {"name": "cookie", "value": f"_ga=GA1.2.{rnd.randrange(10 ** 9)}"},
+                    {"name": "x-request-id", "value": "%016x" % rnd.getrandbits(64)},
+                ],
+                "queryString": [],
+                "cookies": [],
+                "headersSize": -1,
+                "bodySize": 0
+            },
+            "response": {
+                "status": rnd.choice([200, 200, 200, 200, 204, 304, 404, 500]),
+                "statusText": "",
+                "httpVersion": "HTTP/2",
+                "headers": [
+                    {"name": "content-type", "value": mime},
+                    {"name": "cache-control", "value": "max-age=3600"},
+                ],
+                "content": {"size": rnd.randrange(100, 200_000), "mimeType": mime},
+                "redirectURL": "",
+                "headersSize": -1,
+                "bodySize": rnd.choice([-1, rnd.randrange(100, 100_000)])
+            },
+            "cache": {},
+            "timings": timings
+        })
+    return {"log": {"version": "1.2", "creator": {"name": "benchmark", "version": "1.0"}, "entries": items}}
+
+
+def synthetic_har_bytes(entries: int, seed: int = 0) -> bytes:
+    """Serialized ``synthetic_har``."""
+    return json.dumps(synthetic_har(entries, seed)).encode("utf-8")
+
+
+def synthetic_csv_bytes(rows: int, seed: int = 0) -> bytes:
+    """A CSV export with ``rows`` rows, including quoted commas and newlines."""
+    rnd = random.Random(seed)
+    lines = ["id,host,method,status,size,time,cached,started,note"]
+    for i in range(rows):
+        note = rnd.choice(["", "", "ok", '"retry, then ok"', '"multi-line\nnote with ""quotes"""'])
+        lines.append(",".join((
+            str(i),
+            rnd.choice(_HOSTS),
+            rnd.choice(["GET", "GET", "GET", "POST"]),
+            str(rnd.choice([200, 200, 200, 204, 304, 404, 500])),
+            str(rnd.randrange(100, 200_000)),
+            f"{rnd.expovariate(1 / 50):.3f}",
+            rnd.choice(["true", "false"]),
+            "2024-01-%02dT%02d:%02d:%02dZ" % (i % 28 + 1, i // 3600 % 24, i // 60 % 60, i % 60),
+            note
+        )))
+    return ("\n".join(lines) + "\n").encode("utf-8")
@@ -0,0 +1,56 @@
+"""Batch HAR parsing throughput across process pool sizes.
+
+Usage: python -m benchmarks.har_batch [files] [entries_per_file]
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from app.services.har_batch import summarize_har_source
+from benchmarks.fixtures import synthetic_har_bytes
+
+
+def run(paths: list[str], workers: int) -> float:
+    """Seconds to summarize every file with ``workers`` processes."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Start the workers before timing
+        list(pool.map(abs, range(workers)))
+        started = time.perf_counter()
+        summaries = list(pool.map(summarize_har_source, paths, paths))
+        elapsed = time.perf_counter() - started
+    assert all(summary["error"] is None for summary in summaries)
+    return elapsed
+
+
+def main(files: int, entries: int) -> None:
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(files):
+            path = os.path.join(directory, f"capture-{i}.har")
+            with open(path, "wb") as f:
+                f.write(synthetic_har_bytes(entries, seed=i))
+            paths.append(path)
+        megabytes = sum(os.path.getsize(path) for path in paths) / 1e6
+
+        print(f"files: {files}, entries per file: {entries}, {megabytes:.1f} MB, cores: {cores}")
+        baseline = None
+        workers = 1
+        while True:
+            elapsed = run(paths, workers)
+            baseline = baseline or elapsed
+            print(
+                f"workers {workers:3d}: {elapsed:7.2f} s  {megabytes / elapsed:7.1f} MB/s  "
+                f"speedup {baseline / elapsed:5.2f}x"
+            )
+            if workers >= cores:
+                break
+            workers = min(workers * 2, cores)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 32,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    )
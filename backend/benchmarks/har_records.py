@@ -0,0 +1,38 @@
+"""Memory per parsed HAR request: header dicts versus compact records.
+
+Usage: python -m benchmarks.har_records [entries]
+"""
+import gc
+import sys
+import tracemalloc
+from app.services.har_records import HARRequestRecord, header_symbols
+from app.services.har_service import har_service
+from benchmarks.fixtures import synthetic_har_bytes
+
+
+def measure(build, data: bytes, count: int) -> float:
+    """Bytes still allocated per entry after parsing ``data`` with ``build``."""
+    chunks = (data[i:i + 1024 * 1024] for i in range(0, len(data), 1024 * 1024))
+    gc.collect()
+    tracemalloc.start()
+    kept = [build(entry) for entry in har_service.iter_entries(chunks)]
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return allocated / count
+
+
+def main(count: int) -> None:
+    data = synthetic_har_bytes(count)
+    dicts = measure(har_service.summarize_entry, data, count)
+    records = measure(HARRequestRecord.from_entry, data, count)
+    print(f"entries:            {count}")
+    print(f"dict summaries:     {dicts:8.1f} bytes/entry")
+    print(f"compact records:    {records:8.1f} bytes/entry")
+    print(f"reduction:          {1 - records / dicts:8.1%}")
+    print(f"symbol table:       {header_symbols.stats()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,46 @@
+"""Parse and serialize throughput of each available JSON codec backend.
+
+Usage: python -m benchmarks.json_codec [entries] [repeats]
+"""
+import sys
+import time
+from app.core.json_codec import available_backends, get_codec
+from app.services.har_service import har_service
+from benchmarks.fixtures import synthetic_har_bytes
+
+
+def best(func, repeats: int) -> float:
+    """Fastest of ``repeats`` timed calls, in seconds."""
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main(entries: int, repeats: int) -> None:
+    data = synthetic_har_bytes(entries)
+    document = get_codec("stdlib").loads(data)
+    summaries = [har_service.summarize_entry(entry) for entry in document["log"]["entries"]]
+    megabytes = len(data) / 1e6
+
+    print(f"entries: {entries}, {megabytes:.1f} MB, best of {repeats}")
+    print(f"{'backend':8s} {'parse MB/s':>11s} {'serialize MB/s':>15s} {'indented MB/s':>14s} {'ndjson lines/s':>15s}")
+    for name in available_backends():
+        codec = get_codec(name)
+        parse = best(lambda: codec.loads(data), repeats)
+        serialize = best(lambda: codec.dumpb(document), repeats)
+        indented = best(lambda: codec.dumpb(document, indent=2, sort_keys=True), repeats)
+        ndjson = best(lambda: [codec.dumps(summary) for summary in summaries], repeats)
+        print(
+            f"{name:8s} {megabytes / parse:11.1f} {megabytes / serialize:15.1f} "
+            f"{megabytes / indented:14.1f} {len(summaries) / ndjson:15,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    )
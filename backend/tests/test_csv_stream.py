@@ -0,0 +1,97 @@
+"""Tests for streamed and parallel CSV to JSON conversion."""
+import asyncio
+import csv
+import io
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.config.settings import settings
+from app.core.exceptions import ValidationError
+from app.main import app
+from app.services.csv_stream import csv_stream_service
+
+ROWS = b"".join(b"%d,row %d\n" % (i, i) for i in range(2000))
+BLANK_THEN_BAD = b"id,name\n" + b"\n" * 100 + b"1,\xff\n"
+BAD_BYTE = b"id,name\n" + ROWS + b"2000,\xff\n2001,after\n"
+HUGE_FIELD = b"id,name\n" + ROWS + b'2000,"' + b"x" * (csv.field_size_limit() + 1) + b'"\n'
+
+client = TestClient(app)
+
+
+def _parallel(tmp_path, upload: bytes, output_format: str) -> bytes:
+    path = tmp_path / "rows.csv"
+    path.write_bytes(upload)
+
+    async def run():
+        pieces = csv_stream_service.iter_json_parallel(str(path), output_format)
+        return b"".join([piece async for piece in pieces])
+    return asyncio.run(run())
+
+
+def _rows(data: list) -> list:
+    return [{"id": str(i), "name": f"row {i}"} for i in range(len(data))]
+
+
+@pytest.mark.parametrize("upload", [BAD_BYTE, HUGE_FIELD])
+def test_json_stream_error_after_start_ends_with_error_member(upload):
+    body = json.loads(b"".join(csv_stream_service.iter_json(io.BytesIO(upload), "json")))
+    assert body["error"] and "count" not in body
+    assert 0 < len(body["data"]) <= 2000
+    assert body["data"] == _rows(body["data"])
+
+
+@pytest.mark.parametrize("upload", [BAD_BYTE, HUGE_FIELD])
+def test_ndjson_stream_error_after_start_ends_with_error_line(upload):
+    lines = b"".join(csv_stream_service.iter_json(io.BytesIO(upload), "ndjson")).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert records[-1]["error"]
+    assert records[:-1] == _rows(records[:-1])
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson"])
+def test_stream_error_before_the_first_row_is_raised(output_format):
+    with pytest.raises(UnicodeDecodeError):
+        b"".join(csv_stream_service.iter_json(io.BytesIO(b"id,\xff\n1,2\n"), output_format))
+
+
+def test_streamed_endpoint_never_sends_truncated_json():
+    response = client.post("/api/v1/utils/csv/to-json?stream=true", files={"file": ("rows.csv", BAD_BYTE)})
+    assert response.status_code == 200
+    assert response.json()["error"]
+
+    response = client.post("/api/v1/utils/csv/to-json?stream=true", files={"file": ("rows.csv", b"id,\xff\n")})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("upload", [BAD_BYTE, HUGE_FIELD])
+def test_parallel_json_error_in_a_later_block_ends_with_error_member(tmp_path, monkeypatch, upload):
+    monkeypatch.setattr(settings, "csv_parallel_block_size", 4096)
+    body = json.loads(_parallel(tmp_path, upload, "json"))
+    assert body["error"] and "count" not in body
+    assert 0 < len(body["data"]) <= 2000
+    assert body["data"] == _rows(body["data"])
+
+
+def test_parallel_ndjson_error_in_a_later_block_ends_with_error_line(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "csv_parallel_block_size", 4096)
+    records = [json.loads(line) for line in _parallel(tmp_path, BAD_BYTE, "ndjson").splitlines()]
+    assert records[-1]["error"]
+    assert records[:-1] == _rows(records[:-1])
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson"])
+def test_parallel_error_before_the_first_rows_is_raised(tmp_path, monkeypatch, output_format):
+    monkeypatch.setattr(settings, "csv_parallel_block_size", 16)
+    with pytest.raises(ValidationError):
+        _parallel(tmp_path, BLANK_THEN_BAD, output_format)
+
+
+def test_parallel_endpoint_primes_past_blocks_without_rows(monkeypatch):
+    monkeypatch.setattr(settings, "csv_parallel_block_size", 16)
+    response = client.post("/api/v1/utils/csv/to-json?parallel=true", files={"file": ("rows.csv", BLANK_THEN_BAD)})
+    assert response.status_code == 400
+
+    monkeypatch.setattr(settings, "csv_parallel_block_size", 4096)
+    response = client.post("/api/v1/utils/csv/to-json?parallel=true", files={"file": ("rows.csv", BAD_BYTE)})
+    assert response.status_code == 200
+    assert response.json()["error"]
@@ -0,0 +1,41 @@
+"""Tests for CSV column type inference and batch conversion."""
+from app.services.csv_types import convert_column, infer_column_types, typed_records
+
+BIG = "123456789012345678901234567890"
+
+
+def test_integer_column_keeps_out_of_range_cells_as_strings():
+    assert convert_column(["1", BIG, "3"], "integer") == [1, BIG, 3]
+    assert convert_column(["9223372036854775807", "-9223372036854775808", "9223372036854775808"], "integer") == [
+        9223372036854775807, -9223372036854775808, "9223372036854775808"
+    ]
+
+
+def test_integer_column_falls_back_to_numbers():
+    assert convert_column(["1", "3.5", "", "x"], "integer") == [1, 3.5, None, "x"]
+
+
+def test_number_column_keeps_overflowing_cells_as_strings():
+    assert convert_column(["1", "1e400", "-1E400", "2.5e3"], "number") == [1, "1e400", "-1E400", 2500.0]
+
+
+def test_boolean_column_keeps_literal_null_cells():
+    assert convert_column(["true", "null", "NULL", "", "FALSE"], "boolean") == [True, "null", "NULL", None, False]
+
+
+def test_quoted_cell_with_comma_is_not_split():
+    assert convert_column(["1", "2,3", "4"], "integer") == [1, "2,3", 4]
+
+
+def test_inference_rejects_out_of_range_samples():
+    header = ["a", "b", "c", "d"]
+    sample = [["1", "1e400", "true", BIG], ["2", "2", "null", "5"]]
+    assert infer_column_types(header, sample) == ["integer", "string", "string", "string"]
+
+
+def test_typed_records_match_dict_reader_shape():
+    rows = [["1", "x", "extra"], [], ["2"]]
+    assert typed_records(["n", "s"], rows, ["integer", "string"]) == [
+        {"n": 1, "s": "x", None: ["extra"]},
+        {"n": 2, "s": None}
+    ]
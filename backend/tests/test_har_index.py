@@ -0,0 +1,26 @@
+"""Tests for the HAR full-text index."""
+import pytest
+from app.core.exceptions import ValidationError
+from app.services import har_index
+from app.services.har_index import HARTextIndexBuilder
+
+
+def build(urls: list[str]):
+    builder = HARTextIndexBuilder()
+    for entry_id, url in enumerate(urls):
+        builder.add(entry_id, {"request": {"url": url}, "response": {}})
+    return builder.build()
+
+
+def test_prefix_search_matches_every_term():
+    index = build([f"https://example.com/item{i}" for i in range(50)] + ["https://example.com/other"])
+    assert index.search("item", mode="prefix").tolist() == list(range(50))
+    assert index.search("item4", mode="prefix").tolist() == [4] + list(range(40, 50))
+
+
+def test_broad_prefix_is_rejected_not_truncated(monkeypatch):
+    monkeypatch.setattr(har_index, "_MAX_PREFIX_TERMS", 11)
+    index = build([f"https://example.com/item{i}" for i in range(50)])
+    with pytest.raises(ValidationError, match="longer prefix"):
+        index.search("item", mode="prefix")
+    assert index.search("item4", mode="prefix").tolist() == [4] + list(range(40, 50))
@@ -0,0 +1,46 @@
+"""Tests for compact HAR request records and the header symbol table."""
+from app.config.settings import settings
+from app.services import har_records
+from app.services.har_records import HARRequestRecord, HeaderSymbols
+
+
+def entry(headers: list[tuple[str, str]]) -> dict:
+    return {
+        "request": {
+            "method": "GET",
+            "url": "https://example.com/",
+            "headers": [{"name": name, "value": value} for name, value in headers]
+        },
+        "response": {"status": 200, "bodySize": 10},
+        "time": 1.5
+    }
+
+
+def test_header_name_table_is_capped(monkeypatch):
+    monkeypatch.setattr(settings, "har_intern_max_names", 3)
+    symbols = HeaderSymbols()
+    ids = [symbols.name_id(f"x-random-{i}") for i in range(1000)]
+    assert ids[:3] == [0, 1, 2]
+    assert ids[3:] == [f"x-random-{i}" for i in range(3, 1000)]
+    assert symbols.stats()["names"] == 3
+    assert symbols.name_id("x-random-1") == 1
+
+
+def test_overlong_header_names_are_not_added(monkeypatch):
+    symbols = HeaderSymbols()
+    name = "x" * (settings.har_intern_max_value + 1)
+    assert symbols.name_id(name) == name
+    assert symbols.stats()["names"] == 0
+
+
+def test_records_round_trip_with_a_full_table(monkeypatch):
+    monkeypatch.setattr(settings, "har_intern_max_names", 2)
+    monkeypatch.setattr(har_records, "header_symbols", HeaderSymbols())
+    headers = [("Accept", "*/*"), ("Cookie", "a=1"), ("X-Trace", "t1"), ("Cookie", "b=2"), ("X-Other", "o")]
+    record = HARRequestRecord.from_entry(entry(headers))
+
+    assert list(record.header_items()) == headers
+    assert record.headers["Cookie"] == "a=1; b=2"
+    assert har_records.header_symbols.stats()["names"] == 2
+    restored = HARRequestRecord.from_row(record.to_row())
+    assert list(restored.header_items()) == headers
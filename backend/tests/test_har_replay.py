@@ -0,0 +1,86 @@
+"""Tests for HAR replay against a local stand-in server."""
+import asyncio
+import io
+import json
+import pytest
+from aiohttp import web
+from fastapi import UploadFile
+from app.core.exceptions import ValidationError
+from app.services.har_replay import LatencyHistogram, har_replay_service
+
+
+def har_upload(entries: list[dict]) -> UploadFile:
+    document = {"log": {"version": "1.2", "entries": entries}}
+    return UploadFile(file=io.BytesIO(json.dumps(document).encode()), filename="capture.har")
+
+
+def entry(method: str, url: str, started: str, body: str = None) -> dict:
+    request = {"method": method, "url": url, "headers": [{"name": "X-Test", "value": "1"}, {"name": "Host", "value": "x"}]}
+    if body is not None:
+        request["postData"] = {"mimeType": "application/json", "text": body}
+    return {"startedDateTime": started, "request": request, "response": {"status": 200}}
+
+
+async def replay_against_stand_in(entries: list[dict], **options) -> tuple[dict, list]:
+    seen = []
+
+    async def handle(request: web.Request) -> web.Response:
+        seen.append((request.method, request.path_qs, request.headers.get("X-Test"), await request.text()))
+        return web.Response(status=404 if request.path == "/api/missing" else 200, text="ok")
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        requests = await har_replay_service.load_requests(har_upload(entries), 100)
+        result = await har_replay_service.replay(requests, f"http://127.0.0.1:{port}/api", **options)
+    finally:
+        await runner.cleanup()
+    return result, seen
+
+
+def test_replay_sends_captured_requests_and_reports_per_endpoint_latency():
+    entries = [
+        entry("GET", "https://example.com/users?page=1", "2024-01-01T00:00:00.000Z"),
+        entry("GET", "https://example.com/users?page=2", "2024-01-01T00:00:00.050Z"),
+        entry("POST", "https://example.com/users", "2024-01-01T00:00:00.100Z", '{"name":"a"}'),
+        entry("GET", "https://example.com/missing", "2024-01-01T00:00:00.150Z"),
+    ]
+    result, seen = asyncio.run(replay_against_stand_in(entries, concurrency=2, faithful=True, speed=10))
+
+    assert sorted(seen) == sorted([
+        ("GET", "/api/users?page=1", "1", ""),
+        ("GET", "/api/users?page=2", "1", ""),
+        ("POST", "/api/users", "1", '{"name":"a"}'),
+        ("GET", "/api/missing", "1", ""),
+    ])
+    assert result["requests"] == 4 and result["errors"] == 0
+    endpoints = {row["endpoint"]: row for row in result["endpoints"]}
+    assert endpoints["GET /users"]["requests"] == 2
+    assert endpoints["GET /missing"]["status_counts"] == {"404": 1}
+    assert result["latency_ms"]["count"] == 4
+
+
+@pytest.mark.parametrize("base_url", [
+    "http://169.254.169.254/latest/meta-data",
+    "https://example.com",
+    "http://10.0.0.1:8080",
+    "ftp://localhost",
+])
+def test_replay_rejects_targets_outside_the_allowlist(base_url):
+    with pytest.raises(ValidationError):
+        asyncio.run(har_replay_service.replay([], base_url))
+
+
+def test_histogram_percentiles_stay_within_bucket_precision():
+    histogram = LatencyHistogram()
+    for value in range(1, 100_001):
+        histogram.record(value)
+    assert histogram.total == 100_000
+    assert abs(histogram.percentile(50) - 50_000) / 50_000 < 0.01
+    assert abs(histogram.percentile(99) - 99_000) / 99_000 < 0.01
+    assert histogram.min == 1 and histogram.max == 100_000
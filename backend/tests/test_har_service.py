@@ -0,0 +1,43 @@
+"""Tests for the streaming HAR parser."""
+import json
+import pytest
+from app.core.exceptions import FileProcessingError
+from app.services.har_service import har_service
+
+ENTRY = {"request": {"method": "GET", "url": "https://example.com/"}, "response": {"status": 200}, "time": 1.5}
+
+
+def entries(text: str, chunk_size: int = 3) -> list[dict]:
+    data = text.encode()
+    return list(har_service.iter_entries(data[i:i + chunk_size] for i in range(0, len(data), chunk_size)))
+
+
+def test_valid_har_in_small_chunks():
+    har = {"log": {"version": "1.2", "creator": {"name": "x\\\"é"}, "pages": [{"n": -1.5e3, "ok": True, "v": None}],
+                   "entries": [ENTRY, ENTRY], "comment": "\n"}}
+    for indent in (None, 2):
+        assert entries(json.dumps(har, indent=indent)) == [ENTRY, ENTRY]
+
+
+@pytest.mark.parametrize("text", [
+    '{garbage}',
+    '{"log": {"entries": []}} trailing',
+    '{"log": {"entries": []}}{}',
+    '{"log": {"entries": [{"a": 1} {"b": 2}]}}',
+    '{"log": {"entries": [{"a": 1},]}}',
+    '{"log" {"entries": []}}',
+    '{"log": {"entries": []},}',
+    '{"log": {"version": tru, "entries": []}}',
+    '{"log": {"version": 01, "entries": []}}',
+    '{"log": {"version": 1 2, "entries": []}}',
+    '{"log": {"version": "a\\x", "entries": []}}',
+    '{"log": {"version": "tab\there", "entries": []}}',
+    '{"log": {"entries": [], "version"}}',
+    '{"log": [1, 2}}',
+    '{"log": {"entries": []}',
+])
+def test_malformed_json_is_rejected(text):
+    with pytest.raises(FileProcessingError):
+        entries(text)
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text)
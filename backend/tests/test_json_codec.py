@@ -0,0 +1,70 @@
+"""Regression tests for the JSON codec backends and the endpoints using them."""
+import math
+import pytest
+from fastapi.testclient import TestClient
+from app.core.json_codec import available_backends, get_codec
+from app.main import app
+from app.services.json_lines import normalize_lines
+
+
+BIG = 123456789012345678901234567890
+
+client = TestClient(app)
+
+
+@pytest.fixture(params=available_backends())
+def codec(request):
+    return get_codec(request.param)
+
+
+def test_lone_surrogate_is_escaped(codec):
+    value = {"a": "\ud800"}
+    assert codec.dumps(value) == '{"a":"\\ud800"}'
+    assert codec.dumpb(value) == b'{"a":"\\ud800"}'
+    assert codec.loads(codec.dumpb(value)) == value
+
+
+def test_big_integers_round_trip(codec):
+    text = f'{{"n":{BIG},"m":-9223372036854775809,"k":18446744073709551615}}'
+    value = codec.loads(text)
+    assert value == {"n": BIG, "m": -9223372036854775809, "k": 18446744073709551615}
+    assert codec.loads(text.encode()) == value
+    assert codec.dumps(value) == text
+
+
+def test_non_finite_numbers_match_stdlib(codec):
+    value = codec.loads('{"x":1e400,"y":-1e400,"z":NaN,"n":null}')
+    assert value["x"] == math.inf and value["y"] == -math.inf and math.isnan(value["z"])
+    assert codec.dumps(value) == '{"x":Infinity,"y":-Infinity,"z":NaN,"n":null}'
+
+
+@pytest.mark.parametrize("indent", [None, 2, 4])
+def test_indents_match_stdlib(codec, indent):
+    value = {"b": [1, {"c": None}], "a": "\u00e9"}
+    assert codec.dumps(value, indent=indent, sort_keys=True) == get_codec("stdlib").dumps(value, indent, True)
+
+
+def test_validate_endpoint_with_lone_surrogate():
+    response = client.post("/api/v1/utils/json/validate", json={"json_string": '{"a":"\\ud800"}'})
+    assert response.status_code == 200
+    assert response.json()["formatted"] == '{\n  "a": "\\ud800"\n}'
+
+
+def test_validate_endpoint_keeps_big_integers():
+    response = client.post("/api/v1/utils/json/validate", json={"json_string": f'{{"n":{BIG}}}'})
+    assert response.json()["formatted"] == f'{{\n  "n": {BIG}\n}}'
+
+
+def test_diff_endpoint_with_lone_surrogate_and_big_integers():
+    response = client.post("/api/v1/utils/json/diff", json={
+        "json1": f'{{"a":"\\ud800","n":{BIG}}}',
+        "json2": f'{{"a":"\\ud801","n":{BIG + 1}}}'
+    })
+    assert response.status_code == 200
+    assert [change["path"] for change in response.json()["changes"]] == ["/a", "/n"]
+
+
+def test_normalize_lines_with_big_integer_and_overflow():
+    result = normalize_lines(f'{{"id":{BIG},"x":1e400}}\n'.encode(), 1, False, "\n")
+    assert result["errors"] == []
+    assert result["output"] == f'{{"id":{BIG},"x":Infinity}}'
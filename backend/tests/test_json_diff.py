@@ -0,0 +1,26 @@
+"""Tests for the recursive JSON diff and its summary shape."""
+from app.services.json_diff import json_diff_service
+
+
+def test_summary_is_keyed_by_top_level_member_name():
+    old = {"name": "John", "age": 30, "address": {"city": "NYC", "zip": "1"}, "gone": True}
+    new = {"name": "Jane", "age": 30, "address": {"city": "LA", "zip": "1"}, "city": "NYC"}
+    result = json_diff_service.diff(old, new)
+    assert result["added"] == {"city": "NYC"}
+    assert result["removed"] == {"gone": True}
+    assert result["modified"] == {
+        "name": {"old": "John", "new": "Jane"},
+        "address": {"old": old["address"], "new": new["address"]}
+    }
+    assert {change["path"] for change in result["changes"]} == {"/name", "/address/city", "/gone", "/city"}
+
+
+def test_summary_is_empty_unless_both_documents_are_objects():
+    result = json_diff_service.diff([1, 2], [1, 3])
+    assert (result["added"], result["removed"], result["modified"]) == ({}, {}, {})
+    assert result["patch"] == [{"op": "replace", "path": "/1", "value": 3}]
+
+
+def test_booleans_differ_from_numbers():
+    result = json_diff_service.diff({"a": 1}, {"a": True})
+    assert result["modified"] == {"a": {"old": 1, "new": True}}
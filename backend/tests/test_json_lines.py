@@ -0,0 +1,71 @@
+"""Tests for NDJSON validation and normalization."""
+import asyncio
+import io
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import json_lines
+from app.services.json_lines import json_lines_service, normalize_lines, validate_lines
+
+# Invalid UTF-8 fails on every codec backend, unlike nesting depth
+BAD_UTF8 = b'{"a":"\xc3"}'
+BIG = 123456789012345678901234567890
+
+client = TestClient(app)
+
+
+def test_bad_records_fail_only_their_own_line():
+    block = b'{"a":1}\n' + BAD_UTF8 + b'\n{"id":' + str(BIG).encode() + b',"x":1e400}\nnot json\n'
+    result = normalize_lines(block, 5, False, "\n")
+    assert result["output"] == f'{{"a":1}}\n{{"id":{BIG},"x":Infinity}}'
+    assert [line for line, _ in result["errors"]] == [6, 8]
+
+    result = validate_lines(block, 5, True)
+    assert result["valid"] == 2 and result["invalid"] == 2
+    assert [json.loads(line)["line"] for line in result["output"].splitlines()] == [6, 8]
+
+
+def _collect(pieces) -> str:
+    async def run():
+        return "".join([piece async for piece in pieces])
+    return asyncio.run(run())
+
+
+def _failing_blocks(blocks_before_failure: int):
+    async def blocks(fileobj, func, *args):
+        for i in range(blocks_before_failure):
+            yield func(b'{"n":%d}\n' % i, i + 1, *args)
+        raise RuntimeError("worker died")
+    return blocks
+
+
+def test_json_conversion_error_after_start_ends_with_error_member(monkeypatch):
+    monkeypatch.setattr(json_lines, "map_line_blocks", _failing_blocks(2))
+    body = _collect(json_lines_service.iter_conversion(io.BytesIO(), "json"))
+    assert json.loads(body) == {"data": [{"n": 0}, {"n": 1}], "error": "worker died"}
+
+
+def test_ndjson_conversion_error_after_start_ends_with_error_line(monkeypatch):
+    monkeypatch.setattr(json_lines, "map_line_blocks", _failing_blocks(1))
+    body = _collect(json_lines_service.iter_conversion(io.BytesIO(), "ndjson"))
+    assert [json.loads(line) for line in body.splitlines()] == [{"n": 0}, {"error": "worker died"}]
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson"])
+def test_conversion_error_in_first_block_is_raised(monkeypatch, output_format):
+    monkeypatch.setattr(json_lines, "map_line_blocks", _failing_blocks(0))
+    with pytest.raises(RuntimeError):
+        _collect(json_lines_service.iter_conversion(io.BytesIO(), output_format))
+
+
+def test_convert_endpoint_streams_json():
+    upload = b'{"b":1,"a":2}\n\nnope\n{"c":[1]}\n'
+    response = client.post(
+        "/api/v1/utils/json/ndjson/convert?format=json&sort_keys=true",
+        files={"file": ("lines.ndjson", upload)}
+    )
+    body = response.json()
+    assert response.status_code == 200
+    assert body["data"] == [{"a": 2, "b": 1}, {"c": [1]}]
+    assert body["summary"]["invalid"] == 1 and body["summary"]["errors"][0]["line"] == 3
@@ -0,0 +1,82 @@
+"""Tests for query evaluation in memory and over streamed documents."""
+import json
+import random
+import pytest
+from app.services.json_query import compile_query
+from app.services.json_stream import JSONStreamParser
+
+
+STORE = {"store": {"book": [
+    {"category": "reference", "author": "Nigel Rees", "title": "Sayings", "price": 8.95},
+    {"category": "fiction", "author": "Evelyn Waugh", "title": "Sword", "price": 12.99},
+    {"category": "fiction", "author": "Herman Melville", "title": "Moby Dick", "isbn": "0-553", "price": 8.99},
+    {"category": "fiction", "author": "J. R. R. Tolkien", "title": "LOTR", "isbn": "0-395", "price": 22.99}
+], "bicycle": {"color": "red", "price": 19.95}}}
+
+
+def stream(document, expression, chunk_size=7):
+    data = json.dumps(document).encode()
+    parser = JSONStreamParser()
+
+    def events():
+        for i in range(0, len(data), chunk_size):
+            yield from parser.feed(data[i:i + chunk_size])
+        yield from parser.close()
+    return list(compile_query(expression).stream(events()))
+
+
+def both(document, expression):
+    expected = compile_query(expression).evaluate(document)
+    assert stream(document, expression) == expected
+    return expected
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("$.store.book[*].author", ["Nigel Rees", "Evelyn Waugh", "Herman Melville", "J. R. R. Tolkien"]),
+    ("$.store..price", [8.95, 12.99, 8.99, 22.99, 19.95]),
+    ("$..book[-1].title", ["LOTR"]),
+    ("$..book[?(@.price < 10 && @.category == 'fiction')].title", ["Moby Dick"]),
+    ("store.book[?price > `20`].title", ["LOTR"]),
+    ("$..book[-2:].title", ["Moby Dick", "LOTR"]),
+])
+def test_store_queries(expression, expected):
+    assert both(STORE, expression) == expected
+
+
+def test_recursive_descent_yields_parents_before_descendants():
+    document = {"a": {"x": [1, {"y": 2}]}, "b": 3}
+    assert both(document, "$..*") == [{"x": [1, {"y": 2}]}, [1, {"y": 2}], 1, {"y": 2}, 2, 3]
+
+
+def test_nested_recursive_descent_keeps_one_match_per_path():
+    document = {"a": {"a": {"b": 1}, "b": 2}}
+    # Outer a reaches both b's, inner a reaches the inner one again
+    assert both(document, "$..a..b") == [1, 1, 2]
+
+
+def test_selectors_yield_in_document_order():
+    document = ["v0", "v1", "v2", "v3"]
+    assert both(document, "$[2,0]") == ["v0", "v2"]
+    assert both(document, "$[0,0]") == ["v0", "v0"]
+    assert both(document, "$[::-2]") == ["v1", "v3"]
+
+
+def _random_value(depth: int = 0):
+    roll = random.random()
+    if depth > 3 or roll < 0.3:
+        return random.choice([1, 2.5, "x", None, True, False, 0])
+    if roll < 0.6:
+        return [_random_value(depth + 1) for _ in range(random.randint(0, 4))]
+    return {random.choice("ab") + str(i): _random_value(depth + 1) for i in range(random.randint(0, 3))}
+
+
+@pytest.mark.parametrize("expression", [
+    "$..*", "$..a0", "$..[0]", "$.a0..b1", "$..a0..a1", "$..*..*", "$..a0..*",
+    "$..[?(@.a0)]", "$..[?(@ == 1)]..*", "$..[1:3]", "$..[-1]", "$[0]..b0", "$..[0,0,1]",
+])
+def test_stream_matches_evaluate_on_random_documents(expression):
+    random.seed(expression)
+    query = compile_query(expression)
+    for _ in range(300):
+        document = _random_value()
+        assert stream(document, expression, random.randint(1, 9)) == query.evaluate(document)
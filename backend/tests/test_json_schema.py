@@ -0,0 +1,93 @@
+"""Tests for JSON Schema references, formats and NDJSON batches."""
+import pytest
+from app.core.exceptions import ValidationError
+from app.services.json_schema import SchemaValidator, validate_ndjson_block, validator_cache
+
+
+def errors(schema, instance):
+    return [(error["path"], error["keyword"]) for error in SchemaValidator(schema).validate(instance)]
+
+
+def test_anchor_reference_resolves_to_the_anchored_schema():
+    schema = {
+        "$defs": {"s": {"$anchor": "foo", "type": "string"}},
+        "properties": {"a": {"$ref": "#foo"}}
+    }
+    assert errors(schema, {"a": 1}) == [("/a", "type")]
+    assert errors(schema, {"a": "x"}) == []
+
+
+def test_id_relative_reference_resolves_against_the_embedded_resource():
+    schema = {
+        "$id": "https://example.com/root.json",
+        "$defs": {
+            "item": {"$id": "item.json", "type": "object", "required": ["id"]},
+            "name": {"$id": "https://example.com/names/name.json", "type": "string"}
+        },
+        "properties": {
+            "item": {"$ref": "item.json"},
+            "name": {"$ref": "names/name.json"}
+        }
+    }
+    assert errors(schema, {"item": {}, "name": 3}) == [("/item", "required"), ("/name", "type")]
+    assert errors(schema, {"item": {"id": 1}, "name": "x"}) == []
+
+
+@pytest.mark.parametrize("ref", ["#bar", "#/$defs/missing", "https://example.com/remote.json"])
+def test_unknown_references_are_reported_not_resolved_to_the_root(ref):
+    schema = {"$defs": {"s": {"$anchor": "foo"}}, "properties": {"a": {"$ref": ref}}}
+    assert errors(schema, {"a": 1}) == [("", "$ref")]
+    assert errors(schema, {}) == []
+
+
+def test_recursive_reference():
+    tree = {
+        "$defs": {"node": {"properties": {"v": {"type": "integer"}, "kids": {"items": {"$ref": "#/$defs/node"}}}}},
+        "$ref": "#/$defs/node"
+    }
+    assert errors(tree, {"v": 1, "kids": [{"v": 2, "kids": [{"v": "x"}]}]}) == [("/kids/0/kids/0/v", "type")]
+
+
+def test_draft_07_schema():
+    schema = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "definitions": {"a": {"type": "string"}},
+        "items": [{"$ref": "#/definitions/a"}],
+        "additionalItems": {"type": "integer"}
+    }
+    assert errors(schema, ["a", 1, "c"]) == [("/2", "type")]
+
+
+def test_formats_and_float_multiples():
+    assert errors({"format": "date"}, "2024-02-30") == [("", "format")]
+    assert errors({"format": "date-time"}, "2024-02-03T10:00:00Z") == []
+    assert errors({"format": "date"}, 3) == []
+    assert errors({"multipleOf": 0.01}, 19.99) == []
+    assert errors({"multipleOf": 3}, 7) == [("", "multipleOf")]
+    assert errors(False, 1) == [("", "false")]
+
+
+@pytest.mark.parametrize("schema", [3, {"type": "widget"}, {"pattern": "("}])
+def test_invalid_schemas_are_rejected(schema):
+    with pytest.raises(ValidationError):
+        SchemaValidator(schema)
+
+
+def test_cache_is_keyed_independently_of_key_order():
+    assert validator_cache.get({"a": 1, "b": 2}) is validator_cache.get({"b": 2, "a": 1})
+
+
+def test_ndjson_block_reports_lines():
+    result = validate_ndjson_block(b'{"id":1}\n\n{"x":1}\nnot json\n', 10, {"type": "object", "required": ["id"]}, "k")
+    assert result["valid"] == 1
+    assert [line for line, _ in result["invalid"]] == [12, 13]
+
+
+def test_ndjson_block_reports_undecodable_and_deep_records_per_line():
+    # Decodes on every backend, but recursing through it exhausts the stack
+    deep = b"[" * 1000 + b"]" * 1000
+    block = b'[[]]\n["\xc3"]\n' + deep + b'\n[]\n{"a":1}\n'
+    result = validate_ndjson_block(block, 1, {"type": "array", "items": {"$ref": "#"}}, "deep")
+    assert result["valid"] == 2
+    assert [line for line, _ in result["invalid"]] == [2, 3, 5]
+    assert [errors[0]["message"] for _, errors in result["invalid"][:2]] == ["Invalid UTF-8", "Nesting too deep"]